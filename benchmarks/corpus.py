@@ -0,0 +1,95 @@
+"""Synthetic documents for benchmarks."""
+
+import random
+from pathlib import Path
+from typing import List
+
+WORDS = (
+    "policy employee vacation request manager approval office remote work "
+    "schedule salary benefit insurance training security password device "
+    "travel expense report deadline project client contract meeting team"
+).split()
+
+
+def make_text(words: int, seed: int = 0) -> str:
+    """Sentences of random vocabulary words."""
+    rng = random.Random(seed)
+    sentences = []
+    remaining = words
+    while remaining > 0:
+        length = min(remaining, rng.randint(6, 24))
+        sentence = " ".join(rng.choice(WORDS) for _ in range(length))
+        sentences.append(sentence.capitalize() + rng.choice([".", ".", ".", "?", "!"]))
+        remaining -= length
+    return " ".join(sentences)
+
+
+def write_txt(path: Path, text: str):
+    path.write_text(text, encoding="utf-8")
+
+
+def write_docx(path: Path, text: str, paragraph_words: int = 120):
+    import docx
+
+    document = docx.Document()
+    words = text.split()
+    for i in range(0, len(words), paragraph_words):
+        document.add_paragraph(" ".join(words[i:i + paragraph_words]))
+    document.save(str(path))
+
+
+def write_pdf(path: Path, text: str, page_words: int = 400, line_words: int = 12):
+    """Minimal multi-page PDF with one Helvetica text stream per page."""
+    words = text.split()
+    pages = [words[i:i + page_words] for i in range(0, len(words), page_words)] or [[]]
+
+    objects: List[bytes] = [
+        b"<< /Type /Catalog /Pages 2 0 R >>",
+        b"",  # page tree, filled in below
+        b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica >>",
+    ]
+    kids = []
+    for page in pages:
+        lines = [" ".join(page[i:i + line_words]) for i in range(0, len(page), line_words)]
+        ops = ["BT /F1 10 Tf 12 TL 40 800 Td"]
+        for line in lines:
+            escaped = line.replace("\\", "\\\\").replace("(", "\\(").replace(")", "\\)")
+            ops.append(f"({escaped}) Tj T*")
+        ops.append("ET")
+        stream = "\n".join(ops).encode("latin-1", "replace")
+        objects.append(b"<< /Length %d >>\nstream\n%s\nendstream" % (len(stream), stream))
+        content_id = len(objects)
+        objects.append(
+            b"<< /Type /Page /Parent 2 0 R /MediaBox [0 0 612 842] "
+            b"/Resources << /Font << /F1 3 0 R >> >> /Contents %d 0 R >>" % content_id)
+        kids.append(len(objects))
+
+    objects[1] = b"<< /Type /Pages /Kids [%s] /Count %d >>" % (
+        " ".join(f"{kid} 0 R" for kid in kids).encode(), len(kids))
+
+    out = bytearray(b"%PDF-1.4\n")
+    offsets = []
+    for number, body in enumerate(objects, start=1):
+        offsets.append(len(out))
+        out += b"%d 0 obj\n%s\nendobj\n" % (number, body)
+    xref = len(out)
+    out += b"xref\n0 %d\n0000000000 65535 f \n" % (len(objects) + 1)
+    for offset in offsets:
+        out += b"%010d 00000 n \n" % offset
+    out += b"trailer\n<< /Size %d /Root 1 0 R >>\nstartxref\n%d\n%%%%EOF\n" % (
+        len(objects) + 1, xref)
+    path.write_bytes(bytes(out))
+
+
+WRITERS = {".txt": write_txt, ".docx": write_docx, ".pdf": write_pdf}
+
+
+def make_corpus(folder: Path, count: int, words: int, extension: str = ".txt") -> List[Path]:
+    """Write count documents of about the given size."""
+    folder.mkdir(parents=True, exist_ok=True)
+    paths = []
+    for i in range(count):
+        path = folder / f"doc_{i:05d}{extension}"
+        WRITERS[extension](path, make_text(words, seed=i))
+        paths.append(path)
+    return paths
@@ -0,0 +1,38 @@
+"""Offline stand-ins for the LLM and the remote vector store."""
+
+import asyncio
+from typing import Dict, List, Optional
+import numpy as np
+
+from src.services.llm.base import BaseLLMService
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM
+
+__all__ = ["FakeLLM", "RemoteVectorStore"]
+
+
+class RemoteVectorStore(LocalVectorStore):
+    """In-memory store that adds a network round trip to every call."""
+
+    def __init__(self, llm: BaseLLMService, latency: float = 0.0):
+        super().__init__(llm, path="")
+        self.latency = latency
+
+    async def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        metadata: Dict,
+        chunk_indices: Optional[List[int]] = None
+    ) -> List[str]:
+        await asyncio.sleep(self.latency)
+        return await super().upsert(doc_id, chunks, metadata, chunk_indices)
+
+    async def search_by_vector(
+        self,
+        embedding: np.ndarray,
+        top_k: int,
+        threshold: float
+    ) -> List[Dict]:
+        await asyncio.sleep(self.latency)
+        return await super().search_by_vector(embedding, top_k, threshold)
@@ -0,0 +1,294 @@
+#!/usr/bin/env python3
+"""Offline benchmarks for indexing and retrieval.
+
+Runs against fake embedding/LLM services and an in-memory vector store
+with simulated latency, so no API keys or network are needed. Results
+are written as JSON; pass --baseline to compare with an earlier run.
+
+    python benchmarks/run.py --output results.json
+    python benchmarks/run.py --baseline results.json --output new.json
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+ROOT = Path(__file__).parent.parent
+sys.path.insert(0, str(ROOT))
+
+# Settings require credentials; benchmarks never use them
+for name in ("TELEGRAM_BOT_TOKEN", "OPENAI_API_KEY", "PINECONE_API_KEY",
+             "PINECONE_ENVIRONMENT", "PINECONE_INDEX_NAME"):
+    os.environ.setdefault(name, "benchmark")
+
+import numpy as np
+from loguru import logger
+
+from src.core import settings
+from src.services.knowledge import DocumentLoader, Chunker, Retriever
+from benchmarks.corpus import make_corpus, make_text
+from benchmarks.fakes import FakeLLM, RemoteVectorStore
+
+# Metric suffixes compared against a baseline; other keys are informational
+HIGHER_IS_BETTER = ("per_second",)
+LOWER_IS_BETTER = ("seconds", "_ms")
+
+
+def timed(fn: Callable, repeat: int) -> List[float]:
+    """Wall times of repeated calls."""
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        times.append(time.perf_counter() - start)
+    return times
+
+
+def percentiles(samples: List[float]) -> Dict[str, float]:
+    """Latency summary in milliseconds."""
+    ms = np.asarray(samples) * 1000
+    return {
+        "p50_ms": float(np.percentile(ms, 50)),
+        "p90_ms": float(np.percentile(ms, 90)),
+        "p99_ms": float(np.percentile(ms, 99)),
+        "mean_ms": float(ms.mean()),
+    }
+
+
+def bench_loader(workdir: Path, args) -> Dict:
+    """Parse throughput per format."""
+    loader = DocumentLoader()
+    results = {}
+    for extension in (".txt", ".pdf", ".docx"):
+        paths = make_corpus(workdir / "loader", args.loader_docs, args.doc_words, extension)
+        size = sum(path.stat().st_size for path in paths)
+        chars = sum(len(loader.load_document(path)) for path in paths)
+        best = min(timed(lambda: [loader.load_document(path) for path in paths], args.repeat))
+        results[extension.lstrip(".")] = {
+            "docs": len(paths),
+            "bytes": size,
+            "seconds": best,
+            "docs_per_second": len(paths) / best,
+            "mb_per_second": size / best / 1e6,
+            "chars_per_second": chars / best,
+        }
+    return results
+
+
+def bench_chunker(args) -> Dict:
+    """Chunking throughput per size unit."""
+    text = make_text(args.chunk_words)
+    results = {}
+    for unit in ("chars", "tokens"):
+        settings.chunk_unit = unit
+        chunker = Chunker()
+        chunks = chunker.create_chunks(text)
+        best = min(timed(lambda: chunker.create_chunks(text), args.repeat))
+        results[unit] = {
+            "chars": len(text),
+            "chunks": len(chunks),
+            "seconds": best,
+            "mb_per_second": len(text) / best / 1e6,
+            "chunks_per_second": len(chunks) / best,
+        }
+    settings.chunk_unit = "chars"
+    return results
+
+
+async def bench_indexer(workdir: Path, args) -> Dict:
+    """index_all wall time vs. corpus size and concurrency."""
+    from src.vectorstore import DocumentIndexer
+
+    results = {}
+    for size in args.corpus_sizes:
+        folder = workdir / f"corpus_{size}"
+        make_corpus(folder, size, args.doc_words)
+        for concurrency in args.concurrency:
+            settings.documents_folder = str(folder)
+            settings.index_manifest_path = str(workdir / f"manifest_{size}_{concurrency}.json")
+            settings.indexing_concurrency = concurrency
+
+            llm = FakeLLM(latency=args.latency_ms / 1000)
+            indexer = DocumentIndexer(RemoteVectorStore(llm, latency=args.latency_ms / 1000))
+            try:
+                start = time.perf_counter()
+                summary = await indexer.index_all()
+                elapsed = time.perf_counter() - start
+            finally:
+                indexer.close()
+
+            results[f"docs_{size}_concurrency_{concurrency}"] = {
+                "docs": size,
+                "concurrency": concurrency,
+                "failed": summary["failed"],
+                "seconds": elapsed,
+                "docs_per_second": size / elapsed,
+                "vectors": len(indexer.vectorstore),
+                "embedding_calls": llm.embedding_calls,
+            }
+    return results
+
+
+async def bench_query(args) -> Dict:
+    """End-to-end /api/v1/query latency through the FastAPI app."""
+    import httpx
+    from src.api.app import app
+    from src.api.dependencies import get_retriever
+
+    llm = FakeLLM(latency=args.latency_ms / 1000)
+    store = RemoteVectorStore(llm, latency=args.latency_ms / 1000)
+    texts = [make_text(args.doc_words, seed=i) for i in range(args.query_docs)]
+    for i, text in enumerate(texts):
+        await store.upsert(f"doc{i}", Chunker().create_chunks(text), {"filename": f"doc{i}.txt"})
+
+    retriever = Retriever(llm=llm, vectorstore=store)
+    app.dependency_overrides[get_retriever] = lambda: retriever
+    questions = [make_text(12, seed=10_000 + i) for i in range(args.queries)]
+
+    async def run(client: httpx.AsyncClient, batch: List[str]) -> List[float]:
+        latencies = []
+        for question in batch:
+            start = time.perf_counter()
+            response = await client.post(
+                "/api/v1/query", json={"query": question, "threshold": 0.0})
+            response.raise_for_status()
+            latencies.append(time.perf_counter() - start)
+        return latencies
+
+    try:
+        async with httpx.AsyncClient(app=app, base_url="http://bench") as client:
+            results = {}
+            for concurrency in args.concurrency:
+                workers = [questions[i::concurrency] for i in range(concurrency)]
+                start = time.perf_counter()
+                samples = sum(await asyncio.gather(*(run(client, w) for w in workers)), [])
+                elapsed = time.perf_counter() - start
+                results[f"concurrency_{concurrency}"] = {
+                    "queries": len(samples),
+                    "seconds": elapsed,
+                    "queries_per_second": len(samples) / elapsed,
+                    **percentiles(samples),
+                }
+            return results
+    finally:
+        app.dependency_overrides.pop(get_retriever, None)
+
+
+def compare(current: Dict, baseline: Dict, tolerance: float, prefix: str = "") -> List[str]:
+    """Metrics that got worse by more than tolerance."""
+    regressions = []
+    for key, value in current.items():
+        old = baseline.get(key)
+        name = f"{prefix}{key}"
+        if isinstance(value, dict) and isinstance(old, dict):
+            regressions += compare(value, old, tolerance, name + ".")
+            continue
+        if not isinstance(old, (int, float)) or old <= 0:
+            continue
+
+        if key.endswith(HIGHER_IS_BETTER):
+            worse = old / value - 1 if value > 0 else float("inf")
+        elif key.endswith(LOWER_IS_BETTER):
+            worse = value / old - 1
+        else:
+            continue
+        if worse > tolerance:
+            regressions.append(f"{name}: {old:.4g} -> {value:.4g}")
+    return regressions
+
+
+def git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=ROOT, capture_output=True, text=True, check=True
+        ).stdout.strip()
+    except Exception:
+        return ""
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--output", default="benchmark_results.json")
+    parser.add_argument("--baseline", help="earlier results to compare against")
+    parser.add_argument("--tolerance", type=float, default=0.2,
+                        help="allowed relative slowdown before a metric counts as regressed")
+    parser.add_argument("--suites", default="loader,chunker,indexer,query")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--latency-ms", type=float, default=5.0,
+                        help="simulated API round trip for embeddings, LLM and vector store")
+    parser.add_argument("--doc-words", type=int, default=2000)
+    parser.add_argument("--loader-docs", type=int, default=10)
+    parser.add_argument("--chunk-words", type=int, default=200_000)
+    parser.add_argument("--corpus-sizes", default="10,50,200")
+    parser.add_argument("--concurrency", default="1,4,16")
+    parser.add_argument("--query-docs", type=int, default=50)
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+    args.suites = args.suites.split(",")
+    args.corpus_sizes = [int(n) for n in args.corpus_sizes.split(",")]
+    args.concurrency = [int(n) for n in args.concurrency.split(",")]
+    return args
+
+
+async def main():
+    """Run the selected suites and write results."""
+    args = parse_args()
+    logger.remove()
+    logger.add(sys.stderr, level="WARNING")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        workdir = Path(tmp)
+
+        # Keep benchmarks hermetic: no on-disk caches, no parser processes
+        settings.embedding_cache_enabled = False
+        settings.answer_cache_enabled = False
+        settings.semantic_cache_enabled = False
+        settings.parser_workers = 0
+        settings.vector_dimension = 256
+
+        results = {}
+        for suite in args.suites:
+            print(f"Running {suite}...", file=sys.stderr)
+            if suite == "loader":
+                results[suite] = bench_loader(workdir, args)
+            elif suite == "chunker":
+                results[suite] = bench_chunker(args)
+            elif suite == "indexer":
+                results[suite] = await bench_indexer(workdir, args)
+            elif suite == "query":
+                results[suite] = await bench_query(args)
+            else:
+                raise SystemExit(f"Unknown suite: {suite}")
+
+    report = {
+        "timestamp": datetime.now(timezone.utc).isoformat(),
+        "commit": git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "params": {k: v for k, v in vars(args).items() if k not in ("output", "baseline")},
+        "results": results,
+    }
+    Path(args.output).write_text(json.dumps(report, indent=2))
+    print(json.dumps(results, indent=2))
+
+    if args.baseline:
+        baseline = json.loads(Path(args.baseline).read_text())
+        regressions = compare(results, baseline.get("results", {}), args.tolerance)
+        for line in regressions:
+            print(f"REGRESSION {line}", file=sys.stderr)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
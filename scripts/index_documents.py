@@ -1,33 +1,209 @@
 #!/usr/bin/env python3
-"""Manual document indexing."""
+"""Bulk document indexing.
 
+Progress is checkpointed to the index manifest, so an interrupted run
+picks up where it stopped when started again.
+
+Usage:
+    python scripts/index_documents.py --workers 8 --parser-workers 4
+    python scripts/index_documents.py --dry-run
+"""
+
+import argparse
 import asyncio
 import sys
+import time
+from collections import Counter
 from pathlib import Path
+from typing import Dict, List
 
 sys.path.insert(0, str(Path(__file__).parent.parent))
 
-from src.core import setup_logging
-from src.vectorstore import DocumentIndexer
+from src.core import settings, setup_logging
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--folder", help="Documents folder (default: DOCUMENTS_FOLDER)")
+    parser.add_argument(
+        "--workers", type=int, default=settings.indexing_concurrency,
+        help="Files indexed concurrently")
+    parser.add_argument(
+        "--parser-workers", type=int, default=settings.parser_workers,
+        help="Processes parsing PDF/DOCX files (0 parses in threads)")
+    parser.add_argument(
+        "--checkpoint-every", type=int, default=settings.index_checkpoint_interval,
+        help="Files between progress saves (0 saves at the end only)")
+    parser.add_argument(
+        "--report-every", type=float, default=10.0,
+        help="Seconds between progress lines")
+    parser.add_argument(
+        "--dry-run", action="store_true",
+        help="Report chunk, token and embedding call counts without indexing")
+    return parser.parse_args()
+
+
+def configure(args: argparse.Namespace):
+    """Apply command line overrides before services are built."""
+    if args.folder:
+        settings.documents_folder = args.folder
+    settings.indexing_concurrency = max(1, args.workers)
+    settings.parser_workers = max(0, args.parser_workers)
+    settings.index_checkpoint_interval = max(0, args.checkpoint_every)
+
+
+def pending_files(indexer, files: List[Path]) -> List[Path]:
+    """Files whose manifest entry is missing or stale."""
+    pending = []
+    for filepath in files:
+        entry = indexer.manifest.get(str(filepath))
+        if not entry or not entry.matches_stat(filepath.stat()):
+            pending.append(filepath)
+    return pending
+
+
+class Progress:
+    """Throughput of an indexing run."""
+
+    def __init__(self, indexer, total: int, pending: List[Path], report_every: float):
+        self.indexer = indexer
+        self.total = total
+        self.pending = set(pending)
+        self.report_every = report_every
+        self.started = time.perf_counter()
+        self.last_report = self.started
+        self.files = 0
+        self.indexed = 0
+        self.failed = 0
+        self.chunks = 0
+
+    def on_file(self, filepath: Path, success: bool):
+        # Unchanged files are skipped and left out of the rates
+        self.files += 1
+        if filepath in self.pending:
+            self.indexed += 1
+        if not success:
+            self.failed += 1
+        elif filepath in self.pending:
+            entry = self.indexer.manifest.get(str(filepath))
+            self.chunks += entry.chunk_count if entry else 0
+
+        now = time.perf_counter()
+        if now - self.last_report >= self.report_every:
+            self.last_report = now
+            print(f"[{self.files}/{self.total}] {self.rates()}", flush=True)
+
+    def rates(self) -> str:
+        elapsed = max(time.perf_counter() - self.started, 1e-9)
+        return (
+            f"{self.indexed / elapsed:.1f} files/s, {self.chunks / elapsed:.1f} chunks/s, "
+            f"{self.failed} failed"
+        )
+
+
+async def estimate(indexer, files: List[Path], workers: int) -> Dict:
+    """Count chunks, tokens and embedding requests a run would make."""
+    from src.services.knowledge.tokenizer import TokenCounter
+    from src.services.llm import OpenAIService
+
+    tokenizer = TokenCounter(settings.chunk_tokenizer_encoding)
+    totals = {"files": len(files), "chunks": 0, "new_chunks": 0, "tokens": 0,
+              "embedding_calls": 0, "failed": 0}
+    semaphore = asyncio.Semaphore(max(1, workers))
+
+    async def estimate_one(filepath: Path):
+        entry = indexer.manifest.get(str(filepath))
+        # Chunks an edited file already has are reused, not re-embedded
+        reusable = Counter(entry.chunk_hashes if entry else [])
+        batch: List[str] = []
 
+        def flush_batch():
+            totals["embedding_calls"] += OpenAIService.count_requests(batch)
+            batch.clear()
 
-async def main():
+        async with semaphore:
+            try:
+                async for chunk in indexer.iter_file_chunks(filepath):
+                    totals["chunks"] += 1
+                    chunk_hash = indexer.loader.calculate_hash(chunk)
+                    if reusable[chunk_hash] > 0:
+                        reusable[chunk_hash] -= 1
+                        continue
+
+                    totals["new_chunks"] += 1
+                    totals["tokens"] += tokenizer.count(chunk)
+                    batch.append(chunk)
+                    # The indexer upserts in embedding-batch-sized pieces
+                    if len(batch) >= settings.embedding_batch_size:
+                        flush_batch()
+                if batch:
+                    flush_batch()
+            except Exception as e:
+                print(f"Failed to read {filepath}: {e}")
+                totals["failed"] += 1
+
+    await asyncio.gather(*(estimate_one(filepath) for filepath in files))
+    return totals
+
+
+def print_header(title: str):
+    print("\n" + "=" * 50)
+    print(title)
+    print("=" * 50)
+
+
+async def main() -> int:
     """Index all documents."""
+    args = parse_args()
+    configure(args)
     setup_logging()
-    
-    print("Starting document indexing...")
-    
+
+    from src.vectorstore import DocumentIndexer
+
     indexer = DocumentIndexer()
-    results = await indexer.index_all()
-    
-    print("\n" + "=" * 50)
-    print("Indexing Results")
-    print("=" * 50)
-    print(f"Total: {results.get('total', 0)}")
-    print(f"Success: {results.get('success', 0)}")
-    print(f"Failed: {results.get('failed', 0)}")
-    print("=" * 50)
+    try:
+        files = indexer.list_documents()
+        pending = pending_files(indexer, files)
+        print(
+            f"Found {len(files)} documents in {settings.documents_folder}: "
+            f"{len(pending)} to index, {len(files) - len(pending)} unchanged")
+
+        if args.dry_run:
+            totals = await estimate(indexer, pending, args.workers)
+            print_header("Dry Run")
+            print(f"Files to index: {totals['files']}")
+            print(f"Chunks: {totals['chunks']}")
+            print(f"Chunks to embed: {totals['new_chunks']}")
+            print(f"Tokens to embed: {totals['tokens']}")
+            print(f"Embedding calls (before cache hits): {totals['embedding_calls']}")
+            print(f"Unreadable: {totals['failed']}")
+            print("=" * 50)
+            return 1 if totals["failed"] else 0
+
+        print(f"Indexing with {settings.indexing_concurrency} workers...")
+        progress = Progress(indexer, len(files), pending, args.report_every)
+        results = await indexer.index_all(on_file=progress.on_file)
+
+        print_header("Indexing Results")
+        if "error" in results:
+            print(f"Error: {results['error']}")
+            return 1
+        print(f"Total: {results.get('total', 0)}")
+        print(f"Success: {results.get('success', 0)}")
+        print(f"Failed: {results.get('failed', 0)}")
+        print(f"Chunks indexed: {progress.chunks}")
+        print(f"Elapsed: {time.perf_counter() - progress.started:.1f}s")
+        print(f"Throughput: {progress.rates()}")
+        print("=" * 50)
+        return 1 if results.get("failed") else 0
+
+    finally:
+        indexer.close()
 
 
 if __name__ == "__main__":
-    asyncio.run(main())
+    try:
+        sys.exit(asyncio.run(main()))
+    except KeyboardInterrupt:
+        print("\nInterrupted; progress is saved, run again to resume.")
+        sys.exit(130)
@@ -1,10 +1,12 @@
 """FastAPI application."""
 
-from fastapi import FastAPI
+import time
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 
 from src.core import settings
-from src.api.routes import health, chat
+from src.core.metrics import REQUEST_SECONDS
+from src.api.routes import health, chat, metrics
 
 app = FastAPI(title=settings.app_name, version="1.0.0")
 
@@ -17,8 +19,44 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+
+@app.middleware("http")
+async def record_latency(request: Request, call_next):
+    """Observe request latency per route template, up to the last body chunk."""
+    start = time.perf_counter()
+
+    def observe(status: int):
+        route = request.scope.get("route")
+        REQUEST_SECONDS.observe(
+            time.perf_counter() - start,
+            method=request.method,
+            route=getattr(route, "path", "unmatched"),
+            status=str(status)
+        )
+
+    try:
+        response = await call_next(request)
+    except Exception:
+        observe(500)
+        raise
+
+    # Streamed answers are still being generated when the headers go out
+    body = response.body_iterator
+
+    async def timed_body():
+        try:
+            async for chunk in body:
+                yield chunk
+        finally:
+            observe(response.status_code)
+
+    response.body_iterator = timed_body()
+    return response
+
+
 # Routes
 app.include_router(health.router, tags=["health"])
+app.include_router(metrics.router, tags=["metrics"])
 app.include_router(chat.router, prefix="/api/v1", tags=["chat"])
 
 
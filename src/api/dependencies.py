@@ -0,0 +1,20 @@
+"""API dependencies."""
+
+from src.core import container
+from src.services.knowledge import Retriever
+from src.vectorstore import BaseVectorStore, IndexingStatus, indexing_status
+
+
+def get_retriever() -> Retriever:
+    """Shared retriever, created on first request."""
+    return container.retriever
+
+
+def get_vectorstore() -> BaseVectorStore:
+    """Shared vector store, created on first request."""
+    return container.vectorstore
+
+
+def get_indexing_status() -> IndexingStatus:
+    """Progress of the current or last bulk indexing run."""
+    return indexing_status
@@ -1,13 +1,16 @@
 """Chat routes."""
 
-from fastapi import APIRouter, HTTPException
+import json
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-from typing import List
+from typing import AsyncIterator, Dict, List
+from loguru import logger
 
+from src.api.dependencies import get_retriever
 from src.services.knowledge import Retriever
 
 router = APIRouter()
-retriever = Retriever()
 
 
 class QueryRequest(BaseModel):
@@ -25,7 +28,7 @@ class QueryResponse(BaseModel):
 
 
 @router.post("/query", response_model=QueryResponse)
-async def query(request: QueryRequest):
+async def query(request: QueryRequest, retriever: Retriever = Depends(get_retriever)):
     """Query knowledge base."""
     try:
         answer, sources, confidence = await retriever.retrieve_and_answer(
@@ -42,3 +45,57 @@ async def query(request: QueryRequest):
         
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
+
+
+def _sse(event: str, data: Dict) -> str:
+    """Format a server-sent event."""
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/query/stream")
+async def query_stream(
+    request: QueryRequest,
+    retriever: Retriever = Depends(get_retriever)
+):
+    """Query knowledge base, streaming the answer as server-sent events.
+
+    Emits one ``sources`` event, ``token`` events as the answer is
+    generated, then ``done`` (or ``error`` if generation fails midway).
+    """
+    try:
+        tokens, sources, confidence = await retriever.stream_answer(
+            question=request.query,
+            top_k=request.top_k,
+            threshold=request.threshold
+        )
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+    async def events() -> AsyncIterator[str]:
+        yield _sse("sources", {"sources": sources, "confidence": confidence})
+        try:
+            async for token in tokens:
+                yield _sse("token", {"text": token})
+            yield _sse("done", {})
+        except Exception as e:
+            logger.error(f"Streaming error: {e}")
+            yield _sse("error", {"detail": str(e)})
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/cache/stats")
+async def cache_stats(
+    retriever: Retriever = Depends(get_retriever)
+) -> Dict[str, Dict[str, int]]:
+    """Answer cache hit/miss counters."""
+    stats = {}
+    if retriever.answer_cache:
+        stats["answer_cache"] = retriever.answer_cache.stats()
+    if retriever.semantic_cache:
+        stats["semantic_cache"] = retriever.semantic_cache.stats()
+    return stats
@@ -1,13 +1,25 @@
 """Health check routes."""
 
-from fastapi import APIRouter
+from typing import Optional
+from fastapi import APIRouter, Depends
 from pydantic import BaseModel
 
 from src.core import settings
-from src.vectorstore import PineconeStore
+from src.api.dependencies import get_indexing_status, get_vectorstore
+from src.vectorstore import BaseVectorStore, IndexingStatus
 
 router = APIRouter()
-vectorstore = PineconeStore()
+
+
+class IndexingResponse(BaseModel):
+    """Bulk indexing progress."""
+    state: str
+    total: int
+    done: int
+    failed: int
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    error: Optional[str] = None
 
 
 class HealthResponse(BaseModel):
@@ -15,13 +27,28 @@ class HealthResponse(BaseModel):
     status: str
     version: str
     database_connected: bool
+    ready: bool
+    initial_indexing_complete: bool
+    indexing: IndexingResponse
 
 
 @router.get("/health", response_model=HealthResponse)
-async def health_check():
-    """Check application health."""
+async def health_check(
+    vectorstore: BaseVectorStore = Depends(get_vectorstore),
+    indexing: IndexingStatus = Depends(get_indexing_status)
+):
+    """Check application health.
+
+    The service is ready as soon as the vector store is reachable; answers
+    use whatever is indexed while a bulk indexing run is in progress, and
+    ``initial_indexing_complete`` reports when every document is covered.
+    """
+    connected = await vectorstore.is_connected()
     return HealthResponse(
         status="healthy",
         version="1.0.0",
-        database_connected=vectorstore.is_connected()
+        database_connected=connected,
+        ready=connected,
+        initial_indexing_complete=indexing.initial_complete,
+        indexing=IndexingResponse(**indexing.snapshot())
     )
@@ -1,18 +1,19 @@
 """Command handlers."""
 
+from typing import Optional
 from telegram import Update
 from telegram.ext import ContextTypes
 from loguru import logger
 
-from src.core import settings
-from src.vectorstore import PineconeStore
+from src.core import settings, container
+from src.vectorstore import BaseVectorStore
 
 
 class CommandHandler:
     """Handle bot commands."""
     
-    def __init__(self):
-        self.vectorstore = PineconeStore()
+    def __init__(self, vectorstore: Optional[BaseVectorStore] = None):
+        self.vectorstore = vectorstore if vectorstore is not None else container.vectorstore
     
     async def start(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /start command."""
@@ -52,7 +53,7 @@ Tips:
     async def status(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
         """Handle /status command."""
         try:
-            connected = self.vectorstore.is_connected()
+            connected = await self.vectorstore.is_connected()
             
             status_emoji = "✅" if connected else "❌"
             status_text = "Online" if connected else "Offline"
@@ -1,18 +1,26 @@
 """Message handlers."""
 
-from telegram import Update
+import time
+from typing import AsyncIterator, List, Optional, Tuple
+from telegram import Message, Update
+from telegram.error import BadRequest
 from telegram.ext import ContextTypes
 from loguru import logger
 
+from src.core import settings, container
+from src.core.metrics import span
 from src.services.knowledge import Retriever
 from src.services.memory import ConversationMemory
 
+# Telegram rejects longer messages
+MAX_MESSAGE_LENGTH = 4096
+
 
 class MessageHandler:
     """Handle user messages."""
     
-    def __init__(self):
-        self.retriever = Retriever()
+    def __init__(self, retriever: Optional[Retriever] = None):
+        self.retriever = retriever or container.retriever
         self.memory = ConversationMemory()
     
     async def handle_text(self, update: Update, context: ContextTypes.DEFAULT_TYPE):
@@ -30,7 +38,11 @@ class MessageHandler:
             self.memory.add_message(user_id, "user", question)
             
             # Get answer
-            answer, sources, confidence = await self.retriever.retrieve_and_answer(question)
+            if settings.telegram_stream_enabled:
+                tokens, sources, confidence = await self.retriever.stream_answer(question)
+                answer, reply = await self._stream_reply(update.message, tokens)
+            else:
+                answer, sources, confidence = await self.retriever.retrieve_and_answer(question)
             
             # Add to memory
             self.memory.add_message(user_id, "assistant", answer)
@@ -42,7 +54,10 @@ class MessageHandler:
                 response += f"\n\n📚 Sources:\n{sources_text}"
                 response += f"\n\n✓ Confidence: {confidence:.0%}"
             
-            await update.message.reply_text(response)
+            if settings.telegram_stream_enabled:
+                await self._edit(reply, response)
+            else:
+                await self._send(update.message, response)
             logger.info(f"Answered user {user_id}")
             
         except Exception as e:
@@ -50,3 +65,49 @@ class MessageHandler:
             await update.message.reply_text(
                 "Sorry, I encountered an error processing your question. Please try again."
             )
+    
+    async def _stream_reply(
+        self,
+        message: Message,
+        tokens: AsyncIterator[str]
+    ) -> Tuple[str, Message]:
+        """Show the answer as it is generated, editing at most once per interval."""
+        parts: List[str] = []
+        reply = None
+        last_edit = 0.0
+        
+        async for token in tokens:
+            parts.append(token)
+            now = time.monotonic()
+            if now - last_edit < settings.telegram_edit_interval:
+                continue
+            
+            text = "".join(parts).strip()
+            if not text:
+                continue
+            if reply is None:
+                reply = await self._send(message, text)
+            else:
+                await self._edit(reply, text + " …")
+            last_edit = now
+        
+        answer = "".join(parts).strip()
+        if reply is None:
+            reply = await self._send(message, answer or "…")
+        return answer, reply
+    
+    @staticmethod
+    async def _send(message: Message, text: str) -> Message:
+        """Reply to message."""
+        with span("telegram_send"):
+            return await message.reply_text(text[:MAX_MESSAGE_LENGTH])
+    
+    @staticmethod
+    async def _edit(reply: Message, text: str):
+        """Edit message, ignoring edits that would not change it."""
+        try:
+            with span("telegram_send"):
+                await reply.edit_text(text[:MAX_MESSAGE_LENGTH])
+        except BadRequest as e:
+            if "not modified" not in str(e).lower():
+                raise
@@ -3,5 +3,6 @@
 from src.core.config import settings
 from src.core.logger import setup_logging
 from src.core.exceptions import *
+from src.core.container import container
 
-__all__ = ["settings", "setup_logging"]
+__all__ = ["settings", "setup_logging", "container"]
@@ -9,16 +9,32 @@ class Settings(BaseSettings):
 
     # Telegram
     telegram_bot_token: str
+    telegram_stream_enabled: bool = True
+    telegram_edit_interval: float = 1.5
 
     # OpenAI
     openai_api_key: str
     openai_model: str = "gpt-4"
     openai_embedding_model: str = "text-embedding-3-large"
+    openai_max_connections: int = 20
+    openai_max_keepalive_connections: int = 10
+    embedding_batch_size: int = 256
+    embedding_native_dimensions: bool = False
+    embedding_batch_max_tokens: int = 100000
+
+    # Embedding Cache
+    embedding_cache_enabled: bool = True
+    embedding_cache_path: str = "./data/cache/embeddings.sqlite3"
+    embedding_cache_max_entries: int = 200000
 
     # Pinecone
     pinecone_api_key: str
     pinecone_environment: str
     pinecone_index_name: str
+    pinecone_pool_threads: int = 4
+    pinecone_max_concurrency: int = 8
+    pinecone_upsert_batch_size: int = 100
+    pinecone_upsert_max_in_flight: int = 4
 
     # App
     app_name: str = "AI Chatbot"
@@ -29,16 +45,61 @@ class Settings(BaseSettings):
     documents_folder: str = "./data/documents"
     max_chunk_size: int = 1000
     chunk_overlap: int = 200
+    chunk_unit: str = "chars"
+    max_chunk_tokens: int = 256
+    chunk_overlap_tokens: int = 50
+    chunk_tokenizer_encoding: str = "cl100k_base"
+    indexing_concurrency: int = 4
+    indexing_upserts_in_flight: int = 4
+    parser_workers: int = 2
+    index_manifest_path: str = "./data/cache/index_manifest.json"
+    index_checkpoint_interval: int = 50
+    background_indexing: bool = True
+    startup_index_attempts: int = 3
+    startup_index_retry_seconds: float = 30.0
+    watch_debounce_seconds: float = 1.0
+    watch_max_concurrent_jobs: int = 2
+    watch_checkpoint_delay_seconds: float = 5.0
+    streaming_min_file_size: int = 16 * 1024 * 1024
+    pdf_page_batch_size: int = 32
 
     # API
     api_host: str = "0.0.0.0"
     api_port: int = 8000
 
     # Vector DB
+    vector_store_backend: str = "pinecone"
     vector_dimension: int = 2048
     top_k_results: int = 5
     similarity_threshold: float = 0.7
 
+    # Retrieval
+    retrieval_mode: str = "vector"
+    keyword_index_path: str = "./data/cache/keyword_index.json"
+    hybrid_candidates: int = 20
+    rrf_k: int = 60
+    keyword_min_score: float = 1.0
+    context_max_tokens: int = 3000
+
+    # Answer Cache
+    answer_cache_enabled: bool = True
+    answer_cache_max_entries: int = 1000
+    answer_cache_ttl_seconds: float = 3600.0
+    semantic_cache_enabled: bool = True
+    semantic_cache_max_entries: int = 2048
+    semantic_cache_similarity: float = 0.95
+
+    # Local Vector Store
+    local_store_path: str = "./data/cache/vectors"
+    local_store_mmap: bool = False
+    local_ann_enabled: bool = False
+    local_ann_min_vectors: int = 20000
+    local_ann_nlist: int = 0
+    local_ann_nprobe: int = 8
+    # none, int8 or binary; saves RAM only with local_store_mmap, else just speeds the scan
+    local_store_quantization: str = "none"
+    local_rescore_factor: int = 4
+
     # Rate Limiting
     max_requests_per_minute: int = 30
 
@@ -0,0 +1,103 @@
+"""Shared service container."""
+
+import threading
+from typing import Optional, TYPE_CHECKING
+from loguru import logger
+
+from src.core.config import settings
+
+if TYPE_CHECKING:
+    from src.services.llm import OpenAIService
+    from src.services.knowledge import Retriever
+    from src.vectorstore import BaseVectorStore, DocumentIndexer, KeywordIndex
+
+
+class ServiceContainer:
+    """Process-wide services, created once on first use.
+
+    Every consumer gets the same OpenAI client (one HTTP connection pool)
+    and the same vector store (one Pinecone client and index connection).
+    Imports are deferred so importing this module stays cheap.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._llm: Optional['OpenAIService'] = None
+        self._vectorstore: Optional['BaseVectorStore'] = None
+        self._keyword_index: Optional['KeywordIndex'] = None
+        self._retriever: Optional['Retriever'] = None
+        self._indexer: Optional['DocumentIndexer'] = None
+
+    @property
+    def llm(self) -> 'OpenAIService':
+        """Shared OpenAI service."""
+        with self._lock:
+            if self._llm is None:
+                from src.services.llm import OpenAIService
+                self._llm = OpenAIService()
+            return self._llm
+
+    @property
+    def vectorstore(self) -> 'BaseVectorStore':
+        """Shared vector store."""
+        with self._lock:
+            if self._vectorstore is None:
+                from src.vectorstore import create_vectorstore
+                self._vectorstore = create_vectorstore(self.llm)
+            return self._vectorstore
+
+    @property
+    def keyword_index(self) -> Optional['KeywordIndex']:
+        """Shared BM25 index, only in hybrid retrieval mode."""
+        if settings.retrieval_mode != "hybrid":
+            return None
+        with self._lock:
+            if self._keyword_index is None:
+                from src.vectorstore import KeywordIndex
+                self._keyword_index = KeywordIndex(settings.keyword_index_path)
+                self._keyword_index.load()
+            return self._keyword_index
+
+    @property
+    def retriever(self) -> 'Retriever':
+        """Shared retriever (and its answer caches)."""
+        with self._lock:
+            if self._retriever is None:
+                from src.services.knowledge import Retriever
+                self._retriever = Retriever(
+                    llm=self.llm,
+                    vectorstore=self.vectorstore,
+                    keyword_index=self.keyword_index
+                )
+            return self._retriever
+
+    @property
+    def indexer(self) -> 'DocumentIndexer':
+        """Shared document indexer."""
+        with self._lock:
+            if self._indexer is None:
+                from src.vectorstore import DocumentIndexer
+                self._indexer = DocumentIndexer(
+                    vectorstore=self.vectorstore,
+                    keyword_index=self.keyword_index
+                )
+            return self._indexer
+
+    async def aclose(self):
+        """Release pooled connections and worker processes."""
+        if self._indexer:
+            self._indexer.close()
+        if self._vectorstore and self._vectorstore.embedding_cache:
+            self._vectorstore.embedding_cache.close()
+        if self._llm:
+            await self._llm.client.close()
+
+        self._llm = None
+        self._vectorstore = None
+        self._keyword_index = None
+        self._retriever = None
+        self._indexer = None
+        logger.info("Shared services closed")
+
+
+container = ServiceContainer()
@@ -2,12 +2,12 @@
 
 import asyncio
 import uvicorn
-from contextlib import asynccontextmanager
+from contextlib import asynccontextmanager, suppress
+from typing import Optional
 from loguru import logger
 
-from src.core import settings, setup_logging
+from src.core import settings, setup_logging, container
 from src.bot import BotDispatcher
-from src.vectorstore import DocumentIndexer
 from src.api import app
 
 
@@ -17,6 +17,7 @@ class Application:
     def __init__(self):
         self.bot = None
         self.indexer = None
+        self._index_task: Optional[asyncio.Task] = None
         self._initialized = False
 
     async def startup(self):
@@ -29,18 +30,26 @@ class Application:
         logger.info(f"Starting {settings.app_name}")
 
         try:
+            # Create shared services (connections open on first use)
+            logger.info("Initializing shared services...")
+            container.retriever
+
             # Initialize indexer
             logger.info("Initializing document indexer...")
-            self.indexer = DocumentIndexer()
-
-            # Index existing documents
-            logger.info("Indexing existing documents...")
-            await self.indexer.index_all()
+            self.indexer = container.indexer
 
-            # Start file watching
+            # Watch first so edits made during the initial pass are not missed
             logger.info("Starting file watcher...")
             self.indexer.start_watching()
 
+            # Index existing documents; serving starts against what is already indexed
+            if settings.background_indexing:
+                logger.info("Indexing existing documents in the background...")
+                self._index_task = asyncio.create_task(self._index_existing())
+                self._index_task.add_done_callback(self._on_index_done)
+            else:
+                await self._index_existing()
+
             # Initialize and start bot
             logger.info("Starting Telegram bot...")
             self.bot = BotDispatcher()
@@ -54,6 +63,25 @@ class Application:
             logger.error(f"Startup failed: {e}")
             raise
 
+    async def _index_existing(self):
+        """Index documents on disk, retrying failed runs."""
+        attempts = max(1, settings.startup_index_attempts)
+        for attempt in range(1, attempts + 1):
+            results = await self.indexer.index_all()
+            if "error" not in results:
+                break
+            if attempt < attempts:
+                logger.warning(
+                    f"Initial indexing failed (attempt {attempt}/{attempts}), "
+                    f"retrying in {settings.startup_index_retry_seconds}s")
+                await asyncio.sleep(settings.startup_index_retry_seconds)
+
+    @staticmethod
+    def _on_index_done(task: asyncio.Task):
+        """Log a background indexing crash instead of losing it."""
+        if not task.cancelled() and task.exception():
+            logger.error(f"Background indexing crashed: {task.exception()}")
+
     async def shutdown(self):
         """Stop all services."""
         if not self._initialized:
@@ -63,12 +91,19 @@ class Application:
         logger.info("Shutting down...")
 
         try:
+            if self._index_task and not self._index_task.done():
+                self._index_task.cancel()
+                with suppress(asyncio.CancelledError):
+                    await self._index_task
+
             if self.bot:
                 await self.bot.stop()
 
             if self.indexer:
                 self.indexer.stop_watching()
 
+            await container.aclose()
+
             self._initialized = False
             logger.info("Shutdown complete")
 
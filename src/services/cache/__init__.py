@@ -0,0 +1,14 @@
+"""Cache services."""
+
+from src.services.cache.embedding_cache import EmbeddingCache
+from src.services.cache.answer_cache import AnswerCache
+from src.services.cache.semantic_cache import SemanticCache
+from src.services.cache.corpus_version import CorpusVersion, corpus_version
+
+__all__ = [
+    "EmbeddingCache",
+    "AnswerCache",
+    "SemanticCache",
+    "CorpusVersion",
+    "corpus_version",
+]
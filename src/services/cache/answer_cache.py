@@ -0,0 +1,58 @@
+"""Answer cache."""
+
+import re
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+
+class AnswerCache:
+    """LRU cache with per-entry time-to-live."""
+
+    _WHITESPACE = re.compile(r'\s+')
+    _TRAILING_PUNCTUATION = re.compile(r'[\s?!.]+$')
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+
+    @classmethod
+    def normalize(cls, question: str) -> str:
+        """Case- and whitespace-insensitive form of a question."""
+        question = cls._WHITESPACE.sub(' ', question.strip().lower())
+        return cls._TRAILING_PUNCTUATION.sub('', question)
+
+    def make_key(self, question: str, top_k: int, threshold: float, version: int) -> Hashable:
+        """Build cache key for a retrieval request."""
+        return (self.normalize(question), top_k, round(threshold, 4), version)
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """Get cached value, or None if missing or expired."""
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                del self._entries[key]
+            self.misses += 1
+            return None
+
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[1]
+
+    def put(self, key: Hashable, value: Any):
+        """Store value, evicting the least recently used entry if full."""
+        self._entries[key] = (time.monotonic() + self.ttl_seconds, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        """Drop all entries."""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {"hits": self.hits, "misses": self.misses, "size": len(self._entries)}
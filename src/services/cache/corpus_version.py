@@ -0,0 +1,19 @@
+"""Indexed corpus version."""
+
+
+class CorpusVersion:
+    """Counter bumped whenever indexed content changes."""
+
+    def __init__(self):
+        self._value = 0
+
+    @property
+    def value(self) -> int:
+        return self._value
+
+    def bump(self):
+        """Mark the corpus as changed."""
+        self._value += 1
+
+
+corpus_version = CorpusVersion()
@@ -0,0 +1,149 @@
+"""Persistent embedding cache."""
+
+import hashlib
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from loguru import logger
+
+
+class EmbeddingCache:
+    """SQLite-backed embedding cache keyed by model, dimension and text hash.
+
+    Methods block on disk I/O; async callers run them in a thread. Hits
+    refresh ``last_used`` in memory and are written out in batches.
+    """
+
+    # Keep IN (...) queries under SQLite's host parameter limit
+    _QUERY_BATCH = 500
+    # Pending last_used updates written per commit
+    _TOUCH_BATCH = 256
+
+    def __init__(self, path: str, model: str, dimension: int, max_entries: int):
+        self.path = Path(path)
+        self.model = model
+        self.dimension = dimension
+        self.max_entries = max_entries
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS embeddings (
+                model TEXT NOT NULL,
+                dimension INTEGER NOT NULL,
+                text_hash TEXT NOT NULL,
+                vector BLOB NOT NULL,
+                last_used REAL NOT NULL,
+                PRIMARY KEY (model, dimension, text_hash)
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS idx_embeddings_last_used ON embeddings (last_used)"
+        )
+        self._conn.commit()
+        self._touched: Dict[str, float] = {}
+        self._count = self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    @staticmethod
+    def text_hash(text: str) -> str:
+        """Calculate SHA256 hash of text."""
+        return hashlib.sha256(text.encode()).hexdigest()
+
+    def get_many(self, texts: Sequence[str]) -> List[Optional[np.ndarray]]:
+        """Return cached embeddings aligned with texts (None for misses)."""
+        hashes = [self.text_hash(text) for text in texts]
+        found: Dict[str, np.ndarray] = {}
+
+        with self._lock:
+            unique = list(dict.fromkeys(hashes))
+            for i in range(0, len(unique), self._QUERY_BATCH):
+                batch = unique[i:i + self._QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    f"SELECT text_hash, vector FROM embeddings "
+                    f"WHERE model = ? AND dimension = ? AND text_hash IN ({placeholders})",
+                    (self.model, self.dimension, *batch)
+                ).fetchall()
+                for text_hash, blob in rows:
+                    found[text_hash] = np.frombuffer(blob, dtype=np.float32)
+
+            now = time.time()
+            for text_hash in found:
+                self._touched[text_hash] = now
+            if len(self._touched) >= self._TOUCH_BATCH:
+                self._write_touches()
+                self._conn.commit()
+
+        results = [found.get(h) for h in hashes]
+        hits = sum(1 for r in results if r is not None)
+        self.hits += hits
+        self.misses += len(results) - hits
+        return results
+
+    def put_many(self, texts: Sequence[str], embeddings: Sequence[Sequence[float]]):
+        """Store embeddings and evict least recently used entries over the limit."""
+        if not texts:
+            return
+
+        now = time.time()
+        rows = [
+            (self.model, self.dimension, self.text_hash(text),
+             np.asarray(embedding, dtype=np.float32).tobytes(), now)
+            for text, embedding in zip(texts, embeddings)
+        ]
+
+        with self._lock:
+            # Texts stored meanwhile by another caller have the same vector
+            cursor = self._conn.executemany(
+                "INSERT OR IGNORE INTO embeddings "
+                "(model, dimension, text_hash, vector, last_used) VALUES (?, ?, ?, ?, ?)",
+                rows
+            )
+            self._count += cursor.rowcount
+            if self._count > self.max_entries:
+                self._write_touches()
+                self._evict()
+            self._conn.commit()
+
+    def _write_touches(self):
+        """Write pending last_used updates."""
+        if not self._touched:
+            return
+        self._conn.executemany(
+            "UPDATE embeddings SET last_used = ? "
+            "WHERE model = ? AND dimension = ? AND text_hash = ?",
+            [(used, self.model, self.dimension, h) for h, used in self._touched.items()]
+        )
+        self._touched = {}
+
+    def _evict(self):
+        """Drop least recently used entries above max_entries."""
+        excess = self._count - self.max_entries
+        cursor = self._conn.execute(
+            "DELETE FROM embeddings WHERE rowid IN "
+            "(SELECT rowid FROM embeddings ORDER BY last_used LIMIT ?)",
+            (excess,)
+        )
+        self._count -= cursor.rowcount
+        logger.debug(f"Evicted {cursor.rowcount} cached embeddings")
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM embeddings").fetchone()[0]
+
+    def close(self):
+        """Write pending updates and close database connection."""
+        with self._lock:
+            self._write_touches()
+            self._conn.commit()
+            self._conn.close()
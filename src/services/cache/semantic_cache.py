@@ -0,0 +1,80 @@
+"""Semantic answer cache."""
+
+import time
+from typing import Any, Dict, List, Optional
+import numpy as np
+
+
+class SemanticCache:
+    """Serve answers for questions whose embeddings are near a cached one.
+
+    Question embeddings live in one preallocated float32 matrix used as a
+    ring buffer, so lookup is a single matrix-vector product.
+    """
+
+    def __init__(self, max_entries: int, similarity: float, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.similarity = similarity
+        self.ttl_seconds = ttl_seconds
+        self.hits = 0
+        self.misses = 0
+
+        self._matrix: Optional[np.ndarray] = None
+        self._versions = np.full(max_entries, -1, dtype=np.int64)
+        self._top_k = np.zeros(max_entries, dtype=np.int64)
+        self._thresholds = np.zeros(max_entries, dtype=np.float32)
+        self._expires = np.zeros(max_entries, dtype=np.float64)
+        self._values: List[Any] = [None] * max_entries
+        self._next = 0
+
+    @staticmethod
+    def _normalize(embedding: List[float]) -> np.ndarray:
+        vector = np.asarray(embedding, dtype=np.float32)
+        return vector / max(float(np.linalg.norm(vector)), 1e-12)
+
+    def get(self, embedding: List[float], top_k: int, threshold: float, version: int) -> Optional[Any]:
+        """Get answer cached for a similar question under the same corpus version."""
+        if self._matrix is None:
+            self.misses += 1
+            return None
+
+        vector = self._normalize(embedding)
+        scores = self._matrix @ vector
+        valid = (
+            (self._versions == version)
+            & (self._top_k == top_k)
+            & np.isclose(self._thresholds, threshold)
+            & (self._expires > time.monotonic())
+        )
+        scores[~valid] = -np.inf
+
+        best = int(np.argmax(scores))
+        if scores[best] < self.similarity:
+            self.misses += 1
+            return None
+
+        self.hits += 1
+        return self._values[best]
+
+    def put(self, embedding: List[float], top_k: int, threshold: float, version: int, value: Any):
+        """Cache answer, overwriting the oldest entry when full."""
+        vector = self._normalize(embedding)
+        if self._matrix is None:
+            self._matrix = np.zeros((self.max_entries, len(vector)), dtype=np.float32)
+
+        slot = self._next
+        self._matrix[slot] = vector
+        self._versions[slot] = version
+        self._top_k[slot] = top_k
+        self._thresholds[slot] = threshold
+        self._expires[slot] = time.monotonic() + self.ttl_seconds
+        self._values[slot] = value
+        self._next = (slot + 1) % self.max_entries
+
+    def stats(self) -> Dict[str, int]:
+        """Hit/miss counters."""
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": int(np.count_nonzero(self._versions >= 0))
+        }
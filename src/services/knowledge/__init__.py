@@ -2,6 +2,8 @@
 
 from src.services.knowledge.document_loader import DocumentLoader
 from src.services.knowledge.chunker import Chunker
+from src.services.knowledge.tokenizer import TokenCounter
+from src.services.knowledge.context_builder import ContextBuilder
 from src.services.knowledge.retriever import Retriever
 
-__all__ = ["DocumentLoader", "Chunker", "Retriever"]
+__all__ = ["DocumentLoader", "Chunker", "TokenCounter", "ContextBuilder", "Retriever"]
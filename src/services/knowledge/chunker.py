@@ -1,56 +1,198 @@
 """Text chunking service."""
 
 import re
-from typing import List
+from typing import Iterable, Iterator, List, Tuple
 from loguru import logger
 
 from src.core import settings
+from src.core.exceptions import ConfigurationError
+from src.services.knowledge.tokenizer import TokenCounter
+
+
+SENTENCE_END = re.compile(r'[.!?]+[\s\n]+')
 
 
 class Chunker:
-    """Split text into chunks."""
+    """Split text into chunks.
+    
+    Sizes are measured in characters by default, or in tokens when
+    ``chunk_unit`` is "tokens"; token mode also splits sentences longer
+    than a chunk.
+    """
     
     def __init__(self):
-        self.max_size = settings.max_chunk_size
-        self.overlap = settings.chunk_overlap
+        self.unit = settings.chunk_unit
+        self.tokenizer = None
+        
+        if self.unit == "chars":
+            self.max_size = settings.max_chunk_size
+            self.overlap = settings.chunk_overlap
+        elif self.unit == "tokens":
+            self.max_size = settings.max_chunk_tokens
+            self.overlap = settings.chunk_overlap_tokens
+            self.tokenizer = TokenCounter(settings.chunk_tokenizer_encoding)
+        else:
+            raise ConfigurationError(f"Unknown chunk unit: {self.unit}")
+        
+        # Longest run kept as one sentence, so text without sentence ends is
+        # still cut (tokens are rarely shorter than a character)
+        self.max_sentence_chars = self.max_size * (16 if self.tokenizer else 1)
     
     def split_sentences(self, text: str) -> List[str]:
         """Split text into sentences."""
-        pattern = re.compile(r'[.!?]+[\s\n]+')
-        sentences = pattern.split(text)
+        sentences = SENTENCE_END.split(text)
         return [s.strip() for s in sentences if s.strip()]
     
+    def measure(self, text: str) -> int:
+        """Size of text in the configured unit."""
+        if self.tokenizer:
+            return self.tokenizer.count(text)
+        return len(text)
+    
+    def fit(self, sentence: str) -> List[Tuple[str, int]]:
+        """Sentence with its size, split into chunk-sized parts in token mode."""
+        size = self.measure(sentence)
+        if not self.tokenizer or size <= self.max_size:
+            return [(sentence, size)]
+        
+        parts = []
+        for part in self.tokenizer.split(sentence, self.max_size):
+            part = part.strip()
+            if part:
+                parts.append((part, self.measure(part)))
+        return parts
+    
+    def cut(self, sentence: str) -> List[str]:
+        """Sentence in pieces of at most max_sentence_chars."""
+        limit = self.max_sentence_chars
+        pieces = (sentence[i:i + limit].strip() for i in range(0, len(sentence), limit))
+        return [piece for piece in pieces if piece]
+    
     def create_chunks(self, text: str) -> List[str]:
         """Create overlapping chunks."""
-        sentences = self.split_sentences(text)
+        chunks = list(self.iter_chunks([text]))
+        logger.debug(f"Created {len(chunks)} chunks")
+        return chunks
+    
+    def iter_chunks(self, pieces: Iterable[str]) -> Iterator[str]:
+        """Chunk text arriving in pieces, yielding chunks as they complete."""
+        stream = self.stream()
+        for piece in pieces:
+            yield from stream.feed(piece)
+        yield from stream.close()
+    
+    def stream(self) -> 'ChunkStream':
+        """Incremental chunker for text arriving in pieces."""
+        return ChunkStream(self)
+
+
+class ChunkStream:
+    """Incremental chunking state.
+    
+    Feeding pieces whose concatenation is ``text`` yields exactly
+    ``Chunker.create_chunks(text)``; only the unfinished sentence (at most
+    ``max_sentence_chars`` plus one piece) and the current chunk are held
+    in memory.
+    """
+    
+    def __init__(self, chunker: Chunker):
+        self.chunker = chunker
+        self._buffer = ''
+        self._scan_from = 0
+        # Leading pieces of the unfinished sentence were already cut off
+        self._partial = False
+        self._current: List[Tuple[str, int]] = []
+        self._length = 0
+    
+    def feed(self, piece: str) -> List[str]:
+        """Add text and return chunks completed by it."""
+        self._buffer += piece
         chunks = []
-        current_chunk = []
-        current_length = 0
+        start = 0
         
-        for sentence in sentences:
-            sentence_length = len(sentence)
-            
-            if current_length + sentence_length > self.max_size and current_chunk:
-                chunks.append(' '.join(current_chunk))
+        for match in SENTENCE_END.finditer(self._buffer, self._scan_from):
+            # A delimiter touching the end may still grow with the next piece
+            if match.end() == len(self._buffer):
+                self._scan_from = match.start()
+                break
+            self._finish(self._buffer[start:match.start()], chunks)
+            start = match.end()
+        else:
+            # Trailing punctuation may start a delimiter once whitespace arrives
+            self._scan_from = max(start, len(self._buffer.rstrip('.!?')))
+        
+        self._buffer = self._buffer[start:]
+        self._scan_from -= start
+        self._cut_long_sentence(chunks)
+        return chunks
+    
+    def close(self) -> List[str]:
+        """Flush the remaining text."""
+        chunks = []
+        for sentence in SENTENCE_END.split(self._buffer):
+            self._finish(sentence, chunks)
+        if self._current:
+            chunks.append(self._join())
+        
+        self._buffer = ''
+        self._scan_from = 0
+        self._partial = False
+        self._current = []
+        self._length = 0
+        return chunks
+    
+    def _finish(self, sentence: str, chunks: List[str]):
+        """Add a complete sentence, continuing one whose start was cut off."""
+        sentence = sentence.rstrip() if self._partial else sentence.strip()
+        self._partial = False
+        for piece in self.chunker.cut(sentence):
+            self._add(piece, chunks)
+    
+    def _cut_long_sentence(self, chunks: List[str]):
+        """Add leading pieces of an unfinished sentence past the length limit.
+        
+        A piece is cut only once non-space text follows it, so it matches the
+        piece ``Chunker.cut`` takes from the whole sentence.
+        """
+        limit = self.chunker.max_sentence_chars
+        if self._scan_from <= limit:
+            return
+        
+        start = 0 if self._partial else len(self._buffer) - len(self._buffer.lstrip())
+        end = start
+        while self._buffer[end + limit:self._scan_from].strip():
+            self._add(self._buffer[end:end + limit].strip(), chunks)
+            end += limit
+        
+        if end > start:
+            self._partial = True
+            self._buffer = self._buffer[end:]
+            self._scan_from -= end
+    
+    def _join(self) -> str:
+        return ' '.join(sentence for sentence, _ in self._current)
+    
+    def _add(self, sentence: str, chunks: List[str]):
+        """Append sentence, emitting a chunk when the size limit is reached."""
+        if not sentence:
+            return
+        
+        for part, size in self.chunker.fit(sentence):
+            if self._length + size > self.chunker.max_size and self._current:
+                chunks.append(self._join())
                 
-                # Create overlap
-                overlap_sentences = []
+                # Create overlap from the tail of the chunk
+                overlap = []
                 overlap_length = 0
-                for s in reversed(current_chunk):
-                    if overlap_length + len(s) <= self.overlap:
-                        overlap_sentences.insert(0, s)
-                        overlap_length += len(s)
-                    else:
+                for tail in reversed(self._current):
+                    if overlap_length + tail[1] > self.chunker.overlap:
                         break
+                    overlap.append(tail)
+                    overlap_length += tail[1]
+                overlap.reverse()
                 
-                current_chunk = overlap_sentences
-                current_length = overlap_length
+                self._current = overlap
+                self._length = overlap_length
             
-            current_chunk.append(sentence)
-            current_length += sentence_length
-        
-        if current_chunk:
-            chunks.append(' '.join(current_chunk))
-        
-        logger.debug(f"Created {len(chunks)} chunks")
-        return chunks
+            self._current.append((part, size))
+            self._length += size
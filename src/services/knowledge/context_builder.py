@@ -0,0 +1,88 @@
+"""Prompt context assembly."""
+
+from typing import Dict, List, Optional, Tuple
+from loguru import logger
+
+from src.core import settings
+from src.services.knowledge.tokenizer import TokenCounter
+
+
+class ContextBuilder:
+    """Pack search results into a token-budgeted context.
+
+    Results are taken in relevance order. Text a chunk shares with an
+    already selected chunk of the same document (the chunker's overlap)
+    is cut, and chunks that no longer fit the budget are skipped.
+    """
+
+    # Shorter shared edges are treated as coincidence, not chunk overlap
+    MIN_OVERLAP = 20
+    SEPARATOR = "\n\n"
+
+    def __init__(self, max_tokens: Optional[int] = None, tokenizer: Optional[TokenCounter] = None):
+        self.max_tokens = max_tokens if max_tokens is not None else settings.context_max_tokens
+        self.tokenizer = tokenizer or TokenCounter(settings.chunk_tokenizer_encoding)
+
+    def build(self, results: List[Dict]) -> Tuple[str, List[Dict]]:
+        """Return context text and the results it includes."""
+        parts: List[str] = []
+        included: List[Dict] = []
+        kept: Dict[str, List[str]] = {}
+        used = 0
+        separator_tokens = self.tokenizer.count(self.SEPARATOR)
+
+        for result in results:
+            document = result.get('document_id') or result['filename']
+            content = self._dedupe(result['content'], kept.get(document, []))
+            if not content:
+                continue
+
+            part = f"[{result['filename']}]\n{content}"
+            tokens = self.tokenizer.count(part) + (separator_tokens if parts else 0)
+
+            if used + tokens > self.max_tokens:
+                if parts:
+                    continue
+                # The best match alone exceeds the budget: keep its head
+                part = self.tokenizer.split(part, self.max_tokens)[0]
+                tokens = self.tokenizer.count(part)
+
+            parts.append(part)
+            included.append(result)
+            kept.setdefault(document, []).append(content)
+            used += tokens
+
+        dropped = len(results) - len(included)
+        logger.debug(f"Context uses {used}/{self.max_tokens} tokens, dropped {dropped} results")
+        return self.SEPARATOR.join(parts), included
+
+    def _dedupe(self, content: str, siblings: List[str]) -> str:
+        """Cut text shared with already selected chunks of the same document."""
+        for sibling in siblings:
+            if content in sibling:
+                return ""
+
+            # Sibling precedes content: drop content's head
+            overlap = self._overlap(sibling, content)
+            if overlap:
+                content = content[overlap:].strip()
+
+            # Content precedes sibling: drop content's tail
+            overlap = self._overlap(content, sibling)
+            if overlap:
+                content = content[:-overlap].strip()
+
+        return content
+
+    def _overlap(self, first: str, second: str) -> int:
+        """Length of the longest suffix of first that is a prefix of second."""
+        if not second:
+            return 0
+
+        # Candidate starts are occurrences of second's first character
+        start = first.find(second[0], max(0, len(first) - len(second)))
+        while start != -1 and len(first) - start >= self.MIN_OVERLAP:
+            if first.startswith(second[:len(first) - start], start):
+                return len(first) - start
+            start = first.find(second[0], start + 1)
+        return 0
@@ -1,15 +1,71 @@
 """Document loading service."""
 
+import asyncio
 import hashlib
+import os
+import threading
+from collections import OrderedDict
+from concurrent.futures import Executor
+from itertools import islice
 from pathlib import Path
-from typing import Optional
-import PyPDF2
-import docx
+from typing import AsyncIterator, BinaryIO, Iterator, List, Optional, Tuple
 from loguru import logger
 
+from src.core import settings
+
 from src.core.exceptions import DocumentProcessingError
 
 
+# Formats whose parsing is CPU-bound and worth sending to a process pool
+CPU_BOUND_EXTENSIONS = {'.pdf', '.docx'}
+
+# PDFs part-way through page-range extraction in this worker, oldest first
+_MAX_OPEN_PDFS = 4
+_pdf_readers: 'OrderedDict[Tuple[str, int], Tuple[BinaryIO, object]]' = OrderedDict()
+_pdf_lock = threading.Lock()
+
+
+def load_document_file(filepath: str) -> Optional[str]:
+    """Load document in a worker process."""
+    return DocumentLoader().load_document(Path(filepath))
+
+
+def load_pdf_pages(filepath: str, start: int, count: int) -> List[str]:
+    """Extract a page range of a PDF in a worker process.
+    
+    The worker keeps the reader open until the last page is extracted, so
+    each range does not re-parse the document from the start.
+    """
+    import PyPDF2
+    
+    try:
+        key = (filepath, os.stat(filepath).st_mtime_ns)
+        with _pdf_lock:
+            opened = _pdf_readers.pop(key, None)
+        if opened is None:
+            f = open(filepath, 'rb')
+            opened = (f, PyPDF2.PdfReader(f))
+        
+        pages = opened[1].pages
+        end = min(start + count, len(pages))
+        try:
+            texts = [pages[i].extract_text() for i in range(start, end)]
+        except Exception:
+            opened[0].close()
+            raise
+        
+        if end >= len(pages):
+            opened[0].close()
+            return texts
+        with _pdf_lock:
+            _pdf_readers[key] = opened
+            while len(_pdf_readers) > _MAX_OPEN_PDFS:
+                _pdf_readers.popitem(last=False)[1][0].close()
+        return texts
+    except Exception as e:
+        raise DocumentProcessingError(f"Failed to load document: {e}")
+
+
 class DocumentLoader:
     """Load and extract text from documents."""
     
@@ -17,6 +73,14 @@ class DocumentLoader:
         """Calculate SHA256 hash."""
         return hashlib.sha256(content.encode()).hexdigest()
     
+    def calculate_file_hash(self, filepath: Path) -> str:
+        """Calculate SHA256 hash of raw file bytes."""
+        sha = hashlib.sha256()
+        with open(filepath, 'rb') as f:
+            for block in iter(lambda: f.read(1024 * 1024), b''):
+                sha.update(block)
+        return sha.hexdigest()
+    
     def load_txt(self, filepath: Path) -> str:
         """Load TXT file."""
         with open(filepath, 'r', encoding='utf-8') as f:
@@ -24,6 +88,8 @@ class DocumentLoader:
     
     def load_pdf(self, filepath: Path) -> str:
         """Load PDF file."""
+        import PyPDF2  # imported lazily: parsing runs in worker processes
+        
         text = []
         with open(filepath, 'rb') as f:
             pdf_reader = PyPDF2.PdfReader(f)
@@ -31,8 +97,25 @@ class DocumentLoader:
                 text.append(page.extract_text())
         return '\n'.join(text)
     
+    def iter_txt(self, filepath: Path, block_size: int = 1024 * 1024) -> Iterator[str]:
+        """Yield TXT file in blocks."""
+        with open(filepath, 'r', encoding='utf-8') as f:
+            yield from iter(lambda: f.read(block_size), '')
+    
+    def iter_pdf(self, filepath: Path) -> Iterator[str]:
+        """Yield PDF pages and their separators."""
+        import PyPDF2
+        
+        with open(filepath, 'rb') as f:
+            for i, page in enumerate(PyPDF2.PdfReader(f).pages):
+                if i:
+                    yield '\n'
+                yield page.extract_text()
+    
     def load_docx(self, filepath: Path) -> str:
         """Load DOCX file."""
+        import docx  # imported lazily: parsing runs in worker processes
+        
         doc = docx.Document(filepath)
         return '\n'.join([p.text for p in doc.paragraphs])
     
@@ -54,3 +137,75 @@ class DocumentLoader:
         except Exception as e:
             logger.error(f"Failed to load {filepath}: {e}")
             raise DocumentProcessingError(f"Failed to load document: {e}")
+    
+    def iter_document(self, filepath: Path) -> Iterator[str]:
+        """Yield document text in pieces that join to load_document's result."""
+        try:
+            ext = filepath.suffix.lower()
+            
+            if ext == '.txt':
+                yield from self.iter_txt(filepath)
+            elif ext == '.pdf':
+                yield from self.iter_pdf(filepath)
+            elif ext == '.docx':
+                # python-docx parses the whole package up front anyway
+                yield self.load_docx(filepath)
+            else:
+                logger.warning(f"Unsupported file type: {ext}")
+                
+        except Exception as e:
+            logger.error(f"Failed to load {filepath}: {e}")
+            raise DocumentProcessingError(f"Failed to load document: {e}")
+    
+    async def iter_document_async(
+        self,
+        filepath: Path,
+        executor: Optional[Executor] = None
+    ) -> AsyncIterator[str]:
+        """Yield document text without blocking the event loop.
+        
+        With an executor, PDFs are extracted page range by page range in
+        worker processes, so only one batch of pages is in flight.
+        """
+        ext = filepath.suffix.lower()
+        
+        if executor is not None and ext == '.pdf':
+            loop = asyncio.get_running_loop()
+            batch_size = max(1, settings.pdf_page_batch_size)
+            start = 0
+            while True:
+                pages = await loop.run_in_executor(
+                    executor, load_pdf_pages, str(filepath), start, batch_size)
+                for i, text in enumerate(pages):
+                    if start + i:
+                        yield '\n'
+                    yield text
+                if len(pages) < batch_size:
+                    return
+                start += batch_size
+        
+        if executor is not None and ext in CPU_BOUND_EXTENSIONS:
+            content = await self.load_document_async(filepath, executor)
+            if content:
+                yield content
+            return
+        
+        pieces = self.iter_document(filepath)
+        while True:
+            batch = await asyncio.to_thread(lambda: list(islice(pieces, 16)))
+            if not batch:
+                return
+            for piece in batch:
+                yield piece
+    
+    async def load_document_async(
+        self,
+        filepath: Path,
+        executor: Optional[Executor] = None
+    ) -> Optional[str]:
+        """Load document without blocking the event loop."""
+        if executor is not None and filepath.suffix.lower() in CPU_BOUND_EXTENSIONS:
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(executor, load_document_file, str(filepath))
+        
+        return await asyncio.to_thread(self.load_document, filepath)
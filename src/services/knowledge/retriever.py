@@ -1,18 +1,57 @@
 """Knowledge retrieval service."""
 
-from typing import List, Dict, Tuple
+from dataclasses import dataclass
+from typing import AsyncIterator, Hashable, List, Dict, Tuple, Optional, TYPE_CHECKING
+import numpy as np
 from loguru import logger
 
-from src.services.llm import OpenAIService
-from src.vectorstore import PineconeStore
+from src.core import settings, container
+from src.core.metrics import record_cache, span
+from src.services.llm.base import BaseLLMService
+from src.services.cache import AnswerCache, SemanticCache, corpus_version
+from src.services.knowledge.context_builder import ContextBuilder
+
+if TYPE_CHECKING:
+    from src.vectorstore import BaseVectorStore, KeywordIndex
+
+
+@dataclass
+class _Lookup:
+    """Cache lookup state for one question."""
+    question: str
+    version: int
+    key: Optional[Hashable] = None
+    embedding: Optional[np.ndarray] = None
+    cached: Optional[Tuple[str, List[str], float]] = None
 
 
 class Retriever:
     """Retrieve relevant knowledge."""
     
-    def __init__(self):
-        self.llm = OpenAIService()
-        self.vectorstore = PineconeStore()
+    def __init__(
+        self,
+        llm: Optional[BaseLLMService] = None,
+        vectorstore: Optional['BaseVectorStore'] = None,
+        keyword_index: Optional['KeywordIndex'] = None
+    ):
+        self.llm = llm or container.llm
+        self.vectorstore = vectorstore if vectorstore is not None else container.vectorstore
+        self.keyword_index = (
+            keyword_index if keyword_index is not None else container.keyword_index)
+        self.context_builder = ContextBuilder()
+        self.answer_cache: Optional[AnswerCache] = None
+        if settings.answer_cache_enabled:
+            self.answer_cache = AnswerCache(
+                max_entries=settings.answer_cache_max_entries,
+                ttl_seconds=settings.answer_cache_ttl_seconds
+            )
+        self.semantic_cache: Optional[SemanticCache] = None
+        if settings.semantic_cache_enabled:
+            self.semantic_cache = SemanticCache(
+                max_entries=settings.semantic_cache_max_entries,
+                similarity=settings.semantic_cache_similarity,
+                ttl_seconds=settings.answer_cache_ttl_seconds
+            )
     
     async def retrieve_and_answer(
         self, 
@@ -22,34 +61,178 @@ class Retriever:
     ) -> Tuple[str, List[str], float]:
         """Retrieve context and generate answer."""
         try:
-            # Search similar documents
-            results = await self.vectorstore.search(question, top_k, threshold)
-            
-            if not results:
-                # Fallback to general knowledge
-                answer = await self.llm.generate_answer("", question)
-                return answer, [], 0.0
-            
-            # Build context
-            context_parts = []
-            sources = []
-            scores = []
-            
-            for result in results:
-                context_parts.append(f"[{result['filename']}]\n{result['content']}")
-                if result['filename'] not in sources:
-                    sources.append(result['filename'])
-                scores.append(result['score'])
+            lookup = await self._lookup(question, top_k, threshold)
+            if lookup.cached is not None:
+                return lookup.cached
             
-            context = "\n\n".join(context_parts)
-            avg_score = sum(scores) / len(scores)
+            context, sources, avg_score = await self._retrieve(lookup, top_k, threshold)
             
             # Generate answer
-            answer = await self.llm.generate_answer(context, question)
+            with span("generation"):
+                answer = await self.llm.generate_answer(context, question)
             
             logger.info(f"Answer generated with {len(sources)} sources")
-            return answer, sources, avg_score
+            result = (answer, sources, avg_score)
+            self._store(lookup, top_k, threshold, result)
+            return result
             
         except Exception as e:
             logger.error(f"Retrieval error: {e}")
             raise
+    
+    async def stream_answer(
+        self,
+        question: str,
+        top_k: int = 5,
+        threshold: float = 0.7
+    ) -> Tuple[AsyncIterator[str], List[str], float]:
+        """Retrieve context and stream the answer as it is generated."""
+        try:
+            lookup = await self._lookup(question, top_k, threshold)
+            if lookup.cached is not None:
+                answer, sources, confidence = lookup.cached
+                return self._replay(answer), sources, confidence
+            
+            context, sources, avg_score = await self._retrieve(lookup, top_k, threshold)
+            tokens = self._stream_and_store(
+                lookup, context, sources, avg_score, top_k, threshold)
+            return tokens, sources, avg_score
+            
+        except Exception as e:
+            logger.error(f"Retrieval error: {e}")
+            raise
+    
+    async def _lookup(self, question: str, top_k: int, threshold: float) -> _Lookup:
+        """Check answer caches, embedding the question if needed."""
+        lookup = _Lookup(question=question, version=corpus_version.value)
+        
+        # Exact repeat of a recent question
+        if self.answer_cache:
+            lookup.key = self.answer_cache.make_key(question, top_k, threshold, lookup.version)
+            lookup.cached = self.answer_cache.get(lookup.key)
+            record_cache("answer", lookup.cached is not None)
+            if lookup.cached is not None:
+                logger.info("Answer served from cache")
+                return lookup
+        
+        lookup.embedding = await self.vectorstore.embed_query(question)
+        
+        # Paraphrase of a recent question
+        if self.semantic_cache:
+            lookup.cached = self.semantic_cache.get(
+                lookup.embedding, top_k, threshold, lookup.version)
+            record_cache("semantic", lookup.cached is not None)
+            if lookup.cached is not None:
+                logger.info("Answer served from semantic cache")
+                if self.answer_cache:
+                    self.answer_cache.put(lookup.key, lookup.cached)
+        
+        return lookup
+    
+    async def _retrieve(
+        self,
+        lookup: _Lookup,
+        top_k: int,
+        threshold: float
+    ) -> Tuple[str, List[str], float]:
+        """Search the vector store (and keyword index) and build context."""
+        hybrid = self.keyword_index is not None
+        candidates = max(top_k, settings.hybrid_candidates) if hybrid else top_k
+        
+        # Search similar documents
+        with span("vector_search"):
+            results = await self.vectorstore.search_by_vector(
+                lookup.embedding, candidates, threshold)
+        
+        # Exact terms (codes, acronyms) that dense similarity misses
+        if hybrid:
+            with span("keyword_search"):
+                keyword_results = self.keyword_index.search(lookup.question, candidates)
+            results = self._fuse(results, keyword_results, top_k)
+        
+        if not results:
+            # Fallback to general knowledge
+            return "", [], 0.0
+        
+        # Build context within the token budget
+        with span("context_build"):
+            context, included = self.context_builder.build(results)
+            sources = []
+            scores = []
+            
+            for result in included:
+                if result['filename'] not in sources:
+                    sources.append(result['filename'])
+                if result['score'] is not None:
+                    scores.append(result['score'])
+            
+            avg_score = sum(scores) / len(scores) if scores else 0.0
+        return context, sources, avg_score
+    
+    @staticmethod
+    def _fuse(
+        vector_results: List[Dict],
+        keyword_results: List[Dict],
+        top_k: int
+    ) -> List[Dict]:
+        """Merge rankings with reciprocal rank fusion.
+        
+        ``score`` stays the vector similarity (None for keyword-only
+        matches) so confidence remains comparable with vector mode.
+        Keyword-only matches need ``keyword_min_score``, as they skip the
+        similarity threshold; weaker ones only boost vector matches.
+        """
+        fused: Dict[str, Dict] = {}
+        for results, is_vector in ((vector_results, True), (keyword_results, False)):
+            for rank, result in enumerate(results):
+                match = fused.get(result['id'])
+                if match is None:
+                    if not is_vector and result['score'] < settings.keyword_min_score:
+                        continue
+                    match = fused[result['id']] = {
+                        **result,
+                        "score": result['score'] if is_vector else None,
+                        "rrf_score": 0.0
+                    }
+                match['rrf_score'] += 1.0 / (settings.rrf_k + rank + 1)
+        
+        ranked = sorted(fused.values(), key=lambda match: match['rrf_score'], reverse=True)
+        return ranked[:top_k]
+    
+    def _store(
+        self,
+        lookup: _Lookup,
+        top_k: int,
+        threshold: float,
+        result: Tuple[str, List[str], float]
+    ):
+        """Remember answer in both caches."""
+        if self.answer_cache:
+            self.answer_cache.put(lookup.key, result)
+        if self.semantic_cache:
+            self.semantic_cache.put(lookup.embedding, top_k, threshold, lookup.version, result)
+    
+    async def _stream_and_store(
+        self,
+        lookup: _Lookup,
+        context: str,
+        sources: List[str],
+        avg_score: float,
+        top_k: int,
+        threshold: float
+    ) -> AsyncIterator[str]:
+        """Relay generated tokens and cache the full answer once complete."""
+        parts = []
+        # Includes time the consumer spends between tokens
+        with span("generation"):
+            async for token in self.llm.stream_answer(context, lookup.question):
+                parts.append(token)
+                yield token
+        
+        logger.info(f"Answer streamed with {len(sources)} sources")
+        self._store(lookup, top_k, threshold, ("".join(parts).strip(), sources, avg_score))
+    
+    @staticmethod
+    async def _replay(answer: str) -> AsyncIterator[str]:
+        """Yield a cached answer as a single token."""
+        yield answer
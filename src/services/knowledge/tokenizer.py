@@ -0,0 +1,47 @@
+"""Token counting."""
+
+from functools import lru_cache
+from typing import List, Optional
+from loguru import logger
+
+
+@lru_cache(maxsize=None)
+def _load_encoding(encoding_name: str):
+    """Load a tiktoken encoding once per process (None if unavailable)."""
+    try:
+        import tiktoken
+        return tiktoken.get_encoding(encoding_name)
+    except Exception as e:
+        logger.warning(f"tiktoken unavailable, estimating token counts: {e}")
+        return None
+
+
+class TokenCounter:
+    """Count tokens with tiktoken, or estimate them when it is unavailable."""
+    
+    def __init__(self, encoding_name: Optional[str] = "cl100k_base"):
+        self._encoding = _load_encoding(encoding_name) if encoding_name else None
+    
+    @property
+    def is_exact(self) -> bool:
+        return self._encoding is not None
+    
+    def count(self, text: str) -> int:
+        """Number of tokens in text."""
+        if self._encoding is not None:
+            return len(self._encoding.encode(text, disallowed_special=()))
+        # About 4 characters per token for English
+        return len(text) // 4 + 1
+    
+    def split(self, text: str, max_tokens: int) -> List[str]:
+        """Split text into pieces of at most max_tokens tokens."""
+        max_tokens = max(1, max_tokens)
+        if self._encoding is not None:
+            tokens = self._encoding.encode(text, disallowed_special=())
+            return [
+                self._encoding.decode(tokens[i:i + max_tokens])
+                for i in range(0, len(tokens), max_tokens)
+            ]
+        
+        width = max(1, (max_tokens - 1) * 4)
+        return [text[i:i + width] for i in range(0, len(text), width)]
@@ -1,7 +1,8 @@
 """Base LLM service."""
 
 from abc import ABC, abstractmethod
-from typing import List
+from typing import AsyncIterator, List
+import numpy as np
 
 
 class BaseLLMService(ABC):
@@ -13,6 +14,16 @@ class BaseLLMService(ABC):
         pass
 
     @abstractmethod
-    async def create_embedding(self, text: str) -> List[float]:
-        """Create text embedding."""
+    def stream_answer(self, context: str, question: str) -> AsyncIterator[str]:
+        """Generate answer from context and question, yielding text as it arrives."""
+        pass
+
+    @abstractmethod
+    async def create_embedding(self, text: str) -> np.ndarray:
+        """Create text embedding as a float32 vector."""
+        pass
+
+    @abstractmethod
+    async def create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Create embeddings for many texts as float32 rows, preserving order."""
         pass
@@ -1,10 +1,14 @@
 """OpenAI LLM service."""
 
-from openai import AsyncOpenAI
-from typing import List
+import base64
+import httpx
+import numpy as np
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
+from typing import AsyncIterator, Dict, Iterator, List
 from loguru import logger
 
 from src.core import settings
+from src.core.metrics import TOKENS
 from src.core.exceptions import LLMError
 from src.services.llm.base import BaseLLMService
 
@@ -13,12 +17,21 @@ class OpenAIService(BaseLLMService):
     """OpenAI integration."""
 
     def __init__(self):
-        self.client = AsyncOpenAI(api_key=settings.openai_api_key)
+        # One keep-alive pool for every request made through this service
+        self.client = AsyncOpenAI(
+            api_key=settings.openai_api_key,
+            http_client=DefaultAsyncHttpxClient(
+                limits=httpx.Limits(
+                    max_connections=settings.openai_max_connections,
+                    max_keepalive_connections=settings.openai_max_keepalive_connections
+                )
+            )
+        )
 
-    async def generate_answer(self, context: str, question: str) -> str:
-        """Generate answer using GPT-4."""
-        try:
-            prompt = f"""Based on the following context, answer the question.
+    @staticmethod
+    def _build_messages(context: str, question: str) -> List[Dict[str, str]]:
+        """Build chat messages for a question."""
+        prompt = f"""Based on the following context, answer the question.
 
 Context:
 {context}
@@ -27,15 +40,21 @@ Question: {question}
 
 Answer:"""
 
+        return [
+            {"role": "system", "content": "You are a helpful assistant that answers questions based on provided context."},
+            {"role": "user", "content": prompt}
+        ]
+
+    async def generate_answer(self, context: str, question: str) -> str:
+        """Generate answer using GPT-4."""
+        try:
             response = await self.client.chat.completions.create(
                 model=settings.openai_model,
-                messages=[
-                    {"role": "system", "content": "You are a helpful assistant that answers questions based on provided context."},
-                    {"role": "user", "content": prompt}
-                ],
+                messages=self._build_messages(context, question),
                 temperature=0.7,
                 max_tokens=1000
             )
+            self._record_usage(response.usage)
 
             return response.choices[0].message.content.strip()
 
@@ -43,33 +62,131 @@ Answer:"""
             logger.error(f"OpenAI generation error: {e}")
             raise LLMError(f"Failed to generate answer: {e}")
 
-    async def create_embedding(self, text: str) -> List[float]:
-        """Create embedding using OpenAI text-embedding-3-large (default 3072 dimensions)."""
+    async def stream_answer(self, context: str, question: str) -> AsyncIterator[str]:
+        """Generate answer using GPT-4, yielding tokens as they arrive."""
         try:
-            response = await self.client.embeddings.create(
-                model=settings.openai_embedding_model,
-                input=text
+            stream = await self.client.chat.completions.create(
+                model=settings.openai_model,
+                messages=self._build_messages(context, question),
+                temperature=0.7,
+                max_tokens=1000,
+                stream=True,
+                stream_options={"include_usage": True}
             )
 
-            embedding = response.data[0].embedding
-
-            # Truncate or pad to match Pinecone dimension
-            target_dim = settings.vector_dimension
-            current_dim = len(embedding)
-
-            if current_dim > target_dim:
-                # Truncate if embedding is larger
-                embedding = embedding[:target_dim]
-                logger.debug(
-                    f"Truncated embedding from {current_dim} to {target_dim}")
-            elif current_dim < target_dim:
-                # Pad with zeros if embedding is smaller
-                embedding = embedding + [0.0] * (target_dim - current_dim)
-                logger.debug(
-                    f"Padded embedding from {current_dim} to {target_dim}")
-
-            return embedding
+            async for chunk in stream:
+                # Usage arrives on a final chunk without choices
+                if chunk.usage:
+                    self._record_usage(chunk.usage)
+                if chunk.choices and chunk.choices[0].delta.content:
+                    yield chunk.choices[0].delta.content
 
         except Exception as e:
-            logger.error(f"OpenAI embedding error: {e}")
-            raise LLMError(f"Failed to create embedding: {e}")
+            logger.error(f"OpenAI streaming error: {e}")
+            raise LLMError(f"Failed to stream answer: {e}")
+
+    async def create_embedding(self, text: str) -> np.ndarray:
+        """Create embedding using OpenAI text-embedding-3-large (default 3072 dimensions)."""
+        return (await self.create_embeddings([text]))[0]
+
+    async def create_embeddings(self, texts: List[str]) -> np.ndarray:
+        """Create embeddings for many texts using as few requests as possible."""
+        embeddings = np.empty((len(texts), settings.vector_dimension), dtype=np.float32)
+        row = 0
+
+        # text-embedding-3 models shorten vectors server-side
+        extra = {}
+        if settings.embedding_native_dimensions:
+            extra["dimensions"] = settings.vector_dimension
+
+        for batch in self._batch_texts(texts):
+            try:
+                response = await self.client.embeddings.create(
+                    model=settings.openai_embedding_model,
+                    input=batch,
+                    encoding_format="base64",
+                    **extra
+                )
+            except Exception as e:
+                logger.error(f"OpenAI embedding error: {e}")
+                raise LLMError(f"Failed to create embeddings: {e}")
+
+            self._record_usage(response.usage, embedding=True)
+
+            # Results are not guaranteed to come back in input order
+            data = sorted(response.data, key=lambda item: item.index)
+            for item in data:
+                embeddings[row] = self._fit_dimension(self._decode(item.embedding))
+                row += 1
+
+        logger.debug(f"Created {len(embeddings)} embeddings")
+        return embeddings
+
+    @staticmethod
+    def _decode(embedding) -> np.ndarray:
+        """Decode a base64 float32 embedding (or a plain list)."""
+        if isinstance(embedding, str):
+            return np.frombuffer(base64.b64decode(embedding), dtype=np.float32)
+        return np.asarray(embedding, dtype=np.float32)
+
+    @classmethod
+    def count_requests(cls, texts: List[str]) -> int:
+        """Number of embedding requests create_embeddings would make for texts."""
+        return sum(1 for _ in cls._batch_texts(texts))
+
+    @classmethod
+    def _batch_texts(cls, texts: List[str]) -> Iterator[List[str]]:
+        """Group texts into requests within the item and token budgets."""
+        batch: List[str] = []
+        batch_tokens = 0
+
+        for text in texts:
+            tokens = cls._estimate_tokens(text)
+            if batch and (
+                len(batch) >= settings.embedding_batch_size
+                or batch_tokens + tokens > settings.embedding_batch_max_tokens
+            ):
+                yield batch
+                batch = []
+                batch_tokens = 0
+
+            batch.append(text)
+            batch_tokens += tokens
+
+        if batch:
+            yield batch
+
+    @staticmethod
+    def _record_usage(usage, embedding: bool = False):
+        """Count tokens reported by the API."""
+        if usage is None:
+            return
+        if embedding:
+            TOKENS.inc(usage.prompt_tokens, kind="embedding")
+        else:
+            TOKENS.inc(usage.prompt_tokens, kind="prompt")
+            TOKENS.inc(usage.completion_tokens, kind="completion")
+
+    @staticmethod
+    def _estimate_tokens(text: str) -> int:
+        """Rough token count (about 4 characters per token for English)."""
+        return len(text) // 4 + 1
+
+    @staticmethod
+    def _fit_dimension(embedding: np.ndarray) -> np.ndarray:
+        """Truncate or pad embedding to match the store dimension."""
+        target_dim = settings.vector_dimension
+        current_dim = len(embedding)
+
+        if current_dim > target_dim:
+            # Truncate if embedding is larger
+            embedding = embedding[:target_dim]
+            logger.debug(
+                f"Truncated embedding from {current_dim} to {target_dim}")
+        elif current_dim < target_dim:
+            # Pad with zeros if embedding is smaller
+            embedding = np.pad(embedding, (0, target_dim - current_dim))
+            logger.debug(
+                f"Padded embedding from {current_dim} to {target_dim}")
+
+        return embedding
@@ -1,6 +1,20 @@
 """Vector store module."""
 
+from src.vectorstore.base import BaseVectorStore
 from src.vectorstore.pinecone_store import PineconeStore
+from src.vectorstore.local_store import LocalVectorStore
+from src.vectorstore.factory import create_vectorstore
+from src.vectorstore.keyword_index import KeywordIndex
 from src.vectorstore.indexer import DocumentIndexer
+from src.vectorstore.status import IndexingStatus, indexing_status
 
-__all__ = ["PineconeStore", "DocumentIndexer"]
+__all__ = [
+    "BaseVectorStore",
+    "PineconeStore",
+    "LocalVectorStore",
+    "create_vectorstore",
+    "KeywordIndex",
+    "DocumentIndexer",
+    "IndexingStatus",
+    "indexing_status",
+]
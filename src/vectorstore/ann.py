@@ -0,0 +1,88 @@
+"""Approximate nearest neighbour index."""
+
+import math
+from typing import List
+import numpy as np
+
+
+class IVFIndex:
+    """Inverted-file index with a k-means coarse quantizer.
+
+    Vectors are expected to be L2-normalized, so inner product is cosine
+    similarity. Search scans only the rows assigned to the ``nprobe``
+    centroids closest to the query.
+    """
+
+    # Rows scored per block when assigning, to bound temporary memory
+    _BLOCK = 65536
+
+    def __init__(self, nlist: int = 0, nprobe: int = 8, iterations: int = 10, seed: int = 0):
+        self.nlist = nlist
+        self.nprobe = nprobe
+        self.iterations = iterations
+        self.seed = seed
+        self.centroids: np.ndarray = np.zeros((0, 0), dtype=np.float32)
+        self.lists: List[np.ndarray] = []
+        self._pending: List[List[int]] = []
+        self.size = 0
+
+    @property
+    def is_built(self) -> bool:
+        return len(self.lists) > 0
+
+    def build(self, matrix: np.ndarray, rows: np.ndarray):
+        """Cluster the given rows of matrix."""
+        rng = np.random.default_rng(self.seed)
+        n = len(rows)
+        nlist = max(1, min(self.nlist or int(math.sqrt(n)), n))
+
+        # Train on a sample; k-means converges well with ~64 points per list
+        sample_size = min(n, nlist * 64)
+        sample = rows if sample_size == n else rng.choice(rows, sample_size, replace=False)
+        vectors = np.asarray(matrix[sample], dtype=np.float32)
+
+        centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+        for _ in range(self.iterations):
+            assign = np.argmax(vectors @ centroids.T, axis=1)
+            sums = np.zeros_like(centroids)
+            np.add.at(sums, assign, vectors)
+            counts = np.bincount(assign, minlength=nlist)
+            filled = counts > 0
+            centroids[filled] = sums[filled] / counts[filled, None]
+            norms = np.linalg.norm(centroids, axis=1, keepdims=True)
+            centroids = centroids / np.maximum(norms, 1e-12)
+
+        self.centroids = centroids
+        assign = self._assign(matrix, rows)
+        order = np.argsort(assign, kind="stable")
+        bounds = np.searchsorted(assign[order], np.arange(nlist + 1))
+        self.lists = [rows[order[bounds[c]:bounds[c + 1]]] for c in range(nlist)]
+        self._pending = [[] for _ in range(nlist)]
+        self.size = n
+
+    def add(self, matrix: np.ndarray, rows: np.ndarray):
+        """Assign new rows to their nearest list."""
+        if not self.is_built or len(rows) == 0:
+            return
+        for row, c in zip(rows.tolist(), self._assign(matrix, rows).tolist()):
+            self._pending[c].append(row)
+
+    def candidates(self, query: np.ndarray) -> np.ndarray:
+        """Rows in the lists closest to query (may contain duplicates)."""
+        scores = self.centroids @ query
+        nprobe = min(self.nprobe, len(self.lists))
+        probe = np.argpartition(-scores, nprobe - 1)[:nprobe]
+
+        parts = []
+        for c in probe:
+            parts.append(self.lists[c])
+            if self._pending[c]:
+                parts.append(np.asarray(self._pending[c], dtype=np.int64))
+        return np.concatenate(parts) if parts else np.zeros(0, dtype=np.int64)
+
+    def _assign(self, matrix: np.ndarray, rows: np.ndarray) -> np.ndarray:
+        assign = np.empty(len(rows), dtype=np.int64)
+        for start in range(0, len(rows), self._BLOCK):
+            block = np.asarray(matrix[rows[start:start + self._BLOCK]], dtype=np.float32)
+            assign[start:start + len(block)] = np.argmax(block @ self.centroids.T, axis=1)
+        return assign
@@ -0,0 +1,108 @@
+"""Base vector store."""
+
+import asyncio
+from abc import ABC, abstractmethod
+from typing import List, Dict, Optional
+import numpy as np
+from loguru import logger
+
+from src.core import settings
+from src.core.metrics import record_cache, span
+from src.services.llm import OpenAIService
+from src.services.llm.base import BaseLLMService
+from src.services.cache import EmbeddingCache
+
+
+class BaseVectorStore(ABC):
+    """Abstract vector store with cached embedding."""
+
+    # Writes are persisted by the call itself rather than by flush
+    durable = False
+
+    def __init__(self, llm: Optional[BaseLLMService] = None):
+        self.llm = llm or OpenAIService()
+        self.embedding_cache: Optional[EmbeddingCache] = None
+        if settings.embedding_cache_enabled:
+            self.embedding_cache = EmbeddingCache(
+                path=settings.embedding_cache_path,
+                model=settings.openai_embedding_model,
+                dimension=settings.vector_dimension,
+                max_entries=settings.embedding_cache_max_entries
+            )
+
+    async def _embed(self, texts: List[str]) -> np.ndarray:
+        """Embed texts as float32 rows, serving repeats from the embedding cache."""
+        if not self.embedding_cache:
+            with span("embed"):
+                created = await self.llm.create_embeddings(texts)
+            return np.asarray(created, dtype=np.float32).reshape(len(texts), -1)
+
+        cached = await asyncio.to_thread(self.embedding_cache.get_many, texts)
+        missing = [i for i, embedding in enumerate(cached) if embedding is None]
+        record_cache("embedding", True, len(texts) - len(missing))
+        record_cache("embedding", False, len(missing))
+
+        embeddings = np.empty((len(texts), settings.vector_dimension), dtype=np.float32)
+        for i, embedding in enumerate(cached):
+            if embedding is not None:
+                embeddings[i] = embedding
+
+        if missing:
+            with span("embed"):
+                created = await self.llm.create_embeddings([texts[i] for i in missing])
+            await asyncio.to_thread(
+                self.embedding_cache.put_many, [texts[i] for i in missing], created)
+            embeddings[missing] = created
+
+        logger.debug(
+            f"Embedded {len(texts)} texts ({len(texts) - len(missing)} cached)")
+        return embeddings
+
+    @abstractmethod
+    async def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        metadata: Dict,
+        chunk_indices: Optional[List[int]] = None
+    ) -> List[str]:
+        """Upsert document chunks and return their vector ids."""
+        pass
+
+    async def embed_query(self, query: str) -> np.ndarray:
+        """Embed a search query."""
+        return (await self._embed([query]))[0]
+
+    async def search(self, query: str, top_k: int, threshold: float) -> List[Dict]:
+        """Search similar vectors."""
+        embedding = await self.embed_query(query)
+        return await self.search_by_vector(embedding, top_k, threshold)
+
+    @abstractmethod
+    async def search_by_vector(
+        self,
+        embedding: np.ndarray,
+        top_k: int,
+        threshold: float
+    ) -> List[Dict]:
+        """Search vectors similar to an embedding."""
+        pass
+
+    @abstractmethod
+    async def delete(self, doc_id: str):
+        """Delete document vectors."""
+        pass
+
+    @abstractmethod
+    async def delete_ids(self, ids: List[str]):
+        """Delete vectors by id."""
+        pass
+
+    @abstractmethod
+    async def is_connected(self) -> bool:
+        """Check connection."""
+        pass
+
+    def flush(self):
+        """Persist pending writes (no-op for remote stores)."""
+        pass
@@ -0,0 +1,22 @@
+"""Vector store selection."""
+
+from typing import Optional
+
+from src.core import settings
+from src.core.exceptions import ConfigurationError
+from src.services.llm.base import BaseLLMService
+from src.vectorstore.base import BaseVectorStore
+
+
+def create_vectorstore(llm: Optional[BaseLLMService] = None) -> BaseVectorStore:
+    """Create the vector store configured by VECTOR_STORE_BACKEND."""
+    backend = settings.vector_store_backend.lower()
+
+    if backend == "pinecone":
+        from src.vectorstore.pinecone_store import PineconeStore
+        return PineconeStore(llm)
+    if backend == "local":
+        from src.vectorstore.local_store import LocalVectorStore
+        return LocalVectorStore(llm)
+
+    raise ConfigurationError(f"Unknown vector store backend: {settings.vector_store_backend}")
@@ -1,32 +1,40 @@
 """Document indexing service."""
 
 import asyncio
+import hashlib
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import asynccontextmanager
 from pathlib import Path
-from typing import Set, Dict, Optional
+from typing import AsyncIterator, Callable, Iterable, Set, Dict, List, Optional, Tuple
 from watchdog.observers import Observer
 from watchdog.events import FileSystemEventHandler, FileSystemEvent
 from loguru import logger
 
-from src.core import settings
+from src.core import settings, container
 from src.services.knowledge import DocumentLoader, Chunker
-from src.vectorstore.pinecone_store import PineconeStore
+from src.services.cache import corpus_version
+from src.vectorstore.base import BaseVectorStore
+from src.vectorstore.keyword_index import KeywordIndex
+from src.vectorstore.manifest import IndexManifest, ManifestEntry
+from src.vectorstore.scheduler import IndexScheduler
+from src.vectorstore.status import IndexingStatus, indexing_status
 
 
 class DocumentEventHandler(FileSystemEventHandler):
     """File system event handler."""
 
-    def __init__(self, indexer: 'DocumentIndexer', loop: asyncio.AbstractEventLoop):
-        self.indexer = indexer
-        self.loop = loop
+    def __init__(self, scheduler: IndexScheduler):
+        self.scheduler = scheduler
 
     def _is_supported(self, filepath: str) -> bool:
         """Check if file is supported."""
         return any(filepath.endswith(ext) for ext in settings.supported_extensions)
 
-    def _schedule_task(self, coro):
-        """Schedule coroutine in the main event loop."""
+    def _schedule(self, filepath: str, action: str):
+        """Hand event to the debouncing scheduler."""
         try:
-            asyncio.run_coroutine_threadsafe(coro, self.loop)
+            self.scheduler.submit(filepath, action)
         except Exception as e:
             logger.error(f"Failed to schedule task: {e}")
 
@@ -34,139 +42,550 @@ class DocumentEventHandler(FileSystemEventHandler):
         """Handle file creation."""
         if not event.is_directory and self._is_supported(event.src_path):
             logger.info(f"New file: {event.src_path}")
-            self._schedule_task(self.indexer.index_file(Path(event.src_path)))
+            self._schedule(event.src_path, IndexScheduler.INDEX)
 
     def on_modified(self, event: FileSystemEvent):
         """Handle file modification."""
         if not event.is_directory and self._is_supported(event.src_path):
-            logger.info(f"Modified: {event.src_path}")
-            self._schedule_task(
-                self.indexer.reindex_file(Path(event.src_path)))
+            logger.debug(f"Modified: {event.src_path}")
+            self._schedule(event.src_path, IndexScheduler.INDEX)
 
     def on_deleted(self, event: FileSystemEvent):
         """Handle file deletion."""
         if not event.is_directory and self._is_supported(event.src_path):
             logger.info(f"Deleted: {event.src_path}")
-            self._schedule_task(self.indexer.remove_file(Path(event.src_path)))
+            self._schedule(event.src_path, IndexScheduler.REMOVE)
+
+    def on_moved(self, event: FileSystemEvent):
+        """Handle file rename (editors often save via temp file + rename)."""
+        if event.is_directory:
+            return
+        if self._is_supported(event.src_path):
+            self._schedule(event.src_path, IndexScheduler.REMOVE)
+        if self._is_supported(event.dest_path):
+            logger.info(f"Moved: {event.src_path} -> {event.dest_path}")
+            self._schedule(event.dest_path, IndexScheduler.INDEX)
+
+
+def manifest_store() -> Dict:
+    """Vector store the manifest's entries live in."""
+    if settings.vector_store_backend == "local":
+        index = settings.local_store_path
+    else:
+        index = settings.pinecone_index_name
+    return {
+        "backend": settings.vector_store_backend,
+        "index": index,
+        "dimension": settings.vector_dimension
+    }
+
+
+def manifest_pipeline() -> Dict:
+    """Settings that decide which chunks and vectors a file produces."""
+    return {
+        "embedding_model": settings.openai_embedding_model,
+        "native_dimensions": settings.embedding_native_dimensions,
+        "chunk_unit": settings.chunk_unit,
+        "max_chunk_size": settings.max_chunk_size,
+        "chunk_overlap": settings.chunk_overlap,
+        "max_chunk_tokens": settings.max_chunk_tokens,
+        "chunk_overlap_tokens": settings.chunk_overlap_tokens,
+        "chunk_tokenizer_encoding": settings.chunk_tokenizer_encoding
+    }
 
 
 class DocumentIndexer:
     """Index documents to vector store."""
 
-    def __init__(self):
+    def __init__(
+        self,
+        vectorstore: Optional[BaseVectorStore] = None,
+        keyword_index: Optional[KeywordIndex] = None
+    ):
         self.loader = DocumentLoader()
         self.chunker = Chunker()
-        self.vectorstore = PineconeStore()
-        self.indexed_files: Set[str] = set()
-        self.file_hashes: Dict[str, str] = {}
+        self.vectorstore = vectorstore if vectorstore is not None else container.vectorstore
+        self.keyword_index = (
+            keyword_index if keyword_index is not None else container.keyword_index)
+        self.manifest = IndexManifest(
+            settings.index_manifest_path,
+            store=manifest_store(),
+            pipeline=manifest_pipeline()
+        )
+        self.manifest.load()
+        self.status: IndexingStatus = indexing_status
         self.observer = None
+        self.scheduler: Optional[IndexScheduler] = None
         self.loop: Optional[asyncio.AbstractEventLoop] = None
+        self.executor: Optional[ProcessPoolExecutor] = None
+        if settings.parser_workers > 0:
+            # Spawn keeps workers clear of locks held by the bot/watcher threads
+            self.executor = ProcessPoolExecutor(
+                max_workers=settings.parser_workers,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        self._bulk_depth = 0
+        self._checkpoint_timer: Optional[asyncio.TimerHandle] = None
+        # Content hash or path -> [lock, number of holders and waiters]
+        self._hash_locks: Dict[str, list] = {}
+        self._path_locks: Dict[str, list] = {}
+
+    @property
+    def indexed_files(self) -> Set[str]:
+        """Paths of indexed files."""
+        return {entry.path for entry in self.manifest}
+
+    @property
+    def file_hashes(self) -> Dict[str, str]:
+        """Content hash per indexed path."""
+        return {entry.path: entry.content_hash for entry in self.manifest}
+
+    async def _load(self, filepath: Path) -> Optional[str]:
+        """Load document off the event loop."""
+        return await self.loader.load_document_async(filepath, self.executor)
+
+    async def _stream_chunks(self, filepath: Path) -> AsyncIterator[str]:
+        """Chunks of a document read piece by piece."""
+        stream = self.chunker.stream()
+        async for piece in self.loader.iter_document_async(filepath, self.executor):
+            for chunk in stream.feed(piece):
+                yield chunk
+        for chunk in stream.close():
+            yield chunk
+
+    @staticmethod
+    async def _iter_chunks(chunks: Iterable[str]) -> AsyncIterator[str]:
+        for chunk in chunks:
+            yield chunk
+
+    async def iter_file_chunks(self, filepath: Path) -> AsyncIterator[str]:
+        """Chunks of a file as index_file would create them."""
+        if filepath.stat().st_size >= settings.streaming_min_file_size:
+            async for chunk in self._stream_chunks(filepath):
+                yield chunk
+            return
+
+        content = await self._load(filepath)
+        for chunk in self.chunker.create_chunks(content) if content else []:
+            yield chunk
+
+    def _save_manifest(self, path: str):
+        """Persist the change to path's manifest entry.
+
+        Bulk runs and watcher jobs checkpoint in batches; meanwhile a store
+        that persists writes immediately gets the change journaled, so a
+        crash loses no finished file. Other stores wait for the checkpoint,
+        since their vectors are not on disk before it either.
+        """
+        batched = self._bulk_depth > 0 or (
+            self.scheduler is not None and settings.watch_checkpoint_delay_seconds > 0)
+        if not batched:
+            self.checkpoint()
+            return
+
+        if self.vectorstore.durable:
+            self.manifest.record(path)
+        if self._bulk_depth == 0:
+            self._schedule_checkpoint()
+
+    def _schedule_checkpoint(self):
+        """Checkpoint watcher changes once the delay since the first one passes."""
+        if self._checkpoint_timer is None:
+            self._checkpoint_timer = self.loop.call_later(
+                settings.watch_checkpoint_delay_seconds, self._deferred_checkpoint)
+
+    def _deferred_checkpoint(self):
+        self._checkpoint_timer = None
+        if self._bulk_depth > 0:
+            # The bulk run checkpoints when it ends
+            return
+        try:
+            self.checkpoint()
+        except Exception as e:
+            logger.error(f"Failed to checkpoint index: {e}")
+
+    def checkpoint(self):
+        """Persist vectors, keyword index and manifest."""
+        self.vectorstore.flush()
+        if self.keyword_index is not None:
+            self.keyword_index.save()
+        self.manifest.save()
 
     async def index_file(self, filepath: Path) -> bool:
         """Index a single file."""
+        # The startup pass and watcher jobs may reach the same path at once
+        async with self._keyed_lock(self._path_locks, str(filepath)):
+            return await self._index_file(filepath)
+
+    async def _index_file(self, filepath: Path) -> bool:
+        """Index a single file, its path lock held."""
         try:
-            # Load document
-            content = self.loader.load_document(filepath)
-            if not content:
-                return False
+            path = str(filepath)
+            entry = self.manifest.get(path)
 
-            # Calculate hash
-            doc_hash = self.loader.calculate_hash(content)
+            # Chunks indexed before the keyword index was enabled
+            if entry and self._missing_keywords(entry):
+                await self._backfill_keywords(filepath, entry)
 
-            # Check if already indexed
-            if doc_hash in self.file_hashes.values():
-                logger.info(f"Already indexed: {filepath.name}")
+            # Fast path: nothing on disk changed since last index
+            stat = filepath.stat()
+            if entry and entry.matches_stat(stat):
+                logger.debug(f"Unchanged: {filepath.name}")
                 return True
 
-            # Create chunks
-            chunks = self.chunker.create_chunks(content)
+            # Touched but byte-identical file
+            file_hash = await asyncio.to_thread(self.loader.calculate_file_hash, filepath)
+            if entry and entry.file_hash == file_hash:
+                self._refresh_entry(entry, stat, file_hash)
+                return True
 
-            # Upsert to vector store
-            metadata = {
-                "filename": filepath.name,
-                "file_type": filepath.suffix
-            }
-            await self.vectorstore.upsert(doc_hash, chunks, metadata)
+            # Large files are read once, as a stream while chunking, so their
+            # content is keyed by file bytes rather than extracted text
+            streaming = stat.st_size >= settings.streaming_min_file_size
+            if streaming:
+                content = None
+                doc_hash = file_hash
+            else:
+                content = await self._load(filepath)
+                doc_hash = self.loader.calculate_hash(content) if content else None
+
+            if not doc_hash:
+                return False
 
-            # Track indexed file
-            self.indexed_files.add(str(filepath))
-            self.file_hashes[str(filepath)] = doc_hash
+            # Same text, different container bytes (e.g. re-saved PDF)
+            if entry and entry.content_hash == doc_hash:
+                self._refresh_entry(entry, stat, file_hash)
+                return True
 
-            logger.info(f"Indexed: {filepath.name}")
+            # Serialize work on identical content so it is embedded once
+            patched = False
+            async with self._keyed_lock(self._hash_locks, doc_hash):
+                # Check if already indexed under another path
+                twins = self.manifest.paths_for(doc_hash)
+                if twins:
+                    twin = self.manifest.get(next(iter(twins)))
+                    vector_ids = list(twin.vector_ids)
+                    chunk_hashes = list(twin.chunk_hashes)
+                    logger.info(f"Already indexed: {filepath.name}")
+                else:
+                    # Create chunks
+                    if streaming:
+                        chunks = self._stream_chunks(filepath)
+                    else:
+                        chunks = self._iter_chunks(self.chunker.create_chunks(content))
+
+                    # Edits to content no other path shares are patched in place
+                    previous = entry if entry and self._owns(entry) else None
+                    patched = previous is not None
+
+                    # Upsert to vector store
+                    metadata = {
+                        "filename": filepath.name,
+                        "file_type": filepath.suffix
+                    }
+                    vector_ids, chunk_hashes = await self._upsert_changed(
+                        path, doc_hash, chunks, metadata, previous)
+                    logger.info(f"Indexed: {filepath.name}")
+
+                # Track indexed file
+                self.manifest.set(ManifestEntry(
+                    path=path,
+                    mtime=stat.st_mtime,
+                    size=stat.st_size,
+                    content_hash=doc_hash,
+                    file_hash=file_hash,
+                    vector_ids=vector_ids,
+                    chunk_count=len(vector_ids),
+                    chunk_hashes=chunk_hashes
+                ))
+
+            # Drop vectors of the previous version
+            if entry and not patched:
+                await self._release(entry)
+
+            self._save_manifest(str(filepath))
             return True
 
         except Exception as e:
             logger.error(f"Failed to index {filepath}: {e}")
             return False
 
-    async def reindex_file(self, filepath: Path) -> bool:
-        """Reindex modified file."""
+    @staticmethod
+    @asynccontextmanager
+    async def _keyed_lock(locks: Dict[str, list], key: str) -> AsyncIterator[None]:
+        """Hold the lock for key; dropped once nobody holds or awaits it."""
+        entry = locks.setdefault(key, [asyncio.Lock(), 0])
+        entry[1] += 1
         try:
-            # Get old hash
-            old_hash = self.file_hashes.get(str(filepath))
+            async with entry[0]:
+                yield
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0:
+                del locks[key]
+
+    def _missing_keywords(self, entry: ManifestEntry) -> bool:
+        """Check if entry's chunks are absent from the keyword index."""
+        return self.keyword_index is not None and any(
+            vector_id not in self.keyword_index for vector_id in entry.vector_ids)
+
+    async def _backfill_keywords(self, filepath: Path, entry: ManifestEntry):
+        """Add an unchanged file's chunks to the keyword index without re-embedding."""
+        content = await self._load(filepath)
+        chunks = self.chunker.create_chunks(content) if content else []
+        if [self.loader.calculate_hash(c) for c in chunks] != entry.chunk_hashes:
+            # Changed files are covered by reindexing below
+            logger.debug(f"Cannot backfill keywords for {filepath.name}: chunks differ")
+            return
+
+        self.keyword_index.add(
+            entry.content_hash, entry.vector_ids, chunks, {"filename": filepath.name})
+        self._save_manifest(entry.path)
+
+    def _owns(self, entry: ManifestEntry) -> bool:
+        """Check if entry's vectors belong to its path alone and can be diffed."""
+        return (
+            self.manifest.paths_for(entry.content_hash) == {entry.path}
+            and len(entry.chunk_hashes) == len(entry.vector_ids)
+        )
+
+    @staticmethod
+    def _vector_prefix(path: str, doc_hash: str, previous: Optional[ManifestEntry]) -> str:
+        """Vector id prefix for one version of a path's content."""
+        sha = hashlib.sha256(path.encode())
+        for vector_id in previous.vector_ids if previous else []:
+            sha.update(b"\0" + vector_id.encode())
+        return f"{doc_hash}_{sha.hexdigest()[:12]}"
+
+    async def _upsert_changed(
+        self,
+        path: str,
+        doc_hash: str,
+        chunks: AsyncIterator[str],
+        metadata: Dict,
+        previous: Optional[ManifestEntry] = None
+    ) -> Tuple[List[str], List[str]]:
+        """Embed only chunks missing from the previous version and drop vanished ones.
+
+        New chunks are upserted in batches as they arrive, with up to
+        ``indexing_upserts_in_flight`` batches pending, so embedding overlaps
+        parsing and chunk text held stays bounded; returns vector ids and
+        chunk hashes.
+        New vector ids are prefixed by path and previous version as well as
+        content: a patched entry keeps ids of its old content, and indexing
+        that old content elsewhere must not overwrite or delete them. The
+        prefix is the same when a failed run is retried, so the retry
+        overwrites rather than duplicates; batches upserted before a failure
+        are deleted again.
+        """
+        vector_prefix = self._vector_prefix(path, doc_hash, previous)
+        previous_ids: Dict[str, List[str]] = {}
+        if previous:
+            for chunk_hash, vector_id in zip(previous.chunk_hashes, previous.vector_ids):
+                previous_ids.setdefault(chunk_hash, []).append(vector_id)
+
+        vector_ids: List[Optional[str]] = []
+        chunk_hashes: List[str] = []
+        batch: List[str] = []
+        batch_indices: List[int] = []
+        new_count = 0
+        in_flight: Set[asyncio.Task] = set()
+        upserted: List[str] = []
+
+        async def upsert_batch(batch: List[str], batch_indices: List[int]):
+            new_ids = await self.vectorstore.upsert(
+                vector_prefix, batch, metadata, chunk_indices=batch_indices)
+            upserted.extend(new_ids)
+            for idx, vector_id in zip(batch_indices, new_ids):
+                vector_ids[idx] = vector_id
+            if self.keyword_index is not None:
+                self.keyword_index.add(vector_prefix, new_ids, batch, metadata)
+
+        async def wait_for(limit: int):
+            while len(in_flight) > limit:
+                done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+                in_flight.difference_update(done)
+                for task in done:
+                    task.result()
 
-            # Load new content
-            content = self.loader.load_document(filepath)
-            new_hash = self.loader.calculate_hash(content)
+        try:
+            async for chunk in chunks:
+                chunk_hash = self.loader.calculate_hash(chunk)
+                kept = previous_ids.get(chunk_hash)
+                chunk_hashes.append(chunk_hash)
+                if kept:
+                    vector_ids.append(kept.pop(0))
+                    if self.keyword_index is not None and vector_ids[-1] not in self.keyword_index:
+                        self.keyword_index.add(vector_prefix, [vector_ids[-1]], [chunk], metadata)
+                    continue
+
+                batch_indices.append(len(vector_ids))
+                vector_ids.append(None)
+                batch.append(chunk)
+                if len(batch) >= settings.embedding_batch_size:
+                    await wait_for(max(1, settings.indexing_upserts_in_flight) - 1)
+                    in_flight.add(asyncio.create_task(upsert_batch(batch, batch_indices)))
+                    new_count += len(batch)
+                    batch, batch_indices = [], []
+
+            if batch:
+                in_flight.add(asyncio.create_task(upsert_batch(batch, batch_indices)))
+                new_count += len(batch)
+            await wait_for(0)
+
+        except BaseException:
+            for task in in_flight:
+                task.cancel()
+            await asyncio.gather(*in_flight, return_exceptions=True)
+            # Not recorded in the manifest, so nothing else would delete them
+            try:
+                await self._delete_vectors(upserted)
+            except Exception as e:
+                logger.error(f"Failed to delete {len(upserted)} partially indexed vectors: {e}")
+            raise
 
-            # Check if changed
-            if old_hash == new_hash:
-                return True
+        vanished = [vector_id for ids in previous_ids.values() for vector_id in ids]
+        await self._delete_vectors(vanished)
 
-            # Delete old vectors
-            if old_hash:
-                self.vectorstore.delete(old_hash)
+        if new_count or vanished:
+            corpus_version.bump()
 
-            # Index new version
-            return await self.index_file(filepath)
+        if previous:
+            logger.info(
+                f"Updated {new_count}/{len(chunk_hashes)} chunks, removed {len(vanished)}")
+        return vector_ids, chunk_hashes
+
+    def _refresh_entry(self, entry: ManifestEntry, stat, file_hash: str):
+        """Record new file metadata for unchanged content."""
+        entry.mtime = stat.st_mtime
+        entry.size = stat.st_size
+        entry.file_hash = file_hash
+        self.manifest.set(entry)
+        self._save_manifest(entry.path)
+
+    async def _release(self, entry: ManifestEntry):
+        """Delete entry's vectors if no indexed path still uses them."""
+        if self.manifest.paths_for(entry.content_hash):
+            return
+
+        await self._delete_vectors(entry.vector_ids)
+        corpus_version.bump()
+
+    async def _delete_vectors(self, vector_ids: List[str]):
+        """Delete vectors from the store and the keyword index."""
+        if not vector_ids:
+            return
+        await self.vectorstore.delete_ids(vector_ids)
+        if self.keyword_index is not None:
+            self.keyword_index.remove(vector_ids)
+
+    async def _drop_orphaned(self):
+        """Delete vectors recorded by a manifest built with other settings."""
+        orphaned = self.manifest.orphaned
+        if not orphaned:
+            return
+
+        # Twins share ids
+        vector_ids = list(dict.fromkeys(
+            vector_id for entry in orphaned for vector_id in entry.vector_ids))
+        await self._delete_vectors(vector_ids)
+        self.manifest.orphaned = []
+        corpus_version.bump()
+        logger.info(f"Deleted {len(vector_ids)} vectors built with previous settings")
 
-        except Exception as e:
-            logger.error(f"Failed to reindex {filepath}: {e}")
-            return False
+    async def reindex_file(self, filepath: Path) -> bool:
+        """Reindex modified file."""
+        # index_file detects unchanged content and replaces old vectors
+        return await self.index_file(filepath)
 
     async def remove_file(self, filepath: Path) -> bool:
         """Remove file vectors."""
         try:
-            doc_hash = self.file_hashes.get(str(filepath))
-            if doc_hash:
-                self.vectorstore.delete(doc_hash)
-                self.indexed_files.discard(str(filepath))
-                del self.file_hashes[str(filepath)]
-                logger.info(f"Removed: {filepath.name}")
+            async with self._keyed_lock(self._path_locks, str(filepath)):
+                entry = self.manifest.remove(str(filepath))
+                if entry:
+                    await self._release(entry)
+                    self._save_manifest(entry.path)
+                    logger.info(f"Removed: {filepath.name}")
             return True
         except Exception as e:
             logger.error(f"Failed to remove {filepath}: {e}")
             return False
 
-    async def index_all(self) -> Dict:
-        """Index all documents in folder."""
+    def list_documents(self) -> List[Path]:
+        """Supported files in the documents folder."""
+        folder = Path(settings.documents_folder)
+        if not folder.exists():
+            folder.mkdir(parents=True, exist_ok=True)
+            logger.warning(f"Created documents folder: {folder}")
+
+        files = []
+        for ext in settings.supported_extensions:
+            files.extend(folder.glob(f"**/*{ext}"))
+        return files
+
+    async def index_all(self, on_file: Optional[Callable[[Path, bool], None]] = None) -> Dict:
+        """Index all documents in folder.
+
+        Progress is checkpointed every ``index_checkpoint_interval`` files,
+        and journaled after each file for stores that write immediately, so
+        an interrupted run resumes with the files it had not finished. Files
+        indexed after the last checkpoint are upserted again under the same
+        ids, mostly from the embedding cache.
+        """
+        self._bulk_depth += 1
         try:
-            folder = Path(settings.documents_folder)
-            if not folder.exists():
-                folder.mkdir(parents=True, exist_ok=True)
-                logger.warning(f"Created documents folder: {folder}")
+            files = self.list_documents()
+            self.status.start(len(files))
+            await self._drop_orphaned()
 
-            files = []
-            for ext in settings.supported_extensions:
-                files.extend(folder.glob(f"**/*{ext}"))
+            # Files deleted while the app was down
+            current = {str(filepath) for filepath in files}
+            for entry in self.manifest:
+                if entry.path not in current:
+                    await self.remove_file(Path(entry.path))
 
             results = {"total": len(files), "success": 0, "failed": 0}
+            semaphore = asyncio.Semaphore(max(1, settings.indexing_concurrency))
 
-            for filepath in files:
-                success = await self.index_file(filepath)
+            async def index_one(filepath: Path):
+                async with semaphore:
+                    success = await self.index_file(filepath)
                 if success:
                     results["success"] += 1
                 else:
                     results["failed"] += 1
+                done = results["success"] + results["failed"]
+                self.status.advance(success)
+                logger.debug(f"Indexing progress: {done}/{results['total']}")
+
+                interval = settings.index_checkpoint_interval
+                if interval > 0 and done % interval == 0:
+                    self.checkpoint()
+                if on_file:
+                    on_file(filepath, success)
+
+            await asyncio.gather(*(index_one(filepath) for filepath in files))
 
             logger.info(
                 f"Indexed {results['success']}/{results['total']} documents")
+            self.status.finish()
             return results
 
+        except asyncio.CancelledError:
+            self.status.finish(error="cancelled")
+            raise
+
         except Exception as e:
             logger.error(f"Failed to index all: {e}")
+            self.status.finish(error=str(e))
             return {"error": str(e)}
 
+        finally:
+            self._bulk_depth -= 1
+            if self._bulk_depth == 0:
+                self.checkpoint()
+
     def start_watching(self):
         """Start watching documents folder."""
         try:
@@ -176,7 +595,13 @@ class DocumentIndexer:
             folder = Path(settings.documents_folder)
             folder.mkdir(parents=True, exist_ok=True)
 
-            event_handler = DocumentEventHandler(self, self.loop)
+            self.scheduler = IndexScheduler(
+                self,
+                self.loop,
+                debounce=settings.watch_debounce_seconds,
+                max_jobs=settings.watch_max_concurrent_jobs
+            )
+            event_handler = DocumentEventHandler(self.scheduler)
             self.observer = Observer()
             self.observer.schedule(event_handler, str(folder), recursive=True)
             self.observer.start()
@@ -193,3 +618,16 @@ class DocumentIndexer:
             self.observer.stop()
             self.observer.join()
             logger.info("Stopped watching")
+        if self.scheduler:
+            self.scheduler.cancel()
+            self.scheduler = None
+        if self._checkpoint_timer:
+            self._checkpoint_timer.cancel()
+            self._checkpoint_timer = None
+            self.checkpoint()
+
+    def close(self):
+        """Release parser workers."""
+        if self.executor:
+            self.executor.shutdown(wait=False, cancel_futures=True)
+            self.executor = None
@@ -0,0 +1,208 @@
+"""In-process BM25 keyword index."""
+
+import heapq
+import json
+import math
+import os
+import re
+from array import array
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Set
+from loguru import logger
+
+from src.core.exceptions import VectorDBError
+
+
+# Words, numbers and codes such as "X-200" or "v2.1"
+TOKEN_PATTERN = re.compile(r"\w+(?:[-.]\w+)*")
+
+
+# Function words that match almost every chunk and would let any question
+# through on "the" or "is" alone
+STOPWORDS = frozenset("""
+a about above after again against all am an and any are as at be because been
+before being below between both but by can could did do does doing down during
+each few for from further had has have having he her here hers herself him
+himself his how i if in into is it its itself just me more most my myself no nor
+not now of off on once only or other our ours ourselves out over own same she
+should so some such than that the their theirs them themselves then there these
+they this those through to too under until up very was we were what when where
+which while who whom why will with would you your yours yourself yourselves
+""".split())
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercased terms of text, without stopwords."""
+    return [term for term in TOKEN_PATTERN.findall(text.lower()) if term not in STOPWORDS]
+
+
+class KeywordIndex:
+    """BM25 over chunks, keyed by the same ids as the vector store.
+
+    Terms are interned to integers and each chunk occupies a slot, so a
+    posting is a slot -> term frequency entry. Slots of removed chunks
+    are reused.
+    """
+
+    VERSION = 1
+
+    def __init__(self, path: Optional[str] = None, k1: float = 1.5, b: float = 0.75):
+        self.path = Path(path) if path else None
+        self.k1 = k1
+        self.b = b
+
+        self._terms: Dict[str, int] = {}
+        self._postings: List[Dict[int, int]] = []
+        self._slots: Dict[str, int] = {}
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict]] = []
+        self._lengths = array('I')
+        self._free: List[int] = []
+        self._by_document: Dict[str, Set[str]] = {}
+        self._total_length = 0
+        self.dirty = False
+
+    def __len__(self) -> int:
+        return len(self._slots)
+
+    def __contains__(self, vector_id: str) -> bool:
+        return vector_id in self._slots
+
+    def add(self, doc_id: str, ids: List[str], chunks: List[str], metadata: Dict):
+        """Index chunks of a document, replacing chunks with the same ids."""
+        self.remove(ids)
+        for vector_id, chunk in zip(ids, chunks):
+            terms = tokenize(chunk)
+            slot = self._free.pop() if self._free else len(self._ids)
+            if slot == len(self._ids):
+                self._ids.append(None)
+                self._metadata.append(None)
+                self._lengths.append(0)
+
+            for term, tf in Counter(terms).items():
+                term_id = self._terms.get(term)
+                if term_id is None:
+                    term_id = self._terms[term] = len(self._postings)
+                    self._postings.append({})
+                self._postings[term_id][slot] = tf
+
+            self._ids[slot] = vector_id
+            self._metadata[slot] = {
+                "content": chunk,
+                "filename": metadata.get("filename", ""),
+                "document_id": doc_id
+            }
+            self._lengths[slot] = len(terms)
+            self._total_length += len(terms)
+            self._slots[vector_id] = slot
+            self._by_document.setdefault(doc_id, set()).add(vector_id)
+
+        self.dirty = True
+
+    def remove(self, ids: Iterable[str]):
+        """Drop chunks by id."""
+        for vector_id in ids:
+            slot = self._slots.pop(vector_id, None)
+            if slot is None:
+                continue
+
+            metadata = self._metadata[slot]
+            for term in set(tokenize(metadata["content"])):
+                self._postings[self._terms[term]].pop(slot, None)
+
+            document = self._by_document.get(metadata["document_id"])
+            if document is not None:
+                document.discard(vector_id)
+                if not document:
+                    del self._by_document[metadata["document_id"]]
+
+            self._total_length -= self._lengths[slot]
+            self._ids[slot] = None
+            self._metadata[slot] = None
+            self._lengths[slot] = 0
+            self._free.append(slot)
+            self.dirty = True
+
+    def remove_document(self, doc_id: str):
+        """Drop every chunk of a document."""
+        self.remove(list(self._by_document.get(doc_id, ())))
+
+    def search(self, query: str, top_k: int) -> List[Dict]:
+        """Chunks ranked by BM25 score."""
+        count = len(self._slots)
+        if count == 0 or top_k <= 0:
+            return []
+
+        average_length = self._total_length / count or 1.0
+        scores: Dict[int, float] = {}
+        for term in set(tokenize(query)):
+            term_id = self._terms.get(term)
+            if term_id is None or not self._postings[term_id]:
+                continue
+
+            postings = self._postings[term_id]
+            idf = math.log(1 + (count - len(postings) + 0.5) / (len(postings) + 0.5))
+            for slot, tf in postings.items():
+                norm = self.k1 * (1 - self.b + self.b * self._lengths[slot] / average_length)
+                scores[slot] = scores.get(slot, 0.0) + idf * tf * (self.k1 + 1) / (tf + norm)
+
+        matches = []
+        for slot, score in heapq.nlargest(top_k, scores.items(), key=lambda item: item[1]):
+            metadata = self._metadata[slot]
+            matches.append({
+                "id": self._ids[slot],
+                "score": score,
+                "content": metadata["content"],
+                "filename": metadata["filename"],
+                "document_id": metadata["document_id"]
+            })
+        return matches
+
+    def load(self):
+        """Load chunks from disk and rebuild postings."""
+        if not self.path or not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get("version") != self.VERSION:
+                logger.warning(f"Ignoring keyword index with unknown version: {self.path}")
+                return
+
+            for item in data.get("chunks", []):
+                self.add(
+                    item["document_id"],
+                    [item["id"]],
+                    [item["content"]],
+                    {"filename": item["filename"]}
+                )
+            self.dirty = False
+            logger.info(f"Loaded keyword index with {len(self)} chunks")
+
+        except Exception as e:
+            logger.error(f"Keyword index load error: {e}")
+            raise VectorDBError(f"Failed to load keyword index: {e}")
+
+    def save(self):
+        """Write chunks atomically."""
+        if not self.path or not self.dirty:
+            return
+
+        try:
+            chunks = [
+                {"id": self._ids[slot], **self._metadata[slot]}
+                for slot in sorted(self._slots.values())
+            ]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+            tmp_path.write_text(
+                json.dumps({"version": self.VERSION, "chunks": chunks}),
+                encoding='utf-8'
+            )
+            os.replace(tmp_path, self.path)
+            self.dirty = False
+
+        except Exception as e:
+            logger.error(f"Keyword index save error: {e}")
+            raise VectorDBError(f"Failed to save keyword index: {e}")
@@ -0,0 +1,405 @@
+"""Local in-process vector store."""
+
+import asyncio
+import json
+import os
+from pathlib import Path
+from typing import List, Dict, Optional
+import numpy as np
+from loguru import logger
+
+from src.core import settings
+from src.core.exceptions import VectorDBError
+from src.services.llm.base import BaseLLMService
+from src.vectorstore.base import BaseVectorStore
+from src.vectorstore.ann import IVFIndex
+from src.vectorstore.quantization import make_quantized
+
+
+class LocalVectorStore(BaseVectorStore):
+    """Vectors in a contiguous float32 matrix with brute-force or IVF search.
+
+    With quantization enabled, brute-force search scans compact int8 or
+    binary codes and rescores the best candidates in float32. The codes
+    are kept in addition to the float32 matrix, which only leaves RAM when
+    memory-mapped.
+
+    With ``local_store_mmap`` the matrix is a writable memory map of the
+    vectors file: it grows on disk, and flush only syncs dirty pages.
+    """
+
+    VECTORS_FILE = "vectors.npy"
+    INDEX_FILE = "index.json"
+    CODES_FILE = "codes.npz"
+
+    _COPY_BLOCK = 65536
+
+    def __init__(self, llm: Optional[BaseLLMService] = None, path: Optional[str] = None):
+        super().__init__(llm)
+        path = path if path is not None else settings.local_store_path
+        self.path = Path(path) if path else None
+        self.dimension = settings.vector_dimension
+        self._on_disk = bool(self.path) and settings.local_store_mmap
+
+        self._matrix = np.zeros((0, self.dimension), dtype=np.float32)
+        self._alive = np.zeros(0, dtype=bool)
+        self._count = 0
+        self._ids: List[Optional[str]] = []
+        self._metadata: List[Optional[Dict]] = []
+        self._rows: Dict[str, int] = {}
+        self._dirty = False
+        self._codes = make_quantized(settings.local_store_quantization, self.dimension)
+
+        self._ann: Optional[IVFIndex] = None
+        self._ann_build: Optional[asyncio.Task] = None
+        # Bumped when compaction renumbers rows, to discard stale builds
+        self._layout = 0
+        if settings.local_ann_enabled:
+            self._ann = IVFIndex(
+                nlist=settings.local_ann_nlist,
+                nprobe=settings.local_ann_nprobe
+            )
+
+        self._load()
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def _load(self):
+        """Load persisted vectors, memory-mapped if configured."""
+        if not self.path:
+            return
+
+        vectors_path = self.path / self.VECTORS_FILE
+        index_path = self.path / self.INDEX_FILE
+        if not vectors_path.exists() or not index_path.exists():
+            return
+
+        try:
+            mmap_mode = "r+" if self._on_disk else None
+            matrix = np.load(vectors_path, mmap_mode=mmap_mode)
+            index = json.loads(index_path.read_text(encoding='utf-8'))
+
+            if matrix.shape[1] != self.dimension:
+                logger.warning(
+                    f"Ignoring local vectors with dimension {matrix.shape[1]} "
+                    f"(expected {self.dimension})")
+                return
+
+            self._matrix = matrix
+            self._count = len(index["ids"])
+            self._ids = list(index["ids"])
+            self._metadata = list(index["metadata"])
+            # Rows past the last id are spare capacity of a memory-mapped file
+            self._rows = {
+                vector_id: row for row, vector_id in enumerate(self._ids)
+                if vector_id is not None
+            }
+            self._alive = np.zeros(len(matrix), dtype=bool)
+            self._alive[list(self._rows.values())] = True
+            codes_path = self.path / self.CODES_FILE
+            if self._codes is not None:
+                if not self._codes.load(codes_path, self._count):
+                    self._codes.encode_all(matrix, self._count)
+                self._codes.resize(len(matrix), self._count)
+            logger.info(f"Loaded {self._count} local vectors")
+
+        except Exception as e:
+            logger.error(f"Local store load error: {e}")
+            raise VectorDBError(f"Failed to load local vectors: {e}")
+
+    def _reserve(self, extra: int):
+        """Grow matrix capacity geometrically."""
+        needed = self._count + extra
+        if needed <= len(self._matrix):
+            return
+
+        capacity = max(needed, 2 * len(self._matrix), 1024)
+        if self._on_disk:
+            matrix = self._rewrite_file(np.arange(self._count), capacity)
+        else:
+            matrix = np.zeros((capacity, self.dimension), dtype=np.float32)
+            matrix[:self._count] = self._matrix[:self._count]
+        alive = np.zeros(capacity, dtype=bool)
+        alive[:self._count] = self._alive[:self._count]
+        self._matrix = matrix
+        self._alive = alive
+        if self._codes is not None:
+            self._codes.resize(capacity, self._count)
+
+    def _rewrite_file(self, rows: np.ndarray, capacity: int) -> np.ndarray:
+        """Copy rows into a new vectors file of capacity rows and map it."""
+        self.path.mkdir(parents=True, exist_ok=True)
+        vectors_path = self.path / self.VECTORS_FILE
+        vectors_tmp = self.path / (self.VECTORS_FILE + ".tmp")
+
+        # Block copies keep the old and new maps out of the heap
+        matrix = np.lib.format.open_memmap(
+            vectors_tmp, mode="w+", dtype=np.float32, shape=(capacity, self.dimension))
+        for start in range(0, len(rows), self._COPY_BLOCK):
+            block = rows[start:start + self._COPY_BLOCK]
+            matrix[start:start + len(block)] = self._matrix[block]
+        matrix.flush()
+        del matrix
+
+        os.replace(vectors_tmp, vectors_path)
+        return np.load(vectors_path, mmap_mode="r+")
+
+    @staticmethod
+    def _normalize(vectors: np.ndarray) -> np.ndarray:
+        norms = np.linalg.norm(vectors, axis=-1, keepdims=True)
+        return vectors / np.maximum(norms, 1e-12)
+
+    async def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        metadata: Dict,
+        chunk_indices: Optional[List[int]] = None
+    ) -> List[str]:
+        """Upsert document chunks and return their vector ids."""
+        try:
+            embeddings = await self._embed(chunks)
+            if chunk_indices is None:
+                chunk_indices = list(range(len(chunks)))
+
+            vectors = self._normalize(np.asarray(embeddings, dtype=np.float32))
+            self._reserve(len(chunks))
+
+            ids = []
+            new_rows = []
+            for idx, chunk, vector in zip(chunk_indices, chunks, vectors):
+                vector_id = f"{doc_id}_chunk_{idx}"
+                row = self._rows.get(vector_id)
+                if row is None:
+                    row = self._count
+                    self._count += 1
+                    self._ids.append(vector_id)
+                    self._metadata.append(None)
+                    self._rows[vector_id] = row
+                new_rows.append(row)
+
+                self._matrix[row] = vector
+                self._alive[row] = True
+                self._metadata[row] = {
+                    "document_id": doc_id,
+                    "content": chunk,
+                    "chunk_index": idx,
+                    **metadata
+                }
+                ids.append(vector_id)
+
+            new_rows = np.asarray(new_rows, dtype=np.int64)
+            if self._codes is not None:
+                self._codes.encode(new_rows, vectors)
+            if self._ann:
+                self._ann.add(self._matrix, new_rows)
+
+            self._dirty = True
+            logger.info(f"Upserted {len(ids)} vectors")
+            return ids
+
+        except Exception as e:
+            logger.error(f"Upsert error: {e}")
+            raise VectorDBError(f"Failed to upsert: {e}")
+
+    async def search_by_vector(
+        self,
+        embedding: np.ndarray,
+        top_k: int,
+        threshold: float
+    ) -> List[Dict]:
+        """Search vectors similar to an embedding."""
+        try:
+            query_vector = self._normalize(np.asarray(embedding, dtype=np.float32))
+
+            if self._count == 0:
+                return []
+
+            rows = self._candidate_rows(query_vector)
+            if rows is None and self._codes is not None:
+                rows = self._shortlist(query_vector, top_k)
+            if rows is None:
+                # Brute force over the contiguous matrix, no gather copy
+                rows = np.arange(self._count)
+                scores = np.asarray(self._matrix[:self._count] @ query_vector)
+                scores[~self._alive[:self._count]] = -np.inf
+            else:
+                scores = np.asarray(self._matrix[rows] @ query_vector)
+
+            k = min(top_k, len(rows))
+            if k == 0:
+                return []
+            top = np.argpartition(-scores, k - 1)[:k]
+            top = top[np.argsort(-scores[top])]
+
+            matches = []
+            for i in top:
+                score = float(scores[i])
+                if score < threshold:
+                    break
+                metadata = self._metadata[rows[i]]
+                matches.append({
+                    "id": self._ids[rows[i]],
+                    "score": score,
+                    "content": metadata.get("content", ""),
+                    "filename": metadata.get("filename", ""),
+                    "document_id": metadata.get("document_id", "")
+                })
+
+            logger.info(f"Found {len(matches)} matches")
+            return matches
+
+        except Exception as e:
+            logger.error(f"Search error: {e}")
+            raise VectorDBError(f"Search failed: {e}")
+
+    def _candidate_rows(self, query_vector: np.ndarray) -> Optional[np.ndarray]:
+        """IVF probe set for large stores, or None to scan every row."""
+        if not self._ann or len(self._rows) < settings.local_ann_min_vectors:
+            return None
+
+        # Rebuild once the store has grown well past what was clustered
+        if not self._ann.is_built or len(self._rows) > 2 * self._ann.size:
+            self._schedule_ann_build()
+        if not self._ann.is_built:
+            return None
+
+        rows = np.unique(self._ann.candidates(query_vector))
+        return rows[self._alive[rows]]
+
+    def _schedule_ann_build(self):
+        """Cluster in a worker thread; searches scan every row meanwhile."""
+        if self._ann_build is None or self._ann_build.done():
+            self._ann_build = asyncio.get_running_loop().create_task(self._build_ann())
+
+    async def _build_ann(self):
+        layout = self._layout
+        count = self._count
+        alive_rows = np.flatnonzero(self._alive[:count])
+        index = IVFIndex(nlist=self._ann.nlist, nprobe=self._ann.nprobe)
+
+        try:
+            await asyncio.to_thread(index.build, self._matrix, alive_rows)
+        except Exception as e:
+            logger.error(f"IVF build error: {e}")
+            return
+        if layout != self._layout or not self._ann:
+            return
+
+        # Rows appended while clustering join their nearest lists
+        index.add(self._matrix, np.flatnonzero(self._alive[count:self._count]) + count)
+        self._ann = index
+        logger.info(f"Built IVF index over {len(alive_rows)} vectors")
+
+    def _shortlist(self, query_vector: np.ndarray, top_k: int) -> np.ndarray:
+        """Best rows by quantized score, to be rescored in float32."""
+        scores = self._codes.scores(query_vector, self._count)
+        scores[~self._alive[:self._count]] = -np.inf
+
+        k = min(top_k * settings.local_rescore_factor, len(self._rows))
+        if k == 0:
+            return np.zeros(0, dtype=np.int64)
+        rows = np.argpartition(-scores, k - 1)[:k]
+        return np.sort(rows)
+
+    async def delete(self, doc_id: str):
+        """Delete document vectors."""
+        ids = [
+            vector_id for vector_id, row in self._rows.items()
+            if self._metadata[row].get("document_id") == doc_id
+        ]
+        await self.delete_ids(ids)
+
+    async def delete_ids(self, ids: List[str]):
+        """Delete vectors by id."""
+        deleted = 0
+        for vector_id in ids:
+            row = self._rows.pop(vector_id, None)
+            if row is None:
+                continue
+            self._alive[row] = False
+            self._ids[row] = None
+            self._metadata[row] = None
+            deleted += 1
+
+        if deleted:
+            self._dirty = True
+            # A mapped file is compacted in flush, next to its index
+            if self._needs_compaction() and not self._on_disk:
+                self._compact()
+        logger.info(f"Deleted {deleted} vectors")
+
+    def _needs_compaction(self) -> bool:
+        return self._count - len(self._rows) > self._count // 4
+
+    def _compact(self):
+        """Drop deleted rows so the matrix stays contiguous."""
+        rows = np.flatnonzero(self._alive[:self._count])
+        if self._on_disk:
+            self._matrix = self._rewrite_file(rows, max(len(rows), 1))
+        else:
+            self._matrix = np.ascontiguousarray(self._matrix[rows])
+        self._alive = np.ones(len(self._matrix), dtype=bool)
+        self._alive[len(rows):] = False
+        self._ids = [self._ids[row] for row in rows]
+        self._metadata = [self._metadata[row] for row in rows]
+        self._rows = {vector_id: row for row, vector_id in enumerate(self._ids)}
+        self._count = len(rows)
+        if self._codes is not None:
+            self._codes.take(rows)
+            self._codes.resize(len(self._matrix), self._count)
+
+        # Row numbers changed; cluster lists must be rebuilt
+        self._layout += 1
+        if self._ann:
+            self._ann = IVFIndex(nlist=self._ann.nlist, nprobe=self._ann.nprobe)
+
+    async def is_connected(self) -> bool:
+        """Check connection."""
+        return True
+
+    def flush(self):
+        """Write vectors and metadata to disk.
+
+        A memory-mapped matrix is synced in place; deleted rows stay in the
+        file as null ids until enough accumulate to compact.
+        """
+        if not self.path or not self._dirty:
+            return
+
+        try:
+            if self._on_disk:
+                if self._needs_compaction():
+                    self._compact()
+            elif self._count != len(self._rows):
+                self._compact()
+
+            self.path.mkdir(parents=True, exist_ok=True)
+            vectors_tmp = self.path / (self.VECTORS_FILE + ".tmp")
+            index_tmp = self.path / (self.INDEX_FILE + ".tmp")
+            codes_tmp = self.path / (self.CODES_FILE + ".tmp")
+
+            if self._on_disk:
+                self._matrix.flush()
+            else:
+                with open(vectors_tmp, 'wb') as f:
+                    np.save(f, np.asarray(self._matrix[:self._count]))
+            index_tmp.write_text(
+                json.dumps({"ids": self._ids, "metadata": self._metadata}),
+                encoding='utf-8'
+            )
+            if self._codes is not None:
+                self._codes.save(codes_tmp, self._count)
+            if not self._on_disk:
+                os.replace(vectors_tmp, self.path / self.VECTORS_FILE)
+            os.replace(index_tmp, self.path / self.INDEX_FILE)
+            if self._codes is not None:
+                os.replace(codes_tmp, self.path / self.CODES_FILE)
+
+            self._dirty = False
+            logger.debug(f"Saved {self._count} local vectors")
+
+        except Exception as e:
+            logger.error(f"Local store save error: {e}")
+            raise VectorDBError(f"Failed to save local vectors: {e}")
@@ -0,0 +1,195 @@
+"""Persistent index manifest."""
+
+import json
+import os
+from dataclasses import dataclass, field, asdict
+from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Set
+from loguru import logger
+
+
+@dataclass
+class ManifestEntry:
+    """Indexed file record."""
+    path: str
+    mtime: float
+    size: int
+    content_hash: str
+    file_hash: str
+    vector_ids: List[str] = field(default_factory=list)
+    chunk_count: int = 0
+    chunk_hashes: List[str] = field(default_factory=list)
+
+    def matches_stat(self, stat: os.stat_result) -> bool:
+        """Check if file metadata is unchanged since indexing."""
+        return self.mtime == stat.st_mtime and self.size == stat.st_size
+
+
+class IndexManifest:
+    """Track indexed files across restarts.
+
+    The header records which vector store the entries live in (``store``)
+    and how their vectors were produced (``pipeline``). A manifest written
+    for another store is ignored; one written by another pipeline is
+    ignored too, but its entries are kept in ``orphaned`` so their
+    vectors can be deleted from the shared store.
+
+    Changes can also be appended to a journal next to the manifest, which
+    is replayed on load and cleared by the next save.
+    """
+
+    VERSION = 1
+
+    def __init__(
+        self,
+        path: str,
+        store: Optional[Dict[str, Any]] = None,
+        pipeline: Optional[Dict[str, Any]] = None
+    ):
+        self.path = Path(path)
+        self.journal_path = self.path.with_suffix(self.path.suffix + ".journal")
+        self.store = store or {}
+        self.pipeline = pipeline or {}
+        self.entries: Dict[str, ManifestEntry] = {}
+        # Reverse index: content hash -> paths sharing that content
+        self.by_hash: Dict[str, Set[str]] = {}
+        self.orphaned: List[ManifestEntry] = []
+        self.dirty = False
+
+    def load(self):
+        """Load manifest from disk."""
+        if not self.path.exists():
+            return
+
+        try:
+            data = json.loads(self.path.read_text(encoding='utf-8'))
+            if data.get("version") != self.VERSION:
+                logger.warning(f"Ignoring manifest with unknown version: {self.path}")
+                return
+
+            entries = self._replay(ManifestEntry(**item) for item in data.get("files", []))
+            if data.get("store") != self.store:
+                logger.warning(
+                    f"Ignoring manifest for another vector store {data.get('store')}; "
+                    f"reindexing all files")
+                self.dirty = True
+                return
+            if data.get("pipeline") != self.pipeline:
+                logger.warning(
+                    f"Embedding or chunk settings changed since {self.path} was written; "
+                    f"reindexing all files")
+                self.orphaned = entries
+                self.dirty = True
+                return
+
+            self.entries = {}
+            self.by_hash = {}
+            for entry in entries:
+                self._add(entry)
+            logger.info(f"Loaded manifest with {len(self.entries)} files")
+
+        except Exception as e:
+            logger.error(f"Failed to load manifest {self.path}: {e}")
+            self.entries = {}
+            self.by_hash = {}
+
+    def save(self):
+        """Write manifest atomically."""
+        if not self.dirty:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {
+            "version": self.VERSION,
+            "store": self.store,
+            "pipeline": self.pipeline,
+            "files": [asdict(entry) for entry in self.entries.values()]
+        }
+
+        tmp_path = self.path.with_suffix(self.path.suffix + ".tmp")
+        tmp_path.write_text(json.dumps(data), encoding='utf-8')
+        os.replace(tmp_path, self.path)
+        self.journal_path.unlink(missing_ok=True)
+        self.dirty = False
+
+    def record(self, path: str):
+        """Append the current entry for path, or its removal, to the journal."""
+        if not self.path.exists():
+            # The journal is only read back together with a manifest header
+            self.dirty = True
+            self.save()
+            return
+
+        entry = self.entries.get(path)
+        line = {"path": path, "entry": asdict(entry) if entry else None}
+        with open(self.journal_path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(line) + "\n")
+
+    def _replay(self, entries: Iterable[ManifestEntry]) -> List[ManifestEntry]:
+        """Entries with journaled changes applied."""
+        by_path = {entry.path: entry for entry in entries}
+        if not self.journal_path.exists():
+            return list(by_path.values())
+
+        replayed = 0
+        with open(self.journal_path, encoding='utf-8') as f:
+            for line in f:
+                try:
+                    change = json.loads(line)
+                except ValueError:
+                    # Torn last line of an interrupted append
+                    continue
+                if change["entry"] is None:
+                    by_path.pop(change["path"], None)
+                else:
+                    by_path[change["path"]] = ManifestEntry(**change["entry"])
+                replayed += 1
+
+        if replayed:
+            logger.info(f"Replayed {replayed} journaled manifest changes")
+            self.dirty = True
+        return list(by_path.values())
+
+    def get(self, path: str) -> Optional[ManifestEntry]:
+        """Get entry for path."""
+        return self.entries.get(path)
+
+    def set(self, entry: ManifestEntry):
+        """Add or replace entry."""
+        self._discard(entry.path)
+        self._add(entry)
+        self.dirty = True
+
+    def remove(self, path: str) -> Optional[ManifestEntry]:
+        """Remove entry for path."""
+        entry = self._discard(path)
+        if entry:
+            self.dirty = True
+        return entry
+
+    def paths_for(self, content_hash: str) -> Set[str]:
+        """Get paths whose content has this hash."""
+        return self.by_hash.get(content_hash, set())
+
+    def _add(self, entry: ManifestEntry):
+        self.entries[entry.path] = entry
+        self.by_hash.setdefault(entry.content_hash, set()).add(entry.path)
+
+    def _discard(self, path: str) -> Optional[ManifestEntry]:
+        entry = self.entries.pop(path, None)
+        if entry:
+            paths = self.by_hash.get(entry.content_hash)
+            if paths is not None:
+                paths.discard(path)
+                if not paths:
+                    del self.by_hash[entry.content_hash]
+        return entry
+
+    def __contains__(self, path: str) -> bool:
+        return path in self.entries
+
+    def __iter__(self) -> Iterator[ManifestEntry]:
+        return iter(list(self.entries.values()))
+
+    def __len__(self) -> int:
+        return len(self.entries)
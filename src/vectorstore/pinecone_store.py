@@ -1,25 +1,46 @@
 """Pinecone vector store."""
 
+import asyncio
+import threading
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
-from typing import List, Dict
+from typing import Any, Callable, List, Dict, Optional
 from loguru import logger
 
 from src.core import settings
 from src.core.exceptions import VectorDBError
-from src.services.llm import OpenAIService
+from src.services.llm.base import BaseLLMService
+from src.vectorstore.base import BaseVectorStore
 
 
-class PineconeStore:
+class PineconeStore(BaseVectorStore):
     """Pinecone vector database."""
 
-    def __init__(self):
-        self.llm = OpenAIService()
-        self._init_pinecone()
+    durable = True
+
+    def __init__(self, llm: Optional[BaseLLMService] = None):
+        super().__init__(llm)
+        self.pc = None
+        self._index = None
+        self._init_lock = threading.Lock()
+        self._semaphore = asyncio.Semaphore(max(1, settings.pinecone_max_concurrency))
+
+    @property
+    def index(self):
+        """Pinecone index, connected on first use."""
+        if self._index is None:
+            with self._init_lock:
+                if self._index is None:
+                    self._init_pinecone()
+        return self._index
 
     def _init_pinecone(self):
         """Initialize Pinecone."""
         try:
-            self.pc = Pinecone(api_key=settings.pinecone_api_key)
+            self.pc = Pinecone(
+                api_key=settings.pinecone_api_key,
+                pool_threads=settings.pinecone_pool_threads
+            )
 
             # Check if index exists
             existing_indexes = [idx.name for idx in self.pc.list_indexes()]
@@ -37,55 +58,100 @@ class PineconeStore:
                 logger.info(
                     f"Created Pinecone index: {settings.pinecone_index_name}")
 
-            self.index = self.pc.Index(settings.pinecone_index_name)
+            self._index = self.pc.Index(settings.pinecone_index_name)
             logger.info("Pinecone initialized")
 
         except Exception as e:
             logger.error(f"Pinecone init error: {e}")
             raise VectorDBError(f"Failed to initialize Pinecone: {e}")
 
-    async def upsert(self, doc_id: str, chunks: List[str], metadata: Dict):
-        """Upsert document chunks."""
+    async def _call(self, fn: Callable[[], Any]) -> Any:
+        """Run a blocking Pinecone call in a worker thread, bounded by the concurrency cap."""
+        async with self._semaphore:
+            return await asyncio.to_thread(fn)
+
+    async def upsert(
+        self,
+        doc_id: str,
+        chunks: List[str],
+        metadata: Dict,
+        chunk_indices: Optional[List[int]] = None
+    ) -> List[str]:
+        """Upsert document chunks and return their vector ids.
+
+        Chunks are embedded group by group while earlier groups are being
+        sent, with at most ``pinecone_upsert_max_in_flight`` batches pending.
+        """
+        if chunk_indices is None:
+            chunk_indices = list(range(len(chunks)))
+
+        ids = [f"{doc_id}_chunk_{idx}" for idx in chunk_indices]
+        batch_size = max(1, settings.pinecone_upsert_batch_size)
+        max_in_flight = max(1, settings.pinecone_upsert_max_in_flight)
+        group_size = max(batch_size, settings.embedding_batch_size)
+        pending = set()
+
         try:
-            vectors = []
-
-            for idx, chunk in enumerate(chunks):
-                embedding = await self.llm.create_embedding(chunk)
-
-                vector = {
-                    "id": f"{doc_id}_chunk_{idx}",
-                    "values": embedding,
-                    "metadata": {
-                        "document_id": doc_id,
-                        "content": chunk,
-                        "chunk_index": idx,
-                        **metadata
+            for start in range(0, len(chunks), group_size):
+                group = chunks[start:start + group_size]
+                embeddings = await self._embed(group)
+
+                vectors = [
+                    {
+                        "id": ids[start + i],
+                        "values": embedding.tolist(),
+                        "metadata": {
+                            "document_id": doc_id,
+                            "content": chunk,
+                            "chunk_index": chunk_indices[start + i],
+                            **metadata
+                        }
                     }
-                }
-                vectors.append(vector)
+                    for i, (chunk, embedding) in enumerate(zip(group, embeddings))
+                ]
 
-            # Batch upsert
-            batch_size = 100
-            for i in range(0, len(vectors), batch_size):
-                batch = vectors[i:i + batch_size]
-                self.index.upsert(vectors=batch)
+                for i in range(0, len(vectors), batch_size):
+                    while len(pending) >= max_in_flight:
+                        pending = await self._wait_batches(pending, asyncio.FIRST_COMPLETED)
 
-            logger.info(f"Upserted {len(vectors)} vectors")
+                    batch = vectors[i:i + batch_size]
+                    pending.add(asyncio.create_task(
+                        self._call(lambda batch=batch: self.index.upsert(vectors=batch))))
+
+            while pending:
+                pending = await self._wait_batches(pending, asyncio.ALL_COMPLETED)
+
+            logger.info(f"Upserted {len(ids)} vectors")
+            return ids
 
         except Exception as e:
+            for task in pending:
+                task.cancel()
             logger.error(f"Upsert error: {e}")
             raise VectorDBError(f"Failed to upsert: {e}")
 
-    async def search(self, query: str, top_k: int, threshold: float) -> List[Dict]:
-        """Search similar vectors."""
+    @staticmethod
+    async def _wait_batches(pending: set, return_when: str) -> set:
+        """Wait for upsert batches, re-raising the first failure."""
+        done, pending = await asyncio.wait(pending, return_when=return_when)
+        for task in done:
+            task.result()
+        return pending
+
+    async def search_by_vector(
+        self,
+        embedding: List[float],
+        top_k: int,
+        threshold: float
+    ) -> List[Dict]:
+        """Search vectors similar to an embedding."""
         try:
-            embedding = await self.llm.create_embedding(query)
-
-            results = self.index.query(
-                vector=embedding,
+            vector = np.asarray(embedding, dtype=np.float32).tolist()
+            results = await self._call(lambda: self.index.query(
+                vector=vector,
                 top_k=top_k,
                 include_metadata=True
-            )
+            ))
 
             matches = []
             for match in results.matches:
@@ -105,20 +171,33 @@ class PineconeStore:
             logger.error(f"Search error: {e}")
             raise VectorDBError(f"Search failed: {e}")
 
-    def delete(self, doc_id: str):
+    async def delete(self, doc_id: str):
         """Delete document vectors."""
         try:
             # Delete by metadata filter
-            self.index.delete(filter={"document_id": {"$eq": doc_id}})
+            await self._call(
+                lambda: self.index.delete(filter={"document_id": {"$eq": doc_id}}))
             logger.info(f"Deleted vectors for {doc_id}")
         except Exception as e:
             logger.error(f"Delete error: {e}")
             raise VectorDBError(f"Delete failed: {e}")
 
-    def is_connected(self) -> bool:
+    async def delete_ids(self, ids: List[str]):
+        """Delete vectors by id."""
+        try:
+            batch_size = 1000
+            for i in range(0, len(ids), batch_size):
+                batch = ids[i:i + batch_size]
+                await self._call(lambda: self.index.delete(ids=batch))
+            logger.info(f"Deleted {len(ids)} vectors")
+        except Exception as e:
+            logger.error(f"Delete error: {e}")
+            raise VectorDBError(f"Delete failed: {e}")
+
+    async def is_connected(self) -> bool:
         """Check connection."""
         try:
-            self.index.describe_index_stats()
+            await self._call(lambda: self.index.describe_index_stats())
             return True
         except:
             return False
@@ -0,0 +1,177 @@
+"""Compact vector codes for approximate scoring."""
+
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import Dict, Optional
+import numpy as np
+
+from src.core.exceptions import ConfigurationError
+
+
+# Set bits per byte value, for Hamming distance over packed codes
+_POPCOUNT = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+class QuantizedVectors(ABC):
+    """Row-aligned codes of an L2-normalized float32 matrix.
+
+    Codes give an approximate inner product with a query at a fraction of
+    the memory; callers rescore the best candidates against the full
+    vectors.
+    """
+
+    kind = ""
+
+    # Rows decoded per block when scoring, to bound temporary memory
+    _BLOCK = 4096
+
+    def __init__(self, dimension: int):
+        self.dimension = dimension
+        self.codes = np.zeros((0, self.code_width), dtype=self.code_dtype)
+
+    @property
+    @abstractmethod
+    def code_width(self) -> int:
+        """Code entries per vector."""
+        pass
+
+    @property
+    @abstractmethod
+    def code_dtype(self) -> np.dtype:
+        """Code entry type."""
+        pass
+
+    @abstractmethod
+    def _encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        """Row values for each of the arrays in _arrays()."""
+        pass
+
+    @abstractmethod
+    def _score(self, start: int, end: int, query) -> np.ndarray:
+        """Approximate similarity of rows start:end to a prepared query."""
+        pass
+
+    def resize(self, capacity: int, count: int):
+        """Grow to capacity rows, keeping the first count."""
+        for name, array in self._arrays().items():
+            grown = np.zeros((capacity,) + array.shape[1:], dtype=array.dtype)
+            grown[:count] = array[:count]
+            setattr(self, name, grown)
+
+    def take(self, rows: np.ndarray):
+        """Keep only the given rows, in order."""
+        for name, array in self._arrays().items():
+            setattr(self, name, np.ascontiguousarray(array[rows]))
+
+    def encode(self, rows: np.ndarray, vectors: np.ndarray):
+        """Store codes of vectors at rows."""
+        for name, values in self._encode(vectors).items():
+            getattr(self, name)[rows] = values
+
+    def encode_all(self, matrix: np.ndarray, count: int):
+        """Rebuild codes for the first count rows of matrix."""
+        self.resize(count, 0)
+        for start in range(0, count, self._BLOCK):
+            rows = np.arange(start, min(start + self._BLOCK, count))
+            self.encode(rows, np.asarray(matrix[start:start + len(rows)], dtype=np.float32))
+
+    def scores(self, query: np.ndarray, count: int) -> np.ndarray:
+        """Approximate similarity of the first count rows to query."""
+        scores = np.empty(count, dtype=np.float32)
+        prepared = self._prepare(query)
+        for start in range(0, count, self._BLOCK):
+            end = min(start + self._BLOCK, count)
+            scores[start:end] = self._score(start, end, prepared)
+        return scores
+
+    def save(self, path: Path, count: int):
+        with open(path, 'wb') as f:
+            arrays = {name: array[:count] for name, array in self._arrays().items()}
+            np.savez(f, kind=self.kind, **arrays)
+
+    def load(self, path: Path, count: int) -> bool:
+        """Load codes saved for count rows; False if missing or stale."""
+        if not path.exists():
+            return False
+        with np.load(path) as data:
+            if str(data.get("kind", "")) != self.kind:
+                return False
+            arrays = {name: data[name] for name in self._arrays() if name in data}
+        if len(arrays) != len(self._arrays()) or any(len(a) != count for a in arrays.values()):
+            return False
+        if arrays["codes"].shape[1:] != (self.code_width,):
+            return False
+        for name, array in arrays.items():
+            setattr(self, name, array)
+        return True
+
+    def _arrays(self):
+        """Row-aligned arrays that make up the codes."""
+        return {"codes": self.codes}
+
+    def _prepare(self, query: np.ndarray):
+        return query
+
+
+class Int8Vectors(QuantizedVectors):
+    """Symmetric int8 codes with one scale per vector (4x smaller)."""
+
+    kind = "int8"
+
+    def __init__(self, dimension: int):
+        super().__init__(dimension)
+        self.scales = np.zeros(0, dtype=np.float32)
+
+    @property
+    def code_width(self) -> int:
+        return self.dimension
+
+    @property
+    def code_dtype(self) -> np.dtype:
+        return np.dtype(np.int8)
+
+    def _arrays(self):
+        return {"codes": self.codes, "scales": self.scales}
+
+    def _encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        scales = np.maximum(np.abs(vectors).max(axis=1), 1e-12) / 127.0
+        codes = np.rint(vectors / scales[:, None]).astype(np.int8)
+        return {"codes": codes, "scales": scales}
+
+    def _score(self, start: int, end: int, query: np.ndarray) -> np.ndarray:
+        return (self.codes[start:end].astype(np.float32) @ query) * self.scales[start:end]
+
+
+class BinaryVectors(QuantizedVectors):
+    """Sign bits packed eight per byte (32x smaller), scored by Hamming distance."""
+
+    kind = "binary"
+
+    @property
+    def code_width(self) -> int:
+        return (self.dimension + 7) // 8
+
+    @property
+    def code_dtype(self) -> np.dtype:
+        return np.dtype(np.uint8)
+
+    def _encode(self, vectors: np.ndarray) -> Dict[str, np.ndarray]:
+        return {"codes": np.packbits(vectors > 0, axis=1)}
+
+    def _prepare(self, query: np.ndarray) -> np.ndarray:
+        return np.packbits(query > 0)
+
+    def _score(self, start: int, end: int, query: np.ndarray) -> np.ndarray:
+        distance = _POPCOUNT[self.codes[start:end] ^ query].sum(axis=1, dtype=np.int32)
+        # Matching bits minus differing bits, scaled to [-1, 1]
+        return 1.0 - 2.0 * distance / self.dimension
+
+
+def make_quantized(kind: str, dimension: int) -> Optional[QuantizedVectors]:
+    """Codes for a quantization setting, or None for full precision."""
+    if kind == "none":
+        return None
+    for cls in (Int8Vectors, BinaryVectors):
+        if cls.kind == kind:
+            return cls(dimension)
+    raise ConfigurationError(f"Unknown local store quantization: {kind}")
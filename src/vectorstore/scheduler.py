@@ -0,0 +1,83 @@
+"""Debounced index job scheduling."""
+
+import asyncio
+from pathlib import Path
+from typing import Dict, TYPE_CHECKING
+from loguru import logger
+
+if TYPE_CHECKING:
+    from src.vectorstore.indexer import DocumentIndexer
+
+
+class IndexScheduler:
+    """Coalesce file events per path into one index job."""
+
+    INDEX = "index"
+    REMOVE = "remove"
+
+    def __init__(
+        self,
+        indexer: 'DocumentIndexer',
+        loop: asyncio.AbstractEventLoop,
+        debounce: float,
+        max_jobs: int
+    ):
+        self.indexer = indexer
+        self.loop = loop
+        self.debounce = debounce
+        self._semaphore = asyncio.Semaphore(max(1, max_jobs))
+        self._pending: Dict[str, str] = {}
+        self._timers: Dict[str, asyncio.TimerHandle] = {}
+        self._running: Dict[str, asyncio.Task] = {}
+
+    def submit(self, path: str, action: str):
+        """Record an event from any thread; the last event per path wins."""
+        self.loop.call_soon_threadsafe(self._record, path, action)
+
+    def _record(self, path: str, action: str):
+        self._pending[path] = action
+
+        timer = self._timers.pop(path, None)
+        if timer:
+            timer.cancel()
+        self._timers[path] = self.loop.call_later(self.debounce, self._fire, path)
+
+    def _fire(self, path: str):
+        self._timers.pop(path, None)
+
+        # One job per path at a time; _finish picks up events that arrived meanwhile
+        if path in self._running:
+            return
+
+        action = self._pending.pop(path, None)
+        if action is None:
+            return
+
+        task = self.loop.create_task(self._run(path, action))
+        self._running[path] = task
+        task.add_done_callback(lambda _: self._finish(path))
+
+    def _finish(self, path: str):
+        self._running.pop(path, None)
+        if path in self._pending and path not in self._timers:
+            self._fire(path)
+
+    async def _run(self, path: str, action: str):
+        async with self._semaphore:
+            try:
+                if action == self.REMOVE:
+                    await self.indexer.remove_file(Path(path))
+                else:
+                    await self.indexer.reindex_file(Path(path))
+            except Exception as e:
+                logger.error(f"Index job failed for {path}: {e}")
+
+    def cancel(self):
+        """Drop pending events and cancel running jobs."""
+        for timer in self._timers.values():
+            timer.cancel()
+        for task in self._running.values():
+            task.cancel()
+        self._timers.clear()
+        self._pending.clear()
+        self._running.clear()
@@ -0,0 +1,61 @@
+"""Bulk indexing progress."""
+
+import time
+from typing import Dict, Optional
+
+
+class IndexingStatus:
+    """Progress of the current or last bulk indexing run."""
+
+    IDLE = "idle"
+    RUNNING = "running"
+    DONE = "done"
+    FAILED = "failed"
+
+    def __init__(self):
+        self.state = self.IDLE
+        self.total = 0
+        self.done = 0
+        self.failed = 0
+        self.started_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.error: Optional[str] = None
+        # A run has completed since startup, so every file was indexed once
+        self.initial_complete = False
+
+    def start(self, total: int):
+        """Begin a run over total files."""
+        self.state = self.RUNNING
+        self.total = total
+        self.done = 0
+        self.failed = 0
+        self.started_at = time.time()
+        self.finished_at = None
+        self.error = None
+
+    def advance(self, success: bool):
+        """Record one finished file."""
+        self.done += 1
+        if not success:
+            self.failed += 1
+
+    def finish(self, error: Optional[str] = None):
+        """End the run, failed if error is given."""
+        self.state = self.FAILED if error else self.DONE
+        self.error = error
+        self.initial_complete = self.initial_complete or not error
+        self.finished_at = time.time()
+
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "total": self.total,
+            "done": self.done,
+            "failed": self.failed,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+
+indexing_status = IndexingStatus()
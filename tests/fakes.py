@@ -0,0 +1,69 @@
+"""Offline stand-ins shared by the tests and the benchmarks."""
+
+import asyncio
+import hashlib
+from typing import AsyncIterator, List
+import numpy as np
+
+from src.core import settings
+from src.services.llm.base import BaseLLMService
+
+
+class FakeLLM(BaseLLMService):
+    """Deterministic bag-of-words embeddings and canned answers.
+
+    Each word is hashed into one dimension, so texts sharing words are
+    similar. ``latency`` adds a simulated network round trip to every call.
+    """
+
+    def __init__(self, latency: float = 0.0, tokens: int = 20):
+        self.latency = latency
+        self.tokens = tokens
+        self.embedding_calls = 0
+
+    async def generate_answer(self, context: str, question: str) -> str:
+        await asyncio.sleep(self.latency)
+        return " ".join(["answer"] * self.tokens)
+
+    async def stream_answer(self, context: str, question: str) -> AsyncIterator[str]:
+        await asyncio.sleep(self.latency)
+        for _ in range(self.tokens):
+            yield "answer "
+
+    async def create_embedding(self, text: str) -> np.ndarray:
+        return (await self.create_embeddings([text]))[0]
+
+    async def create_embeddings(self, texts: List[str]) -> np.ndarray:
+        self.embedding_calls += 1
+        await asyncio.sleep(self.latency)
+        vectors = np.zeros((len(texts), settings.vector_dimension), dtype=np.float32)
+        for row, text in enumerate(texts):
+            for word in text.lower().split():
+                digest = hashlib.md5(word.encode()).digest()
+                vectors[row, int.from_bytes(digest[:4], "little") % settings.vector_dimension] += 1.0
+        return vectors
+
+
+class FakeVectorStore:
+    """In-memory stand-in that records upserts and deletes."""
+
+    durable = False
+
+    def __init__(self):
+        self.upserts = []
+        self.deleted = []
+
+    async def upsert(self, doc_id, chunks, metadata, chunk_indices=None):
+        self.upserts.append((doc_id, list(chunks)))
+        if chunk_indices is None:
+            chunk_indices = range(len(chunks))
+        return [f"{doc_id}_chunk_{i}" for i in chunk_indices]
+
+    async def delete(self, doc_id):
+        self.deleted.append(doc_id)
+
+    async def delete_ids(self, ids):
+        self.deleted.extend(ids)
+
+    def flush(self):
+        pass
@@ -0,0 +1,71 @@
+"""Unit tests for answer cache."""
+
+import pytest
+from src.services.cache import AnswerCache, SemanticCache
+
+
+class TestAnswerCache:
+    """Test TTL + LRU answer cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create cache instance."""
+        return AnswerCache(max_entries=2, ttl_seconds=60)
+
+    def test_normalized_questions_share_key(self, cache):
+        """Test case, spacing and trailing punctuation are ignored."""
+        key = cache.make_key("What are healthy eating tips?", 5, 0.7, 1)
+        assert key == cache.make_key("  what are  healthy eating tips ", 5, 0.7, 1)
+        assert key != cache.make_key("What are healthy eating tips?", 5, 0.7, 2)
+
+    def test_hit_and_miss_counters(self, cache):
+        """Test stats track hits and misses."""
+        cache.put("a", 1)
+        assert cache.get("a") == 1
+        assert cache.get("b") is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_lru_eviction(self, cache):
+        """Test least recently used entry is evicted."""
+        cache.put("a", 1)
+        cache.put("b", 2)
+        cache.get("a")
+        cache.put("c", 3)
+        assert cache.get("b") is None
+        assert cache.get("a") == 1
+
+    def test_expired_entries_miss(self):
+        """Test entries past their TTL are not served."""
+        cache = AnswerCache(max_entries=2, ttl_seconds=-1)
+        cache.put("a", 1)
+        assert cache.get("a") is None
+
+
+class TestSemanticCache:
+    """Test embedding-similarity answer cache."""
+
+    @pytest.fixture
+    def cache(self):
+        """Create cache instance."""
+        return SemanticCache(max_entries=2, similarity=0.9, ttl_seconds=60)
+
+    def test_similar_question_hits(self, cache):
+        """Test a near-identical embedding returns the cached answer."""
+        cache.put([1.0, 0.0, 0.1], 5, 0.7, 1, "answer")
+        assert cache.get([1.0, 0.05, 0.1], 5, 0.7, 1) == "answer"
+        assert cache.get([0.0, 1.0, 0.0], 5, 0.7, 1) is None
+        assert cache.stats() == {"hits": 1, "misses": 1, "size": 1}
+
+    def test_corpus_version_and_params_must_match(self, cache):
+        """Test entries from another corpus version or top_k are ignored."""
+        cache.put([1.0, 0.0], 5, 0.7, 1, "answer")
+        assert cache.get([1.0, 0.0], 5, 0.7, 2) is None
+        assert cache.get([1.0, 0.0], 3, 0.7, 1) is None
+
+    def test_oldest_entry_overwritten(self, cache):
+        """Test ring buffer replaces the oldest entry when full."""
+        cache.put([1.0, 0.0, 0.0], 5, 0.7, 1, "a")
+        cache.put([0.0, 1.0, 0.0], 5, 0.7, 1, "b")
+        cache.put([0.0, 0.0, 1.0], 5, 0.7, 1, "c")
+        assert cache.get([1.0, 0.0, 0.0], 5, 0.7, 1) is None
+        assert cache.get([0.0, 0.0, 1.0], 5, 0.7, 1) == "c"
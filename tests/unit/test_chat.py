@@ -0,0 +1,70 @@
+"""Unit tests for chat routes."""
+
+import json
+import httpx
+import pytest
+
+from src.core import settings
+from src.api import app
+from src.api.dependencies import get_retriever
+from src.services.knowledge import Retriever
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM
+
+
+def parse_events(body: str):
+    """(event, data) pairs of a server-sent event stream."""
+    events = []
+    for block in body.strip().split("\n\n"):
+        lines = dict(line.split(": ", 1) for line in block.splitlines())
+        events.append((lines["event"], json.loads(lines["data"])))
+    return events
+
+
+class FailingLLM(FakeLLM):
+    """Fails after the first streamed token."""
+
+    async def stream_answer(self, context, question):
+        yield "answer "
+        raise RuntimeError("model went away")
+
+
+class TestQueryStream:
+    """Test the server-sent events query route."""
+
+    @pytest.fixture
+    def store(self, monkeypatch):
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "retrieval_mode", "vector")
+        yield LocalVectorStore(FakeLLM(), path="")
+        app.dependency_overrides.pop(get_retriever, None)
+
+    async def post(self, store, llm):
+        await store.upsert("doc", ["vacation policy days off"], {"filename": "policy.txt"})
+        retriever = Retriever(llm=llm, vectorstore=store)
+        app.dependency_overrides[get_retriever] = lambda: retriever
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            return await client.post(
+                "/api/v1/query/stream", json={"query": "vacation days", "threshold": 0.1})
+
+    @pytest.mark.asyncio
+    async def test_streams_sources_tokens_done(self, store):
+        """Test the stream carries sources first, each token, then done."""
+        response = await self.post(store, FakeLLM(tokens=3))
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/event-stream")
+        events = parse_events(response.text)
+        assert events[0][0] == "sources"
+        assert events[0][1]["sources"] == ["policy.txt"]
+        assert events[1:] == [("token", {"text": "answer "})] * 3 + [("done", {})]
+
+    @pytest.mark.asyncio
+    async def test_midstream_failure_sends_error_event(self, store):
+        """Test a generation failure after headers ends with an error event."""
+        response = await self.post(store, FailingLLM())
+
+        events = parse_events(response.text)
+        assert [event for event, _ in events] == ["sources", "token", "error"]
+        assert events[-1][1]["detail"] == "model went away"
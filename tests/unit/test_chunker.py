@@ -1,7 +1,8 @@
 """Unit tests for chunker."""
 
 import pytest
-from src.services.knowledge import Chunker
+from src.core import settings
+from src.services.knowledge import Chunker, TokenCounter
 
 
 class TestChunker:
@@ -23,3 +24,63 @@ class TestChunker:
         chunks = chunker.create_chunks(sample_text)
         assert len(chunks) > 0
         assert all(isinstance(c, str) for c in chunks)
+    
+    def test_streamed_chunks_match(self, chunker, sample_text):
+        """Test chunking text in pieces matches chunking it whole."""
+        pieces = [sample_text[i:i + 5] for i in range(0, len(sample_text), 5)]
+        assert list(chunker.iter_chunks(pieces)) == chunker.create_chunks(sample_text)
+    
+    def test_text_without_sentence_ends_is_cut(self, chunker, monkeypatch):
+        """Test a run with no delimiters is cut at chunk size, streamed or whole."""
+        monkeypatch.setattr(chunker, "max_sentence_chars", 50)
+        text = "  " + " ".join(f"w{i}" for i in range(400)) + "   . Then a sentence. " + "x" * 120
+        stream = chunker.stream()
+        streamed = []
+        for i in range(0, len(text), 7):
+            streamed.extend(stream.feed(text[i:i + 7]))
+            assert len(stream._buffer) <= 50 + 7
+        streamed.extend(stream.close())
+
+        assert streamed == chunker.create_chunks(text)
+        assert all(len(p) <= 50 for p in chunker.cut(text))
+        assert "".join(streamed).replace(" ", "").count("w399") == 1
+    
+    def test_overlap_repeats_tail_sentences(self, chunker, monkeypatch):
+        """Test overlap carries whole tail sentences within the budget."""
+        monkeypatch.setattr(chunker, "max_size", 14)
+        monkeypatch.setattr(chunker, "overlap", 7)
+        chunks = chunker.create_chunks("One aaa. Two bbb. Three ccc. Four ddd.")
+        assert chunks == ["One aaa Two bbb", "Two bbb Three ccc", "Four ddd."]
+
+
+class TestTokenChunker:
+    """Test token-sized chunking."""
+    
+    @pytest.fixture
+    def chunker(self, monkeypatch):
+        """Token chunker using the estimating counter."""
+        monkeypatch.setattr(settings, "chunk_unit", "tokens")
+        monkeypatch.setattr(settings, "max_chunk_tokens", 10)
+        monkeypatch.setattr(settings, "chunk_overlap_tokens", 4)
+        monkeypatch.setattr(settings, "chunk_tokenizer_encoding", "")
+        return Chunker()
+    
+    def test_chunks_fit_token_budget(self, chunker):
+        """Test every chunk stays within max tokens."""
+        text = " ".join(f"Sentence {i} is short." for i in range(30))
+        chunks = chunker.create_chunks(text)
+        assert len(chunks) > 1
+        assert all(chunker.measure(c) <= 10 + 2 for c in chunks)
+    
+    def test_long_sentence_is_split(self, chunker):
+        """Test a sentence longer than a chunk is split, not emitted whole."""
+        chunks = chunker.create_chunks("word " * 100 + ". Short one.")
+        assert all(len(c) < 100 for c in chunks)
+        assert "".join(chunks).count("word") >= 100
+    
+    def test_estimated_split_fits(self):
+        """Test the fallback counter splits into fitting pieces."""
+        counter = TokenCounter(None)
+        pieces = counter.split("x" * 1000, 25)
+        assert "".join(pieces) == "x" * 1000
+        assert all(counter.count(p) <= 25 for p in pieces)
@@ -0,0 +1,55 @@
+"""Unit tests for context builder."""
+
+import pytest
+
+from src.services.knowledge import ContextBuilder, TokenCounter
+
+
+def result(id, content, filename="a.txt", document_id="doc"):
+    return {"id": id, "content": content, "filename": filename, "document_id": document_id, "score": 0.9}
+
+
+class TestContextBuilder:
+    """Test deduplication and token budgeting."""
+
+    @pytest.fixture
+    def builder(self):
+        """Builder with estimated token counts."""
+        return ContextBuilder(max_tokens=1000, tokenizer=TokenCounter(None))
+
+    def test_overlap_with_neighbour_is_removed(self, builder):
+        """Test text repeated from an adjacent chunk appears once."""
+        shared = "The office opens at nine every weekday."
+        context, included = builder.build([
+            result("doc_chunk_0", f"Badges are issued on day one. {shared}"),
+            result("doc_chunk_1", f"{shared} Parking is free for staff."),
+        ])
+        assert context.count(shared) == 1
+        assert "Parking is free for staff." in context
+        assert len(included) == 2
+
+    def test_other_documents_are_not_trimmed(self, builder):
+        """Test identical text from another document is kept."""
+        shared = "The office opens at nine every weekday."
+        context, _ = builder.build([
+            result("a_chunk_0", shared),
+            result("b_chunk_0", shared, filename="b.txt", document_id="other"),
+        ])
+        assert context.count(shared) == 2
+
+    def test_budget_skips_results_that_do_not_fit(self):
+        """Test packing stops at the token budget but keeps smaller later results."""
+        builder = ContextBuilder(max_tokens=40, tokenizer=TokenCounter(None))
+        context, included = builder.build([
+            result("a", "x" * 80, document_id="1"),
+            result("b", "y" * 400, document_id="2"),
+            result("c", "z" * 40, document_id="3"),
+        ])
+        assert [r["id"] for r in included] == ["a", "c"]
+        assert TokenCounter(None).count(context) <= 40
+
+    def test_oversized_best_match_is_truncated(self):
+        """Test a single result larger than the budget is cut, not dropped."""
+        builder = ContextBuilder(max_tokens=20, tokenizer=TokenCounter(None))
+        context, included = builder.build([result("a", "w" * 1000)])
+        assert included and TokenCounter(None).count(context) <= 20
@@ -0,0 +1,82 @@
+"""Unit tests for document loader."""
+
+import multiprocessing
+import threading
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+import pytest
+
+from benchmarks.corpus import make_text, write_docx, write_pdf
+from src.core import settings
+from src.services.knowledge import Chunker, DocumentLoader
+from src.services.knowledge import document_loader
+
+
+class TestDocumentLoader:
+    """Test parsing off the event loop."""
+
+    @pytest.fixture
+    def docx_path(self, tmp_path):
+        path = tmp_path / "doc.docx"
+        write_docx(path, make_text(600, seed=1))
+        return path
+
+    @pytest.mark.asyncio
+    async def test_parsing_runs_in_executor(self, docx_path, monkeypatch):
+        """Test DOCX parsing happens on an executor thread, not the loop thread."""
+        parsed_on = []
+        original = DocumentLoader.load_docx
+
+        def load_docx(self, filepath):
+            parsed_on.append(threading.get_ident())
+            return original(self, filepath)
+
+        monkeypatch.setattr(DocumentLoader, "load_docx", load_docx)
+        loader = DocumentLoader()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            content = await loader.load_document_async(docx_path, executor)
+
+        assert parsed_on and parsed_on[0] != threading.get_ident()
+        assert content == original(loader, docx_path)
+
+    @pytest.mark.asyncio
+    async def test_process_pool_gives_identical_chunks(self, docx_path, tmp_path):
+        """Test worker-process parsing yields the same chunks as inline parsing."""
+        pdf_path = tmp_path / "doc.pdf"
+        write_pdf(pdf_path, make_text(900, seed=2), page_words=100)
+        loader = DocumentLoader()
+        chunker = Chunker()
+
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as executor:
+            for path in (docx_path, pdf_path):
+                inline = chunker.create_chunks(loader.load_document(path))
+                offloaded = await loader.load_document_async(path, executor)
+                streamed = "".join([p async for p in loader.iter_document_async(path, executor)])
+
+                assert chunker.create_chunks(offloaded) == inline
+                assert chunker.create_chunks(streamed) == inline
+
+    @pytest.mark.asyncio
+    async def test_pdf_page_ranges_share_one_reader(self, tmp_path, monkeypatch):
+        """Test page-range extraction opens the PDF once and releases it at the end."""
+        import PyPDF2
+
+        path = tmp_path / "doc.pdf"
+        write_pdf(path, make_text(1000, seed=3), page_words=100)
+        opened = []
+        original = PyPDF2.PdfReader
+
+        def reader(stream):
+            opened.append(stream)
+            return original(stream)
+
+        monkeypatch.setattr(PyPDF2, "PdfReader", reader)
+        monkeypatch.setattr(settings, "pdf_page_batch_size", 3)
+        loader = DocumentLoader()
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            streamed = "".join([p async for p in loader.iter_document_async(path, executor)])
+
+        assert len(opened) == 1
+        assert opened[0].closed
+        assert document_loader._pdf_readers == {}
+        assert streamed == loader.load_pdf(path)
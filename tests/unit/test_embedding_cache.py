@@ -0,0 +1,60 @@
+"""Unit tests for embedding cache."""
+
+import pytest
+from src.services.cache import EmbeddingCache
+
+
+class TestEmbeddingCache:
+    """Test persistent embedding cache."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create cache instance."""
+        cache = EmbeddingCache(
+            path=str(tmp_path / "embeddings.sqlite3"),
+            model="test-model",
+            dimension=2,
+            max_entries=3
+        )
+        yield cache
+        cache.close()
+
+    def test_roundtrip(self, cache):
+        """Test stored embeddings are returned in order."""
+        cache.put_many(["a", "b"], [[1.0, 2.0], [3.0, 4.0]])
+        b, missing, a = cache.get_many(["b", "missing", "a"])
+        assert b.tolist() == [3.0, 4.0]
+        assert missing is None
+        assert a.tolist() == [1.0, 2.0]
+        assert cache.hits == 2
+        assert cache.misses == 1
+
+    def test_keyed_by_model(self, cache, tmp_path):
+        """Test entries from another model are not served."""
+        cache.put_many(["a"], [[1.0, 2.0]])
+        other = EmbeddingCache(str(tmp_path / "embeddings.sqlite3"), "other-model", 2, 3)
+        assert other.get_many(["a"]) == [None]
+        other.close()
+
+    def test_evicts_least_recently_used(self, cache):
+        """Test cache stays within max_entries."""
+        cache.put_many(["a", "b", "c"], [[0.0, 0.0]] * 3)
+        cache.get_many(["a"])
+        cache.put_many(["d"], [[0.0, 0.0]])
+        assert len(cache) == 3
+        assert cache.get_many(["a"])[0] is not None
+
+    def test_recency_survives_reopen(self, tmp_path):
+        """Test batched last_used updates are written on close and counted on open."""
+        path = str(tmp_path / "recency.sqlite3")
+        first = EmbeddingCache(path, "test-model", 2, 3)
+        for text in ("a", "b", "c"):
+            first.put_many([text], [[0.0, 0.0]])
+        first.get_many(["a"])
+        first.close()
+
+        reopened = EmbeddingCache(path, "test-model", 2, 3)
+        reopened.put_many(["d"], [[0.0, 0.0]])
+        assert len(reopened) == 3
+        assert reopened.get_many(["a", "b"])[1] is None
+        reopened.close()
@@ -0,0 +1,64 @@
+"""Unit tests for health route."""
+
+import httpx
+import pytest
+
+from src.api import app
+from src.api.dependencies import get_indexing_status, get_vectorstore
+from src.vectorstore import IndexingStatus
+
+
+class ConnectedStore:
+    """Vector store stand-in that is always reachable."""
+
+    async def is_connected(self):
+        return True
+
+
+class TestHealth:
+    """Test readiness reporting."""
+
+    @pytest.fixture
+    def status(self):
+        """Override dependencies for the duration of a test."""
+        status = IndexingStatus()
+        app.dependency_overrides[get_vectorstore] = ConnectedStore
+        app.dependency_overrides[get_indexing_status] = lambda: status
+        yield status
+        app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_ready_while_indexing(self, status):
+        """Test the service reports ready with indexing progress mid-run."""
+        status.start(total=10)
+        status.advance(True)
+        status.advance(False)
+
+        async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+            response = await client.get("/health")
+
+        body = response.json()
+        assert response.status_code == 200
+        assert body["ready"] is True
+        assert body["initial_indexing_complete"] is False
+        assert body["indexing"]["state"] == "running"
+        assert (body["indexing"]["done"], body["indexing"]["failed"]) == (2, 1)
+
+    @pytest.mark.asyncio
+    async def test_initial_indexing_complete_after_first_successful_run(self, status):
+        """Test a failed first run is not complete, and a later failure does not undo it."""
+        async def complete():
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                return (await client.get("/health")).json()["initial_indexing_complete"]
+
+        status.start(total=1)
+        status.finish(error="store down")
+        assert await complete() is False
+
+        status.start(total=1)
+        status.finish()
+        assert await complete() is True
+
+        status.start(total=1)
+        status.finish(error="store down")
+        assert await complete() is True
@@ -0,0 +1,41 @@
+"""Unit tests for package import cost."""
+
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[2]
+
+# Generous budget: cold imports only, no clients or connections
+IMPORT_BUDGET_SECONDS = 5.0
+
+PROBE = """
+import time
+start = time.perf_counter()
+import src.api
+import src.bot
+elapsed = time.perf_counter() - start
+from src.core import container
+built = [name for name in ('_llm', '_vectorstore', '_retriever', '_indexer')
+         if getattr(container, name) is not None]
+print(elapsed, ','.join(built) or '-')
+"""
+
+
+class TestImports:
+    """Test importing the entry points stays lazy."""
+
+    def test_api_import_builds_no_services(self):
+        """Test importing the API and bot builds no services and stays fast."""
+        # A fresh interpreter, so modules cached by other tests don't hide the cost
+        result = subprocess.run(
+            [sys.executable, "-c", PROBE],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True
+        )
+        elapsed, built = result.stdout.split()[-2:]
+
+        assert built == "-"
+        assert float(elapsed) < IMPORT_BUDGET_SECONDS
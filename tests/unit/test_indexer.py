@@ -0,0 +1,338 @@
+"""Unit tests for document indexer."""
+
+import asyncio
+import json
+import pytest
+from pathlib import Path
+
+from src.core import settings
+from src.core.exceptions import VectorDBError
+from src.vectorstore.indexer import DocumentIndexer
+from src.vectorstore.keyword_index import KeywordIndex
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM, FakeVectorStore
+
+
+class SlowStore(FakeVectorStore):
+    """Records the most upserts pending at once."""
+
+    def __init__(self):
+        super().__init__()
+        self.active = 0
+        self.peak = 0
+
+    async def upsert(self, doc_id, chunks, metadata, chunk_indices=None):
+        self.active += 1
+        self.peak = max(self.peak, self.active)
+        await asyncio.sleep(0.02)
+        self.active -= 1
+        return await super().upsert(doc_id, chunks, metadata, chunk_indices)
+
+
+class TestDocumentIndexer:
+    """Test manifest-backed indexing."""
+
+    @pytest.fixture
+    def docs(self, tmp_path, monkeypatch):
+        """Point settings at a temporary corpus."""
+        folder = tmp_path / "documents"
+        folder.mkdir()
+        monkeypatch.setattr(settings, "documents_folder", str(folder))
+        monkeypatch.setattr(settings, "index_manifest_path", str(tmp_path / "manifest.json"))
+        monkeypatch.setattr(settings, "parser_workers", 0)
+        return folder
+
+    @pytest.mark.asyncio
+    async def test_restart_skips_unchanged_files(self, docs):
+        """Test a new indexer reuses the persisted manifest."""
+        (docs / "a.txt").write_text("First document. It has sentences.")
+        (docs / "b.txt").write_text("Second document. Also sentences.")
+
+        first = DocumentIndexer(FakeVectorStore())
+        assert await first.index_all() == {"total": 2, "success": 2, "failed": 0}
+        assert len(first.vectorstore.upserts) == 2
+
+        second = DocumentIndexer(FakeVectorStore())
+        assert await second.index_all() == {"total": 2, "success": 2, "failed": 0}
+        assert second.vectorstore.upserts == []
+        assert second.indexed_files == first.indexed_files
+
+    @pytest.mark.asyncio
+    async def test_modified_file_updates_only_changed_chunks(self, docs, monkeypatch):
+        """Test an edit re-embeds new chunks and deletes vanished ones only."""
+        monkeypatch.setattr(settings, "max_chunk_size", 25)
+        monkeypatch.setattr(settings, "chunk_overlap", 0)
+        path = docs / "a.txt"
+        path.write_text("Alpha sentence one. Beta sentence two. Gamma sentence three.")
+        indexer = DocumentIndexer(FakeVectorStore())
+        await indexer.index_file(path)
+        old_ids = indexer.manifest.get(str(path)).vector_ids
+
+        path.write_text("Alpha sentence one. Delta sentence new. Gamma sentence three.")
+        assert await indexer.reindex_file(path)
+
+        entry = indexer.manifest.get(str(path))
+        assert indexer.vectorstore.upserts[-1][1] == ["Delta sentence new"]
+        assert indexer.vectorstore.deleted == [old_ids[1]]
+        assert entry.vector_ids[0] == old_ids[0]
+        assert entry.vector_ids[2] == old_ids[2]
+        assert entry.chunk_count == 3
+
+    @pytest.mark.asyncio
+    async def test_streamed_file_matches_in_memory_index(self, docs, monkeypatch):
+        """Test large-file streaming yields the same hash, chunks and batches."""
+        monkeypatch.setattr(settings, "max_chunk_size", 40)
+        monkeypatch.setattr(settings, "chunk_overlap", 15)
+        monkeypatch.setattr(settings, "embedding_batch_size", 4)
+        path = docs / "a.txt"
+        path.write_text(" ".join(f"Sentence number {i} here." for i in range(50)))
+
+        in_memory = DocumentIndexer(FakeVectorStore())
+        await in_memory.index_file(path)
+
+        monkeypatch.setattr(settings, "streaming_min_file_size", 0)
+        monkeypatch.setattr(settings, "index_manifest_path", str(docs.parent / "streamed.json"))
+        streamed = DocumentIndexer(FakeVectorStore())
+        text = path.read_text()
+        streamed.loader.iter_txt = lambda filepath: (text[i:i + 7] for i in range(0, len(text), 7))
+        await streamed.index_file(path)
+
+        expected = in_memory.manifest.get(str(path))
+        entry = streamed.manifest.get(str(path))
+        # Streamed content is keyed by file bytes, saving a second read
+        assert entry.content_hash == entry.file_hash
+        assert entry.chunk_hashes == expected.chunk_hashes
+        assert len(entry.vector_ids) == len(expected.vector_ids)
+        assert streamed.vectorstore.upserts[0][1] == in_memory.vectorstore.upserts[0][1]
+        assert max(len(chunks) for _, chunks in streamed.vectorstore.upserts) == 4
+
+    @pytest.mark.asyncio
+    async def test_files_deleted_offline_are_removed(self, docs):
+        """Test index_all drops manifest entries for missing files."""
+        path = docs / "a.txt"
+        path.write_text("Soon gone.")
+        await DocumentIndexer(FakeVectorStore()).index_all()
+        path.unlink()
+
+        indexer = DocumentIndexer(FakeVectorStore())
+        await indexer.index_all()
+
+        assert indexer.indexed_files == set()
+        assert len(indexer.vectorstore.deleted) == 1
+
+    @pytest.mark.asyncio
+    async def test_shared_content_kept_until_last_path_removed(self, docs):
+        """Test identical files share vectors and removal is reference counted."""
+        (docs / "a.txt").write_text("Same content.")
+        (docs / "b.txt").write_text("Same content.")
+        indexer = DocumentIndexer(FakeVectorStore())
+        await indexer.index_all()
+
+        assert len(indexer.vectorstore.upserts) == 1
+        assert len(indexer.indexed_files) == 2
+
+        await indexer.remove_file(docs / "a.txt")
+        assert indexer.vectorstore.deleted == []
+
+        await indexer.remove_file(docs / "b.txt")
+        assert len(indexer.vectorstore.deleted) == 1
+
+    @pytest.mark.asyncio
+    async def test_bulk_run_checkpoints_progress(self, docs, monkeypatch):
+        """Test a bulk run saves the manifest as files finish, not only at the end."""
+        monkeypatch.setattr(settings, "index_checkpoint_interval", 1)
+        monkeypatch.setattr(settings, "indexing_concurrency", 1)
+        for name in ("a", "b", "c"):
+            (docs / f"{name}.txt").write_text(f"Document {name}. It has sentences.")
+        manifest_path = docs.parent / "manifest.json"
+        saved = []
+
+        def on_file(filepath, success):
+            saved.append(len(json.loads(manifest_path.read_text())["files"]))
+
+        indexer = DocumentIndexer(FakeVectorStore())
+        await indexer.index_all(on_file=on_file)
+
+        assert saved == [1, 2, 3]
+        assert indexer.status.snapshot()["state"] == "done"
+        assert indexer.status.done == 3
+
+    @pytest.mark.asyncio
+    async def test_durable_store_journals_each_file(self, docs, monkeypatch):
+        """Test files finished after the last checkpoint survive a crash with a remote store."""
+        monkeypatch.setattr(settings, "index_checkpoint_interval", 0)
+        monkeypatch.setattr(settings, "indexing_concurrency", 1)
+        monkeypatch.setattr(FakeVectorStore, "durable", True)
+        for name in ("a", "b", "c"):
+            (docs / f"{name}.txt").write_text(f"Document {name}. It has sentences.")
+        await DocumentIndexer(FakeVectorStore()).index_all()
+        (docs / "a.txt").unlink()
+        (docs / "d.txt").write_text("Document d. It has sentences.")
+        crashed = DocumentIndexer(FakeVectorStore())
+        # Skip the final checkpoint as a killed process would
+        monkeypatch.setattr(crashed, "checkpoint", lambda: None)
+        await crashed.index_all()
+
+        resumed = DocumentIndexer(FakeVectorStore())
+        assert {Path(path).name for path in resumed.indexed_files} == {"b.txt", "c.txt", "d.txt"}
+        await resumed.index_all()
+        assert resumed.vectorstore.upserts == []
+        assert not resumed.manifest.journal_path.exists()
+
+    @pytest.mark.asyncio
+    async def test_watcher_changes_checkpoint_together(self, docs, monkeypatch):
+        """Test watcher jobs share one delayed checkpoint instead of saving per file."""
+        monkeypatch.setattr(settings, "watch_checkpoint_delay_seconds", 0.05)
+        indexer = DocumentIndexer(FakeVectorStore())
+        checkpoints = []
+        monkeypatch.setattr(indexer, "checkpoint", lambda: checkpoints.append(len(indexer.manifest)))
+        indexer.start_watching()
+        try:
+            for name in ("a", "b", "c"):
+                path = docs / f"{name}.txt"
+                path.write_text(f"Document {name}. It has sentences.")
+                assert await indexer.index_file(path)
+            assert checkpoints == []
+
+            await asyncio.sleep(0.1)
+            assert checkpoints == [3]
+            assert await indexer.remove_file(docs / "a.txt")
+        finally:
+            indexer.stop_watching()
+        # Stopping saves what the timer had not yet
+        assert checkpoints == [3, 2]
+
+    @pytest.mark.asyncio
+    async def test_index_all_respects_concurrency_limit(self, docs, monkeypatch):
+        """Test files are indexed in parallel but never above indexing_concurrency."""
+        monkeypatch.setattr(settings, "indexing_concurrency", 2)
+        for i in range(6):
+            (docs / f"{i}.txt").write_text(f"Document number {i}. It has sentences.")
+
+        store = SlowStore()
+        results = await DocumentIndexer(store).index_all()
+
+        assert results == {"total": 6, "success": 6, "failed": 0}
+        assert store.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_file_batches_upsert_concurrently(self, docs, monkeypatch):
+        """Test one file's embedding batches overlap up to the in-flight limit, ids in order."""
+        monkeypatch.setattr(settings, "embedding_batch_size", 2)
+        monkeypatch.setattr(settings, "indexing_upserts_in_flight", 3)
+        monkeypatch.setattr(settings, "max_chunk_size", 40)
+        monkeypatch.setattr(settings, "chunk_overlap", 0)
+        (docs / "a.txt").write_text(" ".join(f"Sentence number {i}." for i in range(40)))
+        store = SlowStore()
+        indexer = DocumentIndexer(store)
+
+        assert await indexer.index_file(docs / "a.txt")
+
+        entry = indexer.manifest.get(str(docs / "a.txt"))
+        assert store.peak == 3
+        assert len(store.upserts) > 3
+        prefix = store.upserts[0][0]
+        assert entry.vector_ids == [f"{prefix}_chunk_{i}" for i in range(entry.chunk_count)]
+
+    @pytest.mark.asyncio
+    async def test_content_locks_shared_and_released(self, docs):
+        """Test concurrent twins embed once and no lock outlives its users, even on failure."""
+        for name in ("a", "b", "c"):
+            (docs / f"{name}.txt").write_text("Same content.")
+        indexer = DocumentIndexer(FakeVectorStore())
+
+        await asyncio.gather(*(indexer.index_file(docs / f"{n}.txt") for n in ("a", "b", "c")))
+
+        assert len(indexer.vectorstore.upserts) == 1
+        assert indexer._hash_locks == {}
+        assert indexer._path_locks == {}
+
+        async def fail(*args, **kwargs):
+            raise RuntimeError("store down")
+
+        (docs / "d.txt").write_text("Other content.")
+        indexer.vectorstore.upsert = fail
+        assert not await indexer.index_file(docs / "d.txt")
+        assert indexer._hash_locks == {}
+
+    @pytest.mark.asyncio
+    async def test_old_content_elsewhere_keeps_patched_vectors(self, docs, monkeypatch):
+        """Test edit A, add B with A's old content, delete B: A's kept chunks stay searchable."""
+        monkeypatch.setattr(settings, "max_chunk_size", 20)
+        monkeypatch.setattr(settings, "chunk_overlap", 0)
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        old = "Alpha sentence one. Beta sentence two. Gamma sentence three."
+        store = LocalVectorStore(FakeLLM(), path="")
+        indexer = DocumentIndexer(store)
+
+        a, b = docs / "a.txt", docs / "b.txt"
+        a.write_text(old)
+        await indexer.index_file(a)
+        a.write_text("Alpha sentence one. Delta sentence new. Gamma sentence three.")
+        await indexer.index_file(a)
+        b.write_text(old)
+        await indexer.index_file(b)
+        await indexer.remove_file(b)
+
+        a_ids = indexer.manifest.get(str(a)).vector_ids
+        assert len(store) == len(a_ids)
+        matches = await store.search("Gamma sentence three", top_k=1, threshold=0.5)
+        assert matches[0]["id"] in a_ids
+        assert matches[0]["filename"] == "a.txt"
+
+    @pytest.mark.asyncio
+    async def test_failed_and_repeated_indexing_leaves_no_orphans(self, docs, monkeypatch):
+        """Test a failed upsert cleans up, and retries or a lost manifest reuse the same ids."""
+        monkeypatch.setattr(settings, "max_chunk_size", 25)
+        monkeypatch.setattr(settings, "chunk_overlap", 0)
+        monkeypatch.setattr(settings, "embedding_batch_size", 2)
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        path = docs / "a.txt"
+        path.write_text(" ".join(f"Sentence number {i}." for i in range(10)))
+        store = LocalVectorStore(FakeLLM(), path="")
+        keywords = KeywordIndex()
+        indexer = DocumentIndexer(store, keywords)
+
+        upsert = store.upsert
+        calls = []
+
+        async def flaky_upsert(*args, **kwargs):
+            calls.append(args)
+            if len(calls) == 3:
+                raise VectorDBError("store down")
+            return await upsert(*args, **kwargs)
+
+        store.upsert = flaky_upsert
+        assert not await indexer.index_file(path)
+        assert (len(store), len(keywords)) == (0, 0)
+
+        store.upsert = upsert
+        assert await indexer.index_file(path)
+        ids = indexer.manifest.get(str(path)).vector_ids
+        monkeypatch.setattr(settings, "index_manifest_path", str(docs.parent / "lost.json"))
+        assert await DocumentIndexer(store, keywords).index_file(path)
+        assert len(store) == len(ids) == 10
+        assert len(keywords) == 10
+
+        await indexer.remove_file(path)
+        assert (len(store), len(keywords)) == (0, 0)
+
+    @pytest.mark.asyncio
+    async def test_settings_change_reindexes(self, docs, monkeypatch):
+        """Test a manifest from another store or pipeline no longer skips files."""
+        (docs / "a.txt").write_text("First document. It has sentences.")
+        await DocumentIndexer(FakeVectorStore()).index_all()
+
+        monkeypatch.setattr(settings, "vector_dimension", 1024)
+        moved = DocumentIndexer(FakeVectorStore())
+        await moved.index_all()
+        assert len(moved.vectorstore.upserts) == 1
+        assert moved.vectorstore.deleted == []
+
+        monkeypatch.setattr(settings, "max_chunk_size", 500)
+        rechunked = DocumentIndexer(FakeVectorStore())
+        await rechunked.index_all()
+        assert len(rechunked.vectorstore.upserts) == 1
+        assert rechunked.vectorstore.deleted == moved.manifest.get(str(docs / "a.txt")).vector_ids
@@ -0,0 +1,153 @@
+"""Unit tests for keyword index and hybrid retrieval."""
+
+import pytest
+
+from src.core import settings
+from src.services.knowledge import Retriever
+from src.vectorstore.indexer import DocumentIndexer
+from src.vectorstore.keyword_index import KeywordIndex
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM, FakeVectorStore
+
+
+class TestKeywordIndex:
+    """Test BM25 postings."""
+
+    @pytest.fixture
+    def index(self):
+        """Index with three chunks."""
+        index = KeywordIndex()
+        index.add("doc1", ["a", "b"], [
+            "Reset the router with code X-200.",
+            "The router has four ports."
+        ], {"filename": "router.txt"})
+        index.add("doc2", ["c"], ["Vacation requests need manager approval."], {"filename": "hr.txt"})
+        return index
+
+    def test_exact_code_ranks_first(self, index):
+        """Test a product code finds its chunk."""
+        matches = index.search("what is x-200", top_k=2)
+        assert [m["id"] for m in matches] == ["a"]
+        assert matches[0]["filename"] == "router.txt"
+
+    def test_remove_and_replace(self, index):
+        """Test removed chunks disappear and re-added ids replace old text."""
+        index.remove_document("doc2")
+        assert index.search("vacation", top_k=3) == []
+
+        index.add("doc1", ["b"], ["The router has six ports."], {"filename": "router.txt"})
+        assert index.search("four", top_k=3) == []
+        assert [m["id"] for m in index.search("six", top_k=3)] == ["b"]
+        assert len(index) == 2
+
+    def test_persistence(self, index, tmp_path):
+        """Test chunks survive a save/load cycle."""
+        index.path = tmp_path / "keywords.json"
+        index.dirty = True
+        index.save()
+
+        reloaded = KeywordIndex(str(index.path))
+        reloaded.load()
+        assert len(reloaded) == 3
+        assert reloaded.search("x-200", top_k=1)[0]["id"] == "a"
+
+
+class TestHybridRetrieval:
+    """Test indexing into both indexes and fused retrieval."""
+
+    @pytest.fixture(autouse=True)
+    def config(self, tmp_path, monkeypatch):
+        """Temporary corpus, no caches."""
+        folder = tmp_path / "documents"
+        folder.mkdir()
+        monkeypatch.setattr(settings, "documents_folder", str(folder))
+        monkeypatch.setattr(settings, "index_manifest_path", str(tmp_path / "manifest.json"))
+        monkeypatch.setattr(settings, "parser_workers", 0)
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "answer_cache_enabled", False)
+        monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+        return folder
+
+    @pytest.mark.asyncio
+    async def test_indexer_feeds_keyword_index(self, config):
+        """Test edits and removals keep the keyword index in step."""
+        path = config / "a.txt"
+        path.write_text("Error E-42 means the fan failed. Replace the fan.")
+        keywords = KeywordIndex()
+        indexer = DocumentIndexer(FakeVectorStore(), keywords)
+
+        await indexer.index_file(path)
+        assert keywords.search("e-42", top_k=1)[0]["filename"] == "a.txt"
+
+        await indexer.remove_file(path)
+        assert len(keywords) == 0
+
+    @pytest.mark.asyncio
+    async def test_backfill_without_reembedding(self, config):
+        """Test files indexed before hybrid mode are added to the keyword index."""
+        path = config / "a.txt"
+        path.write_text("Error E-42 means the fan failed.")
+        await DocumentIndexer(FakeVectorStore()).index_all()
+
+        store = FakeVectorStore()
+        keywords = KeywordIndex()
+        await DocumentIndexer(store, keywords).index_all()
+        assert store.upserts == []
+        assert keywords.search("e-42", top_k=1)
+
+    @staticmethod
+    async def hybrid_corpus(llm):
+        """Local store and keyword index over the same handful of chunks."""
+        store = LocalVectorStore(llm, path="")
+        keywords = KeywordIndex()
+        chunks = [
+            "Vacation days accrue monthly.",
+            "Part ZX-9 ships in blue.",
+            "Parking is free for staff.",
+            "The office opens at nine.",
+            "Expenses are reimbursed within a month.",
+            "Laptops are replaced every three years.",
+        ]
+        ids = await store.upsert("doc", chunks, {"filename": "a.txt"})
+        keywords.add("doc", ids, chunks, {"filename": "a.txt"})
+        return store, keywords
+
+    @pytest.mark.asyncio
+    async def test_hybrid_finds_keyword_only_match(self):
+        """Test fusion surfaces a chunk the vector threshold rejects."""
+        llm = FakeLLM()
+        store, keywords = await self.hybrid_corpus(llm)
+
+        vector_only = Retriever(llm=llm, vectorstore=store)
+        hybrid = Retriever(llm=llm, vectorstore=store, keyword_index=keywords)
+        question = "color of zx-9"
+
+        _, sources, _ = await vector_only.retrieve_and_answer(question, top_k=1, threshold=0.9)
+        assert sources == []
+        _, sources, confidence = await hybrid.retrieve_and_answer(question, top_k=1, threshold=0.9)
+        assert sources == ["a.txt"]
+        assert confidence == 0.0
+
+    @pytest.mark.asyncio
+    async def test_off_topic_question_gets_no_context(self, monkeypatch):
+        """Test stopwords and weak keyword-only matches do not reach the context."""
+        class ContextLLM(FakeLLM):
+            async def generate_answer(self, context, question):
+                self.context = context
+                return await super().generate_answer(context, question)
+
+        llm = ContextLLM()
+        store, keywords = await self.hybrid_corpus(llm)
+        hybrid = Retriever(llm=llm, vectorstore=store, keyword_index=keywords)
+
+        _, sources, confidence = await hybrid.retrieve_and_answer(
+            "what is the weather in paris", top_k=3, threshold=0.7)
+        assert llm.context == ""
+        assert (sources, confidence) == ([], 0.0)
+
+        # A keyword-only match below the minimum score is dropped too
+        monkeypatch.setattr(settings, "keyword_min_score", 5.0)
+        hybrid.answer_cache = hybrid.semantic_cache = None
+        _, sources, _ = await hybrid.retrieve_and_answer("color of zx-9", top_k=1, threshold=0.9)
+        assert sources == []
@@ -0,0 +1,108 @@
+"""Unit tests for local vector store."""
+
+import numpy as np
+import pytest
+
+from src.core import settings
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM
+
+
+class TestLocalVectorStore:
+    """Test local vector search."""
+
+    @pytest.fixture(autouse=True)
+    def config(self, monkeypatch):
+        """Small vectors, no embedding cache."""
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+
+    @pytest.mark.asyncio
+    async def test_search_ranks_best_match_first(self):
+        """Test cosine top-k returns the closest chunk."""
+        store = LocalVectorStore(FakeLLM(), path="")
+        await store.upsert("doc", ["apples and pears", "cars and trucks"], {"filename": "a.txt"})
+
+        matches = await store.search("apples pears", top_k=2, threshold=0.1)
+
+        assert matches[0]["content"] == "apples and pears"
+        assert matches[0]["filename"] == "a.txt"
+        assert all(m["score"] >= 0.1 for m in matches)
+
+    @pytest.mark.asyncio
+    async def test_delete_and_persist(self, tmp_path):
+        """Test deleted vectors disappear and survive a reload."""
+        store = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        ids = await store.upsert("doc", ["apples", "pears", "plums"], {"filename": "a.txt"})
+        await store.delete_ids(ids[:1])
+        store.flush()
+
+        reloaded = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        assert len(reloaded) == 2
+        assert await reloaded.search("apples", top_k=3, threshold=0.5) == []
+        assert (await reloaded.search("plums", top_k=1, threshold=0.5))[0]["id"] == ids[2]
+
+    @pytest.mark.asyncio
+    async def test_ann_search_finds_exact_match(self, monkeypatch):
+        """Test IVF search returns the same best match as brute force."""
+        monkeypatch.setattr(settings, "local_ann_enabled", True)
+        monkeypatch.setattr(settings, "local_ann_min_vectors", 10)
+        monkeypatch.setattr(settings, "local_ann_nprobe", 4)
+        store = LocalVectorStore(FakeLLM(), path="")
+        chunks = [f"topic{i} word{i % 7} extra{i % 3}" for i in range(200)]
+        await store.upsert("doc", chunks, {"filename": "a.txt"})
+
+        # The first search scans every row while clustering runs in a thread
+        matches = await store.search(chunks[42], top_k=1, threshold=0.0)
+        assert matches[0]["content"] == chunks[42]
+        assert not store._ann.is_built
+
+        await store._ann_build
+        await store.upsert("doc2", ["late arrival"], {"filename": "b.txt"})
+        assert store._ann.is_built
+        for chunk in (chunks[42], "late arrival"):
+            matches = await store.search(chunk, top_k=1, threshold=0.0)
+            assert matches[0]["content"] == chunk
+
+    @pytest.mark.asyncio
+    @pytest.mark.parametrize("quantization", ["int8", "binary"])
+    async def test_quantized_search_rescores_exact_match(self, monkeypatch, tmp_path, quantization):
+        """Test quantized scan plus rescoring keeps exact scores and survives a reload."""
+        monkeypatch.setattr(settings, "local_store_quantization", quantization)
+        store = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        chunks = [f"topic{i} word{i % 7} extra{i % 3}" for i in range(200)]
+        await store.upsert("doc", chunks, {"filename": "a.txt"})
+        store.flush()
+
+        reloaded = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        for current in (store, reloaded):
+            matches = await current.search(chunks[42], top_k=1, threshold=0.0)
+            assert matches[0]["content"] == chunks[42]
+            assert matches[0]["score"] == pytest.approx(1.0, abs=1e-5)
+
+    @pytest.mark.asyncio
+    async def test_mmap_store_grows_on_disk(self, monkeypatch, tmp_path):
+        """Test a memory-mapped store writes in place and reloads with deletions."""
+        monkeypatch.setattr(settings, "local_store_mmap", True)
+        monkeypatch.setattr(settings, "local_store_quantization", "int8")
+        store = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        chunks = ["apples are red", "bananas are yellow", "kiwis are green", "figs are sweet"]
+        ids = await store.upsert("doc", chunks, {"filename": "a.txt"})
+        store.flush()
+
+        reloaded = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        assert isinstance(reloaded._matrix, np.memmap)
+        vectors_file = tmp_path / LocalVectorStore.VECTORS_FILE
+        inode = vectors_file.stat().st_ino
+        more = await reloaded.upsert("doc2", ["plums are purple"], {"filename": "b.txt"})
+        reloaded.flush()
+
+        # Spare capacity absorbed the upsert, so the file was not replaced
+        assert vectors_file.stat().st_ino == inode
+        await reloaded.delete_ids([ids[0]])
+        reloaded.flush()
+        # One dead row in five is kept as a null id rather than compacted
+        final = LocalVectorStore(FakeLLM(), path=str(tmp_path))
+        assert len(final) == 4
+        assert await final.search("apples", top_k=3, threshold=0.5) == []
+        assert (await final.search("plums", top_k=1, threshold=0.5))[0]["id"] == more[0]
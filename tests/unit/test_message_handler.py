@@ -0,0 +1,67 @@
+"""Unit tests for message handler."""
+
+from types import SimpleNamespace
+import pytest
+
+from src.core import settings
+from src.bot.handlers import message_handler
+from src.bot.handlers.message_handler import MessageHandler
+
+
+class FakeMessage:
+    """Telegram message stand-in that records sends and edits."""
+
+    def __init__(self, text: str = ""):
+        self.text = text
+        self.chat = SimpleNamespace(send_action=self.send_action)
+        self.replies = []
+        self.edits = []
+
+    async def send_action(self, action):
+        pass
+
+    async def reply_text(self, text):
+        self.replies.append(text)
+        reply = FakeMessage(text)
+        reply.edits = self.edits
+        return reply
+
+    async def edit_text(self, text):
+        self.edits.append(text)
+
+
+class StreamingRetriever:
+    """Yields tokens while advancing a fake clock half a second each."""
+
+    def __init__(self, clock, tokens: int):
+        self.clock = clock
+        self.tokens = tokens
+
+    async def stream_answer(self, question):
+        async def tokens():
+            for i in range(self.tokens):
+                self.clock.now += 0.5
+                yield f"t{i} "
+        return tokens(), ["policy.txt"], 0.9
+
+
+class TestMessageHandler:
+    """Test streamed Telegram replies."""
+
+    @pytest.mark.asyncio
+    async def test_edits_are_throttled(self, monkeypatch):
+        """Test a streamed reply is edited at most once per interval, then finalized."""
+        clock = SimpleNamespace(now=0.0)
+        monkeypatch.setattr(message_handler, "time", SimpleNamespace(monotonic=lambda: clock.now))
+        monkeypatch.setattr(settings, "telegram_stream_enabled", True)
+        monkeypatch.setattr(settings, "telegram_edit_interval", 1.5)
+        handler = MessageHandler(retriever=StreamingRetriever(clock, tokens=10))
+        message = FakeMessage("vacation days")
+        update = SimpleNamespace(effective_user=SimpleNamespace(id=1), message=message)
+
+        await handler.handle_text(update, None)
+
+        # Sent at 1.5s, edited at 3.0s and 4.5s, then once with sources
+        assert message.replies == ["t0 t1 t2"]
+        assert message.edits[:-1] == ["t0 t1 t2 t3 t4 t5 …", "t0 t1 t2 t3 t4 t5 t6 t7 t8 …"]
+        assert message.edits[-1].startswith("t0 t1 t2 t3 t4 t5 t6 t7 t8 t9\n\n📚 Sources:\n• policy.txt")
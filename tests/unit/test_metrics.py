@@ -0,0 +1,89 @@
+"""Unit tests for metrics."""
+
+import asyncio
+import httpx
+import pytest
+
+from src.core import settings
+from src.core.metrics import Registry, STAGE_SECONDS, CACHE_LOOKUPS, REQUEST_SECONDS
+from src.api.app import app
+from src.api.dependencies import get_retriever
+from src.services.knowledge import Retriever
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM
+
+
+class TestMetrics:
+    """Test metric types and the /metrics route."""
+
+    def test_histogram_buckets_are_cumulative(self):
+        """Test exposition of a labelled histogram."""
+        registry = Registry()
+        histogram = registry.histogram("latency_seconds", "Latency.", ["stage"], buckets=(0.1, 1.0))
+        histogram.observe(0.05, stage="embed")
+        histogram.observe(0.5, stage="embed")
+        histogram.observe(5.0, stage="embed")
+
+        lines = registry.render().splitlines()
+        assert 'latency_seconds_bucket{stage="embed",le="0.1"} 1' in lines
+        assert 'latency_seconds_bucket{stage="embed",le="1"} 2' in lines
+        assert 'latency_seconds_bucket{stage="embed",le="+Inf"} 3' in lines
+        assert 'latency_seconds_count{stage="embed"} 3' in lines
+
+    def test_counter_requires_declared_labels(self):
+        """Test labels must match the declaration."""
+        counter = Registry().counter("hits_total", "Hits.", ["cache"])
+        counter.inc(cache="answer")
+        assert counter.value(cache="answer") == 1
+        with pytest.raises(ValueError):
+            counter.inc(kind="answer")
+
+    @pytest.mark.asyncio
+    async def test_query_records_stages(self, monkeypatch):
+        """Test a query shows up in stage histograms and on /metrics."""
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "semantic_cache_enabled", False)
+        store = LocalVectorStore(FakeLLM(), path="")
+        await store.upsert("doc", ["vacation policy days"], {"filename": "a.txt"})
+        retriever = Retriever(llm=FakeLLM(), vectorstore=store)
+        app.dependency_overrides[get_retriever] = lambda: retriever
+
+        before = STAGE_SECONDS.count(stage="generation")
+        misses = CACHE_LOOKUPS.value(cache="answer", result="miss")
+        try:
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                response = await client.post(
+                    "/api/v1/query", json={"query": "vacation days", "threshold": 0.1})
+                assert response.status_code == 200
+                body = (await client.get("/metrics")).text
+        finally:
+            app.dependency_overrides.pop(get_retriever, None)
+
+        assert STAGE_SECONDS.count(stage="generation") == before + 1
+        assert STAGE_SECONDS.count(stage="vector_search") > 0
+        assert CACHE_LOOKUPS.value(cache="answer", result="miss") == misses + 1
+        assert 'chatbot_request_duration_seconds_count{method="POST",route="/api/v1/query",status="200"}' in body
+
+    @pytest.mark.asyncio
+    async def test_stream_latency_covers_body(self):
+        """Test a streamed query is timed until its last event, not its headers."""
+        class SlowRetriever:
+            async def stream_answer(self, question, top_k, threshold):
+                async def tokens():
+                    for _ in range(3):
+                        await asyncio.sleep(0.1)
+                        yield "answer "
+                return tokens(), [], 1.0
+
+        app.dependency_overrides[get_retriever] = SlowRetriever
+        labels = {"method": "POST", "route": "/api/v1/query/stream", "status": "200"}
+        before = REQUEST_SECONDS.total(**labels)
+        try:
+            async with httpx.AsyncClient(app=app, base_url="http://test") as client:
+                response = await client.post("/api/v1/query/stream", json={"query": "vacation days"})
+                assert response.status_code == 200
+        finally:
+            app.dependency_overrides.pop(get_retriever, None)
+
+        assert REQUEST_SECONDS.total(**labels) - before >= 0.3
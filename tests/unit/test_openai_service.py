@@ -0,0 +1,76 @@
+"""Unit tests for OpenAI service."""
+
+import base64
+import numpy as np
+import pytest
+from types import SimpleNamespace
+
+from src.core import settings
+from src.services.llm import OpenAIService
+
+
+class FakeEmbeddings:
+    """Records embedding requests and returns base64 results in reverse order."""
+
+    def __init__(self):
+        self.calls = []
+        self.options = []
+
+    async def create(self, model, input, encoding_format="float", **options):
+        self.calls.append(list(input))
+        self.options.append(options)
+        data = []
+        for i, text in enumerate(input):
+            vector = np.array([len(text), 1.0, 2.0], dtype=np.float32)[:options.get("dimensions", 3)]
+            if encoding_format == "base64":
+                vector = base64.b64encode(vector.tobytes()).decode()
+            data.append(SimpleNamespace(index=i, embedding=vector))
+        usage = SimpleNamespace(prompt_tokens=sum(len(text) for text in input))
+        return SimpleNamespace(data=list(reversed(data)), usage=usage)
+
+
+class TestOpenAIService:
+    """Test batched embeddings."""
+
+    @pytest.fixture
+    def service(self):
+        """Create service with fake embeddings client."""
+        service = OpenAIService()
+        service.client = SimpleNamespace(embeddings=FakeEmbeddings())
+        return service
+
+    def test_batch_texts_respects_item_budget(self, service, monkeypatch):
+        """Test batches never exceed the item budget."""
+        monkeypatch.setattr(settings, "embedding_batch_size", 3)
+        batches = list(service._batch_texts([f"text {i}" for i in range(7)]))
+        assert [len(b) for b in batches] == [3, 3, 1]
+
+    def test_batch_texts_respects_token_budget(self, service, monkeypatch):
+        """Test batches are split on the token budget."""
+        monkeypatch.setattr(settings, "embedding_batch_max_tokens", 30)
+        batches = list(service._batch_texts(["a" * 80, "b" * 80, "c" * 80]))
+        assert [len(b) for b in batches] == [1, 1, 1]
+
+    @pytest.mark.asyncio
+    async def test_create_embeddings_preserves_order(self, service, monkeypatch):
+        """Test embeddings are returned in input order."""
+        monkeypatch.setattr(settings, "embedding_batch_size", 2)
+        monkeypatch.setattr(settings, "vector_dimension", 1)
+        texts = ["a", "bb", "ccc", "dddd", "eeeee"]
+
+        embeddings = await service.create_embeddings(texts)
+
+        assert embeddings.dtype == np.float32
+        assert embeddings.tolist() == [[1.0], [2.0], [3.0], [4.0], [5.0]]
+        assert len(service.client.embeddings.calls) == 3
+
+    @pytest.mark.asyncio
+    async def test_native_dimensions_requested(self, service, monkeypatch):
+        """Test reduced dimensions are requested from the model instead of padded."""
+        monkeypatch.setattr(settings, "vector_dimension", 2)
+        monkeypatch.setattr(settings, "embedding_native_dimensions", True)
+
+        embedding = await service.create_embedding("abc")
+
+        assert service.client.embeddings.options == [{"dimensions": 2}]
+        assert embedding.tolist() == [3.0, 1.0]
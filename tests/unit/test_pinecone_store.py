@@ -0,0 +1,97 @@
+"""Unit tests for Pinecone store concurrency."""
+
+import asyncio
+import threading
+import time
+from types import SimpleNamespace
+import pytest
+
+from src.core import settings
+from src.vectorstore.pinecone_store import PineconeStore
+from tests.fakes import FakeLLM
+
+
+class SlowIndex:
+    """Blocking index that records peak concurrency."""
+
+    def __init__(self, delay=0.05):
+        self.delay = delay
+        self.active = 0
+        self.peak = 0
+        self.batches = []
+        self._lock = threading.Lock()
+
+    def query(self, **kwargs):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+        return SimpleNamespace(matches=[])
+
+    def upsert(self, vectors):
+        with self._lock:
+            self.active += 1
+            self.peak = max(self.peak, self.active)
+            self.batches.append([vector["id"] for vector in vectors])
+        time.sleep(self.delay)
+        with self._lock:
+            self.active -= 1
+
+
+class TestPineconeStore:
+    """Test that Pinecone calls do not block the event loop."""
+
+    @pytest.fixture(autouse=True)
+    def config(self, monkeypatch):
+        """No embedding cache."""
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+
+    def make_store(self, index):
+        store = PineconeStore(FakeLLM())
+        store._index = index
+        return store
+
+    @pytest.mark.asyncio
+    async def test_queries_run_concurrently(self, monkeypatch):
+        """Concurrent searches overlap instead of serializing."""
+        monkeypatch.setattr(settings, "pinecone_max_concurrency", 8)
+        index = SlowIndex()
+        store = self.make_store(index)
+
+        start = time.perf_counter()
+        await asyncio.gather(*(store.search_by_vector([0.0], 5, 0.5) for _ in range(8)))
+        elapsed = time.perf_counter() - start
+
+        assert index.peak > 1
+        assert elapsed < 8 * index.delay
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self, monkeypatch):
+        """No more than the configured number of calls run at once."""
+        monkeypatch.setattr(settings, "pinecone_max_concurrency", 2)
+        index = SlowIndex(delay=0.02)
+        store = self.make_store(index)
+
+        await asyncio.gather(*(store.search_by_vector([0.0], 5, 0.5) for _ in range(6)))
+
+        assert index.peak == 2
+
+    @pytest.mark.asyncio
+    async def test_upsert_pipelines_bounded_batches(self, monkeypatch):
+        """Batches are sent while later chunks embed, with bounded in-flight batches."""
+        monkeypatch.setattr(settings, "vector_dimension", 8)
+        monkeypatch.setattr(settings, "embedding_batch_size", 4)
+        monkeypatch.setattr(settings, "pinecone_upsert_batch_size", 2)
+        monkeypatch.setattr(settings, "pinecone_upsert_max_in_flight", 3)
+        index = SlowIndex(delay=0.02)
+        store = self.make_store(index)
+
+        chunks = [f"chunk {i}" for i in range(11)]
+        ids = await store.upsert("doc", chunks, {"filename": "a.txt"})
+
+        assert ids == [f"doc_chunk_{i}" for i in range(11)]
+        assert sorted(sum(index.batches, [])) == sorted(ids)
+        assert max(len(batch) for batch in index.batches) <= 2
+        assert 1 < index.peak <= 3
@@ -0,0 +1,56 @@
+"""Unit tests for retriever."""
+
+import pytest
+
+from src.core import settings
+from src.services.knowledge import Retriever
+from src.vectorstore.local_store import LocalVectorStore
+from tests.fakes import FakeLLM
+
+
+class TestRetriever:
+    """Test streamed answers and answer caching."""
+
+    @pytest.fixture
+    def retriever(self, monkeypatch):
+        """Retriever over an empty local store."""
+        monkeypatch.setattr(settings, "vector_dimension", 64)
+        monkeypatch.setattr(settings, "embedding_cache_enabled", False)
+        monkeypatch.setattr(settings, "retrieval_mode", "vector")
+        store = LocalVectorStore(FakeLLM(), path="")
+        return Retriever(llm=FakeLLM(tokens=5), vectorstore=store)
+
+    @staticmethod
+    async def index_policy(retriever):
+        await retriever.vectorstore.upsert(
+            "doc", ["vacation policy days off"], {"filename": "policy.txt"})
+
+    @pytest.mark.asyncio
+    async def test_stream_answer_populates_cache(self, retriever):
+        """Test a fully streamed answer is cached and replayed as one token."""
+        await self.index_policy(retriever)
+        tokens, sources, confidence = await retriever.stream_answer("vacation days", threshold=0.1)
+        streamed = [token async for token in tokens]
+
+        assert streamed == ["answer "] * 5
+        assert sources == ["policy.txt"]
+        assert confidence > 0
+
+        tokens, cached_sources, cached_confidence = await retriever.stream_answer(
+            "vacation days", threshold=0.1)
+        assert [token async for token in tokens] == ["answer answer answer answer answer"]
+        assert (cached_sources, cached_confidence) == (sources, confidence)
+        assert retriever.answer_cache.stats()["hits"] == 1
+
+    @pytest.mark.asyncio
+    async def test_abandoned_stream_is_not_cached(self, retriever):
+        """Test a stream the consumer stops reading leaves the cache empty."""
+        await self.index_policy(retriever)
+        tokens, _, _ = await retriever.stream_answer("vacation days", threshold=0.1)
+        await tokens.__anext__()
+        await tokens.aclose()
+
+        answer, _, _ = await retriever.retrieve_and_answer("vacation days", threshold=0.1)
+
+        assert answer == "answer answer answer answer answer"
+        assert retriever.answer_cache.stats()["hits"] == 0
@@ -0,0 +1,60 @@
+"""Unit tests for index scheduler."""
+
+import asyncio
+import pytest
+
+from src.vectorstore.scheduler import IndexScheduler
+
+
+class FakeIndexer:
+    """Records index jobs."""
+
+    def __init__(self):
+        self.calls = []
+
+    async def reindex_file(self, filepath):
+        self.calls.append(("index", filepath.name))
+        await asyncio.sleep(0.02)
+        return True
+
+    async def remove_file(self, filepath):
+        self.calls.append(("remove", filepath.name))
+        return True
+
+
+class TestIndexScheduler:
+    """Test event coalescing."""
+
+    @pytest.fixture
+    def scheduler(self, event_loop):
+        """Create scheduler with a short debounce window."""
+        return IndexScheduler(FakeIndexer(), event_loop, debounce=0.05, max_jobs=2)
+
+    @pytest.mark.asyncio
+    async def test_burst_collapses_to_one_job(self, scheduler):
+        """Test create + repeated modify runs a single index job."""
+        for _ in range(5):
+            scheduler.submit("/docs/a.txt", IndexScheduler.INDEX)
+            await asyncio.sleep(0.01)
+
+        await asyncio.sleep(0.15)
+        assert scheduler.indexer.calls == [("index", "a.txt")]
+
+    @pytest.mark.asyncio
+    async def test_last_event_wins(self, scheduler):
+        """Test create followed by delete only removes."""
+        scheduler.submit("/docs/a.txt", IndexScheduler.INDEX)
+        scheduler.submit("/docs/a.txt", IndexScheduler.REMOVE)
+
+        await asyncio.sleep(0.15)
+        assert scheduler.indexer.calls == [("remove", "a.txt")]
+
+    @pytest.mark.asyncio
+    async def test_event_during_job_runs_after_it(self, scheduler):
+        """Test an event arriving mid-job is not dropped or run concurrently."""
+        scheduler.submit("/docs/a.txt", IndexScheduler.INDEX)
+        await asyncio.sleep(0.06)
+        scheduler.submit("/docs/a.txt", IndexScheduler.INDEX)
+
+        await asyncio.sleep(0.2)
+        assert scheduler.indexer.calls == [("index", "a.txt"), ("index", "a.txt")]